@@ -1,56 +1,87 @@
 #!/usr/bin/env python3
 """
-excel_import_with_params.py - AutoBANF Excel-Import mit Dateinamen-Parameter
+autoBANF.py - AutoBANF Excel-Import mit Dateinamen-Parameter
 """
 
+import argparse
+import asyncio
+import functools
+import os
 import sys
 import time
-import os
-import pandas as pd
+from pathlib import Path
+from lib.ui5_wait import wait_for_ui5_idle, settle_after_miss
+from lib.session import discover_item_view
+from lib.selector_registry import get_selector_registry
 from lib.autobanf_base import (
     navigate_to_artikel_page, 
+    ensure_artikel_page,
     close_browser_safely,
-    SecureCredentials
+    create_browser_page,
+    SecureCredentials,
+    SAP_PORTAL_URL
 )
 
 # Import der Funktionen aus complete_form_fill.py
 from lib.complete_form_fill import (
-    fill_text_field,
-    fill_numeric_field,
-    select_dropdown_option,
-    select_combobox_option
+    fill_form_field,
+    batch_fill_article_fields,
+    select_category_from_index,
+    crawl_category_catalog,
+    required_steps,
+    ARTICLE_FIELDS,
+    TOTAL_ARTICLE_FIELDS,
+    TRANSFER_SELECTORS,
+    DIALOG_OPEN_JS,
+    EXPAND_MAIN_CATEGORY_JS,
+    CLICK_SUBCATEGORY_JS
 )
 
-def convert_to_german_number(value):
-    """
-    Konvertiert einen numerischen Wert zur deutschen Notation (Komma als Dezimaltrenner)
-    """
-    if pd.isna(value):
-        return ""
-    
-    # Konvertiere zu String falls es ein numerischer Wert ist
-    str_value = str(value).strip()
-    
-    # Wenn bereits ein Komma enthalten ist, lasse es so
-    if ',' in str_value:
-        return str_value
-    
-    # Wenn es ein Punkt als Dezimaltrenner gibt, ersetze durch Komma
-    if '.' in str_value:
-        return str_value.replace('.', ',')
-    
-    # Für ganze Zahlen: prüfe ob es als Dezimalzahl behandelt werden sollte
-    try:
-        num_value = float(str_value)
-        # Wenn es eine ganze Zahl ist, gebe sie ohne Dezimalstellen zurück
-        if num_value == int(num_value):
-            return str(int(num_value))
-        else:
-            # Konvertiere zu deutscher Notation mit Komma
-            return str(num_value).replace('.', ',')
-    except ValueError:
-        # Falls keine Zahl, gebe ursprünglichen Wert zurück
-        return str_value
+from lib.excel_reader import read_excel_file, stream_article_rows, expand_workbook_paths
+from lib.article_records import normalize_articles, normalize_rows
+from lib.validation import (
+    check_records,
+    validate_records,
+    validated_records,
+    print_validation_report
+)
+from lib.category_catalog import (
+    CATALOG_FILE,
+    apply_category_catalog,
+    catalog_checked_rows,
+    set_category_catalog
+)
+
+from lib.pacing import PACING_PROFILES, DEFAULT_PROFILE, set_pacing_profile, get_pacing_controller
+from lib.step_trace import trace_step, start_trace, print_trace_report
+from lib.checkpoint import ImportJournal, STATE_ENTERED, STATE_TRANSFERRED
+from lib.har_replay import MODE_RECORD, MODE_REPLAY, set_har_mode
+from lib.network_filter import BLOCK_PROFILES, DEFAULT_BLOCK_PROFILE, set_network_filter, get_network_filter
+from lib.screenshots import (
+    get_screenshot_policy,
+    set_screenshot_policy,
+    SCREENSHOT_MODES,
+    SCREENSHOT_SCOPES,
+    SCREENSHOT_FORMATS,
+    DEFAULT_MODE as DEFAULT_SCREENSHOT_MODE,
+    DEFAULT_SCOPE as DEFAULT_SCREENSHOT_SCOPE,
+    DEFAULT_EVERY as DEFAULT_SCREENSHOT_EVERY,
+    DEFAULT_JPEG_QUALITY
+)
+from lib.launch_profiles import LAUNCH_PROFILES, DEFAULT_LAUNCH_PROFILE, set_launch_profile, get_launch_profile
+from lib.browser_metrics import chromium_memory_bytes, format_megabytes
+from lib.watch_folder import InboxWatcher, POLL_SECONDS
+from lib.job_queue import JobQueue, JOB_DB_FILE, STATE_QUEUED, worker_name, work_jobs, run_worker_pool
+from lib.sharding import run_sharded_import, export_login_state, print_shard_summary
+from lib.browser_daemon import open_artikel_page, hand_back_browser, run_daemon
+from lib.async_engine import import_workbook
+from lib.odata_engine import (
+    ODataRecorder,
+    ODataSubmitter,
+    learn_template,
+    ODATA_SAMPLE_ROWS,
+    DEFAULT_BATCH_SIZE as ODATA_BATCH_SIZE
+)
 
 def select_category_robust(page, main_category, subcategory, artikel_nr):
     """
@@ -60,10 +91,7 @@ def select_category_robust(page, main_category, subcategory, artikel_nr):
         print(f"   Robuste Kategorie-Auswahl für Artikel {artikel_nr}: '{main_category}' -> '{subcategory}'")
         
         # Schritt 1: Prüfen ob Kategorie-Dialog bereits offen ist
-        dialog_already_open = page.evaluate('''() => {
-            const dialogs = document.querySelectorAll('[role="dialog"], .sapMDialog');
-            return Array.from(dialogs).some(d => d.offsetHeight > 0);
-        }''')
+        dialog_already_open = page.evaluate(DIALOG_OPEN_JS)
         
         if not dialog_already_open:
             # Dialog muss geöffnet werden
@@ -72,7 +100,7 @@ def select_category_robust(page, main_category, subcategory, artikel_nr):
             # Erst nach oben scrollen, damit der Button sichtbar ist
             print("   Scrolle nach oben um Kategorie-Button sichtbar zu machen...")
             page.evaluate("window.scrollTo(0, 0)")
-            time.sleep(2)
+            wait_for_ui5_idle(page, "default")
             
             kategorie_button = page.locator("text=Kategorie auswählen")
             if kategorie_button.count() > 0:
@@ -80,10 +108,12 @@ def select_category_robust(page, main_category, subcategory, artikel_nr):
                 if not kategorie_button.first.is_visible():
                     print("   Button noch nicht sichtbar - scrolle nochmal...")
                     kategorie_button.first.scroll_into_view_if_needed()
-                    time.sleep(0.5)
+                    wait_for_ui5_idle(page, "default")
                 
                 kategorie_button.click()
-                time.sleep(1.5)
+                wait_for_ui5_idle(page, "dialog")
+                if not page.evaluate(DIALOG_OPEN_JS):
+                    settle_after_miss("dialog")
                 print("   Dialog geöffnet")
             else:
                 print("   WARNUNG: Kategorie-Button nicht gefunden")
@@ -92,49 +122,20 @@ def select_category_robust(page, main_category, subcategory, artikel_nr):
             print(f"   Dialog bereits offen für Artikel {artikel_nr}")
         
         # Schritt 2: Warten bis Dialog vollständig geladen ist
-        time.sleep(3)
+        wait_for_ui5_idle(page, "dialog")
+        
+        # Schritt 3: Direkt über das Kategorie-Verzeichnis der Sitzung auswählen
+        if select_category_from_index(page, main_category, subcategory):
+            print("   Kategorie über Sitzungs-Verzeichnis ausgewählt")
+            return True
         
-        # Schritt 3: Hauptkategorie aufklappen (falls nötig)
+        # Fallback: Hauptkategorie aufklappen (falls nötig)
         print(f"   Klappe Hauptkategorie '{main_category}' auf...")
-        expand_success = page.evaluate(f'''() => {{
-            const allElements = Array.from(document.querySelectorAll('*'));
-            const categoryElements = allElements.filter(el => {{
-                const text = el.textContent?.trim();
-                return text === '{main_category}' || 
-                       (text && text.includes('{main_category}') && text.length < 100);
-            }});
-            
-            for (let categoryEl of categoryElements) {{
-                const parent = categoryEl.closest('[role="treeitem"], li, .sapMLIB');
-                if (parent) {{
-                    const expandSelectors = [
-                        'button:first-child',
-                        'span:first-child',
-                        '[class*="expand"]:first-child',
-                        '[class*="arrow"]:first-child',
-                        '[class*="toggle"]:first-child'
-                    ];
-                    
-                    for (let selector of expandSelectors) {{
-                        const expandBtn = parent.querySelector(selector);
-                        if (expandBtn && expandBtn !== categoryEl) {{
-                            try {{
-                                expandBtn.click();
-                                console.log("Hauptkategorie aufgeklappt:", '{main_category}');
-                                return true;
-                            }} catch (e) {{
-                                console.log("Expand-Klick fehlgeschlagen:", e);
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-            return false;
-        }}''')
+        expand_success = page.evaluate(EXPAND_MAIN_CATEGORY_JS, main_category)
         
         if expand_success:
             print(f"   Hauptkategorie '{main_category}' aufgeklappt")
-            time.sleep(0.5)
+            wait_for_ui5_idle(page, "category")
         else:
             print(f"   Hauptkategorie '{main_category}' schon aufgeklappt oder nicht gefunden")
         
@@ -152,7 +153,7 @@ def select_category_robust(page, main_category, subcategory, artikel_nr):
                 if is_visible:
                     subcategory_locator.click(timeout=10000)
                     print(f"   Unterkategorie '{subcategory}' erfolgreich geklickt!")
-                    time.sleep(0.5)
+                    wait_for_ui5_idle(page, "category")
                     return True
                 else:
                     print(f"   Unterkategorie '{subcategory}' nicht sichtbar - verwende JavaScript")
@@ -161,103 +162,17 @@ def select_category_robust(page, main_category, subcategory, artikel_nr):
         
         # Versuch 2: Mit JavaScript - spezifisch für SAP CategorySelPopover
         print(f"   Verwende JavaScript für Unterkategorie '{subcategory}' (SAP-spezifisch)...")
-        js_success = page.evaluate(f'''() => {{
-            // Suche speziell nach SAP Category Tree Items
-            console.log("=== SAP Kategorie-Suche für '{subcategory}' ===");
-            
-            // 1. Suche nach allen CategorySelPopover Tree Items
-            const categoryTreeItems = document.querySelectorAll('[id*="CategorySelPopover--idCategoryTree"][role="treeitem"]');
-            console.log("CategorySelPopover Tree Items gefunden:", categoryTreeItems.length);
-            
-            for (let item of categoryTreeItems) {{
-                const contentDiv = item.querySelector('.sapMLIBContent');
-                const itemText = contentDiv ? contentDiv.textContent?.trim() : '';
-                
-                console.log("Item ID:", item.id, "Text:", itemText);
-                
-                if (itemText === '{subcategory}') {{
-                    const rect = item.getBoundingClientRect();
-                    const isVisible = rect.width > 0 && rect.height > 0;
-                    const isInPopover = item.closest('[id*="CategorySelPopover"]');
-                    
-                    console.log("=== MATCH GEFUNDEN ===");
-                    console.log("Item ID:", item.id);
-                    console.log("Sichtbar:", isVisible);
-                    console.log("In Popover:", !!isInPopover);
-                    console.log("Position:", rect);
-                    console.log("Classes:", item.className);
-                    
-                    if (isVisible && isInPopover) {{
-                        // Klick-Strategien in optimierter Reihenfolge
-                        
-                        // 1. Focus + Enter (SAP-typisch)
-                        try {{
-                            item.focus();
-                            item.dispatchEvent(new KeyboardEvent('keydown', {{
-                                key: 'Enter',
-                                code: 'Enter',
-                                which: 13,
-                                keyCode: 13,
-                                bubbles: true
-                            }}));
-                            console.log("Focus + Enter verwendet");
-                            return true;
-                        }} catch (e1) {{
-                            console.log("Focus + Enter fehlgeschlagen:", e1);
-                        }}
-                        
-                        // 2. Auf Content Div klicken
-                        try {{
-                            contentDiv.click();
-                            console.log("Content Div geklickt");
-                            return true;
-                        }} catch (e2) {{
-                            console.log("Content Div Klick fehlgeschlagen:", e2);
-                        }}
-                        
-                        // 3. MouseEvent auf Tree Item
-                        try {{
-                            const clickEvent = new MouseEvent('click', {{
-                                bubbles: true,
-                                cancelable: true,
-                                view: window,
-                                clientX: rect.left + rect.width/2,
-                                clientY: rect.top + rect.height/2
-                            }});
-                            item.dispatchEvent(clickEvent);
-                            console.log("MouseEvent mit Koordinaten verwendet");
-                            return true;
-                        }} catch (e3) {{
-                            console.log("MouseEvent fehlgeschlagen:", e3);
-                        }}
-                        
-                        // 4. Direkter Tree Item Klick
-                        try {{
-                            item.click();
-                            console.log("Tree Item direkt geklickt");
-                            return true;
-                        }} catch (e4) {{
-                            console.log("Tree Item Klick fehlgeschlagen:", e4);
-                        }}
-                    }} else {{
-                        console.log("Element nicht klickbar - nicht sichtbar oder nicht in Popover");
-                    }}
-                }}
-            }}
-            
-            console.log("=== KEINE KLICKBARE UNTERKATEGORIE GEFUNDEN ===");
-            return false;
-        }}''')
+        js_success = page.evaluate(CLICK_SUBCATEGORY_JS, subcategory)
         
         if js_success:
             print(f"   Unterkategorie '{subcategory}' mit SAP-JavaScript erfolgreich geklickt!")
-            time.sleep(0.5)
+            wait_for_ui5_idle(page, "category")
             return True
         else:
             print(f"   FEHLER: Unterkategorie '{subcategory}' konnte nicht geklickt werden")
             # Dialog schließen
             page.keyboard.press("Escape")
-            time.sleep(0.5)
+            wait_for_ui5_idle(page, "dialog")
             return False
             
     except Exception as e:
@@ -269,161 +184,91 @@ def select_category_robust(page, main_category, subcategory, artikel_nr):
         return False
 
 
-def read_excel_file(filename):
-    """Liest Excel-Datei und gibt DataFrame zurück"""
-    try:
-        print(f">> Excel-Datei einlesen: {filename}")
-        df = pd.read_excel(filename, sheet_name='Artikel_Import')
-        print(f">> {len(df)} Artikel gefunden")
-        print(f">> Spalten: {list(df.columns)}")
-        return df
-    except FileNotFoundError:
-        print(f"FEHLER: Datei '{filename}' nicht gefunden!")
-        return None
-    except Exception as e:
-        print(f"FEHLER beim Lesen der Excel-Datei: {e}")
-        return None
-
-def fill_article_form(page, row_data, artikel_nr):
-    """Füllt das Formular für einen Artikel aus"""
+def fill_article_form(page, row_data, artikel_nr, batch_fill=False, journal=None, temp_dir=None):
+    """
+    Füllt das Formular für einen Artikel aus
+    
+    Args:
+        page: Playwright page object
+        row_data (ArticleRecord): Aufbereitete Excel-Zeile (siehe normalize_articles)
+        artikel_nr (int): Laufende Artikelnummer
+        batch_fill (bool): Felder zuerst gesammelt über die UI5-Control-API setzen,
+            nicht gesetzte Felder anschließend einzeln über die Oberfläche
+        journal (ImportJournal): Zustand des Artikels festhalten (optional)
+        temp_dir (str): Ordner für Screenshots (Standard: TEMP_DIR)
+    
+    Returns:
+        tuple: (success_count, total_fields)
+    """
     print(f"\n{'='*60}")
     print(f"ARTIKEL {artikel_nr} - FORMULAR AUSFÜLLEN")
     print(f"{'='*60}")
     
     success_count = 0
-    total_fields = 16
+    total_fields = TOTAL_ARTICLE_FIELDS
     
     try:
         # 0. KATEGORIE AUSWÄHLEN (robuste Logik für alle Artikel)
-        if pd.notna(row_data.get('Kategorie')):
+        kategorie = row_data.get('Kategorie')
+        if kategorie:
             print(f"\n0. KATEGORIE auswählen (Artikel {artikel_nr})...")
-            kategorie = str(row_data['Kategorie']).strip()
             if '->' in kategorie:
                 main_cat, sub_cat = kategorie.split('->', 1)
                 # Robuste Kategorieauswahl mit mehreren Versuchen
-                if select_category_robust(page, main_cat.strip(), sub_cat.strip(), artikel_nr):
-                    success_count += 1
-                time.sleep(1.5)
-            
-        # 1. ARTIKELBESCHREIBUNG
-        if pd.notna(row_data.get('Artikelbeschreibung')):
-            print(f"\n1. ARTIKELBESCHREIBUNG ausfüllen (Artikel {artikel_nr})...")
-            if fill_text_field(page, "Artikelbeschreibung", str(row_data['Artikelbeschreibung'])):
-                success_count += 1
-                
-        # 2. STEUERKENNZEICHEN
-        if pd.notna(row_data.get('Steuerkennzeichen')):
-            print(f"\n2. STEUERKENNZEICHEN auswählen (Artikel {artikel_nr})...")
-            if select_dropdown_option(page, "Steuerkennzeichen", str(row_data['Steuerkennzeichen'])):
-                success_count += 1
-                
-        # 3. PREISART
-        if pd.notna(row_data.get('Preisart')):
-            print(f"\n3. PREISART auswählen (Artikel {artikel_nr})...")
-            if select_dropdown_option(page, "Preisart", str(row_data['Preisart'])):
-                success_count += 1
-                
-        # 4. PREIS JE MENGENEINHEIT
-        if pd.notna(row_data.get('Preis_je_Mengeneinheit')):
-            print(f"\n4. PREIS JE MENGENEINHEIT eingeben (Artikel {artikel_nr})...")
-            german_price = convert_to_german_number(row_data['Preis_je_Mengeneinheit'])
-            if fill_numeric_field(page, "Preis je Mengeneinheit", german_price):
-                success_count += 1
-                
-        # 5. WÄHRUNG
-        if pd.notna(row_data.get('Waehrung')):
-            print(f"\n5. WÄHRUNG auswählen (Artikel {artikel_nr})...")
-            if select_dropdown_option(page, "Waehrung", str(row_data['Waehrung'])):
-                success_count += 1
-                
-        # 6. RABATTTYP
-        if pd.notna(row_data.get('Rabatttyp')):
-            print(f"\n6. RABATTTYP auswählen (Artikel {artikel_nr})...")
-            if select_dropdown_option(page, "Rabatttyp", str(row_data['Rabatttyp'])):
-                success_count += 1
-                
-        # 7. RABATTWERT
-        if pd.notna(row_data.get('Rabattwert')):
-            print(f"\n7. RABATTWERT eingeben (Artikel {artikel_nr})...")
-            german_rabatt = convert_to_german_number(row_data['Rabattwert'])
-            if fill_numeric_field(page, "Rabattwert", german_rabatt):
-                success_count += 1
-                
-        # 8. LAUFZEIT
-        if pd.notna(row_data.get('Laufzeit')):
-            print(f"\n8. LAUFZEIT eingeben (Artikel {artikel_nr})...")
-            if fill_text_field(page, "Laufzeit", str(row_data['Laufzeit'])):
-                success_count += 1
-                
-        # 9. BESTELLMENGE
-        if pd.notna(row_data.get('Bestellmenge')):
-            print(f"\n9. BESTELLMENGE eingeben (Artikel {artikel_nr})...")
-            german_menge = convert_to_german_number(row_data['Bestellmenge'])
-            if fill_numeric_field(page, "Bestellmenge", german_menge):
-                success_count += 1
-                
-        # 10. EINHEIT
-        if pd.notna(row_data.get('Einheit')):
-            print(f"\n10. EINHEIT auswählen (Artikel {artikel_nr})...")
-            if select_combobox_option(page, str(row_data['Einheit'])):
-                success_count += 1
-                
-        # 11. LANGE ARTIKELBESCHREIBUNG
-        if pd.notna(row_data.get('Lange_Artikelbeschreibung')):
-            print(f"\n11. LANGE ARTIKELBESCHREIBUNG eingeben (Artikel {artikel_nr})...")
-            if fill_text_field(page, "Lange Artikelbeschreibung", str(row_data['Lange_Artikelbeschreibung'])):
-                success_count += 1
-                
-        # 12. ANGEBOTSREFERENZ
-        if pd.notna(row_data.get('Angebotsreferenz')):
-            print(f"\n12. ANGEBOTSREFERENZ eingeben (Artikel {artikel_nr})...")
-            if fill_text_field(page, "Angebotsreferenz", str(row_data['Angebotsreferenz'])):
-                success_count += 1
-                
-        # 13. ANGEBOTSDATUM
-        if pd.notna(row_data.get('Angebotsdatum')):
-            print(f"\n13. ANGEBOTSDATUM eingeben (Artikel {artikel_nr})...")
-            if fill_text_field(page, "Angebotsdatum", str(row_data['Angebotsdatum'])):
-                success_count += 1
-                
-        # 14. KONTIERUNGSOBJEKTTYP
-        if pd.notna(row_data.get('Kontierungsobjekttyp')):
-            print(f"\n14. KONTIERUNGSOBJEKTTYP auswählen (Artikel {artikel_nr})...")
-            if select_dropdown_option(page, "Kontierungsobjekttyp", str(row_data['Kontierungsobjekttyp'])):
-                success_count += 1
-                
-        # 15. KONTIERUNGSOBJEKT
-        if pd.notna(row_data.get('Kontierungsobjekt')):
-            print(f"\n15. KONTIERUNGSOBJEKT eingeben (Artikel {artikel_nr})...")
-            if fill_text_field(page, "Kontierungsobjekt", str(row_data['Kontierungsobjekt'])):
-                success_count += 1
-                
-        # 16. BEARBEITUNG ABSCHLIESSEN
-        print(f"\n16. BEARBEITUNG ABSCHLIESSEN (Artikel {artikel_nr})...")
-        selectors_to_try = [
-            "[id*='idButtonTransfer']",
-            "[id$='--idButtonTransfer']",
-            "button:has-text('Bearbeitung abschließen')",
-            "text=Bearbeitung abschließen",
-            "[id*='BDI-content']:has-text('Bearbeitung abschließen')"
+                with trace_step("category", artikel=artikel_nr):
+                    if select_category_robust(page, main_cat.strip(), sub_cat.strip(), artikel_nr):
+                        success_count += 1
+                    wait_for_ui5_idle(page, "category")
+        
+        # 1.-15. FORMULARFELDER
+        field_values = [
+            (field_spec, row_data.get(field_spec["column"]))
+            for field_spec in ARTICLE_FIELDS
+            if row_data.get(field_spec["column"]) is not None
         ]
         
-        button_found = False
-        for selector in selectors_to_try:
-            try:
-                bearbeitung_button = page.locator(selector)
-                if bearbeitung_button.count() > 0:
-                    bearbeitung_button.first.click()
-                    print(f"   OK 'Bearbeitung abschließen' geklickt")
-                    time.sleep(1.5)
-                    button_found = True
-                    success_count += 1
-                    break
-            except:
+        batch_result = {}
+        if batch_fill:
+            print(f"\n1.-15. FELDER gesammelt setzen (Artikel {artikel_nr})...")
+            with trace_step("batch_fill", artikel=artikel_nr):
+                batch_result = batch_fill_article_fields(page, field_values)
+            print(f"   {sum(1 for ok in batch_result.values() if ok)}/{len(field_values)} Felder per UI5-API gesetzt")
+        
+        for field_spec, value in field_values:
+            if batch_result.get(field_spec["field"]):
+                success_count += 1
                 continue
+            
+            print(f"\n{field_spec['nr']}. {field_spec['title']} (Artikel {artikel_nr})...")
+            with trace_step("field", type=field_spec["type"], field=field_spec["field"], artikel=artikel_nr):
+                if fill_form_field(page, field_spec, value):
+                    success_count += 1
         
-        if not button_found:
-            print("   FEHLER: 'Bearbeitung abschließen' Button nicht gefunden")
+        if journal:
+            journal.record(row_data, STATE_ENTERED)
+        
+        # Ausschnitt "element": Artikel-Ansicht vor dem Übernehmen festhalten
+        screenshots = get_screenshot_policy()
+        if screenshots.before_transfer and screenshots.wants_article(
+                artikel_nr, success_count == required_steps(row_data) - 1):
+            with trace_step("screenshot", artikel=artikel_nr):
+                screenshot_path = screenshots.capture(page, f"excel_import_artikel_{artikel_nr}",
+                                                      temp_dir or TEMP_DIR, element=True)
+            print(f"   Screenshot: {screenshot_path}")
+                
+        # 16. BEARBEITUNG ABSCHLIESSEN
+        print(f"\n16. BEARBEITUNG ABSCHLIESSEN (Artikel {artikel_nr})...")
+        with trace_step("transfer", artikel=artikel_nr):
+            bearbeitung_button, _ = get_selector_registry().find_first(page, "transfer_button", TRANSFER_SELECTORS)
+            if bearbeitung_button:
+                bearbeitung_button.click()
+                print(f"   OK 'Bearbeitung abschließen' geklickt")
+                wait_for_ui5_idle(page, "transfer")
+                success_count += 1
+            else:
+                print("   FEHLER: 'Bearbeitung abschließen' Button nicht gefunden")
+        if bearbeitung_button and journal:
+            journal.record(row_data, STATE_TRANSFERRED)
             
     except Exception as e:
         print(f"FEHLER bei Artikel {artikel_nr}: {e}")
@@ -431,9 +276,15 @@ def fill_article_form(page, row_data, artikel_nr):
     print(f"\nArtikel {artikel_nr} abgeschlossen: {success_count}/{total_fields} Felder erfolgreich")
     return success_count, total_fields
 
-def add_new_article_position(page, artikel_nr):
-    """Fügt eine neue Artikelposition hinzu"""
-    if artikel_nr == 1:
+def add_new_article_position(page, artikel_nr, must_create=False):
+    """
+    Fügt eine neue Artikelposition hinzu
+    
+    Ohne must_create gilt die erste Position als bereits geöffnet (Artikel 1).
+    import_rows entscheidet selbst und setzt must_create=True, damit auch
+    Artikel 1 in einem Warenkorb mit bestehenden Positionen angelegt wird.
+    """
+    if artikel_nr == 1 and not must_create:
         return True  # Erste Position ist bereits da
         
     print(f"\n{'='*60}")
@@ -444,9 +295,12 @@ def add_new_article_position(page, artikel_nr):
         # "Neue Position anlegen" klicken
         print(f"\n>> 'Neue Position anlegen' für Artikel {artikel_nr} klicken...")
         neue_position_button = page.locator("text=Neue Position anlegen")
+        if neue_position_button.count() == 0:
+            # Oberfläche nach dem Übernehmen noch nicht bereit
+            settle_after_miss("transfer")
         if neue_position_button.count() > 0:
             neue_position_button.click()
-            time.sleep(0.5)
+            wait_for_ui5_idle(page, "position")
             print("   OK 'Neue Position anlegen' geklickt")
         else:
             print("   FEHLER: 'Neue Position anlegen' Button nicht gefunden")
@@ -456,106 +310,1059 @@ def add_new_article_position(page, artikel_nr):
         print(f"\n>> 'Freitext' für Artikel {artikel_nr} auswählen...")
         freitext_button = page.locator("text=Freitext").first
         freitext_button.click()
-        time.sleep(1.5)
+        wait_for_ui5_idle(page, "position")
         print("   OK 'Freitext' ausgewählt")
         
         print(f"\n>> Artikel-Eingabe-Seite für Artikel {artikel_nr} erreicht!")
-        time.sleep(1)
+        wait_for_ui5_idle(page, "position")
+        
+        # Neue Position kann eine neue UI5-Komponente sein
+        discover_item_view(page)
         return True
         
     except Exception as e:
         print(f"FEHLER beim Hinzufügen neuer Position für Artikel {artikel_nr}: {e}")
         return False
 
-def excel_import_test(excel_filename):
-    """Hauptfunktion für Excel-Import-Test"""
-    print("=== AUTOBANF EXCEL-IMPORT TEST ===")
-    print(f"Excel-Datei: {excel_filename}")
-    print()
+TEMP_DIR = ".temp"
+
+# Wartezeit im Eingangsordner-Modus, wenn die Artikel-Seite nicht erreichbar ist
+BROWSER_RETRY_SECONDS = 60
+
+def ensure_temp_dir(temp_dir=TEMP_DIR):
+    """Erstellt den Temp-Ordner für Screenshots falls nötig"""
+    if not os.path.exists(temp_dir):
+        os.makedirs(temp_dir, exist_ok=True)
+        print(f">> Temp-Ordner '{temp_dir}' erstellt")
+    return temp_dir
+
+def import_rows(page, records, temp_dir=TEMP_DIR, batch_fill=False, journal=None, position_open=True,
+                on_row_done=None, stop_event=None):
+    """
+    Trägt Artikel-Zeilen nacheinander in den aktuellen Warenkorb ein
+    
+    Args:
+        page: Playwright page object (auf der Artikel-Eingabe-Seite)
+        records: Iterable von ArticleRecords (normalize_articles/normalize_rows)
+        temp_dir (str): Ordner für Screenshots
+        batch_fill (bool): Felder gesammelt über die UI5-Control-API setzen
+        journal (ImportJournal): Bereits übernommene Artikel überspringen und
+            den Fortschritt festhalten (optional)
+        position_open (bool): Eine leere Position ist bereits geöffnet; False, wenn
+            der Warenkorb schon Artikel enthält (z.B. --single-cart ab der zweiten Datei)
+        on_row_done (callable): on_row_done(record, row_result) nach jedem Artikel, mit
+            row_result = {"success", "fields", "ok", "seconds"} (z.B. für die Auftrags-Datenbank)
+        stop_event (threading.Event): Ist es gesetzt, endet der Import vor dem nächsten
+            Artikel (z.B. Frist des Auftrags an einen anderen Worker verloren)
     
+    Returns:
+        dict: processed, success, fields
+    """
+    result = {"processed": 0, "success": 0, "fields": 0}
+    if journal:
+        records = journal.pending(records)
+    
+    for position, record in enumerate(records, start=1):
+        artikel_nr = record.index + 1
+        if stop_event is not None and stop_event.is_set():
+            print(f"ABBRUCH vor Artikel {artikel_nr}: Import wurde angehalten")
+            break
+        row_started = time.perf_counter()
+        
+        # Neue Position hinzufügen (außer bei der bereits geöffneten ersten Position)
+        if position > 1 or not position_open:
+            with trace_step("new_position", artikel=artikel_nr):
+                added = add_new_article_position(page, artikel_nr, must_create=True)
+            if not added:
+                print(f"ABBRUCH: Konnte keine neue Position für Artikel {artikel_nr} hinzufügen")
+                break
+            
+        # Artikel-Formular ausfüllen
+        with trace_step("article", artikel=artikel_nr):
+            success_count, field_count = fill_article_form(page, record, artikel_nr, batch_fill, journal, temp_dir)
+        result["processed"] += 1
+        result["success"] += success_count
+        result["fields"] += field_count
+        
+        # Screenshot nach dem Artikel (je nach --screenshots, geschrieben im Hintergrund)
+        screenshots = get_screenshot_policy()
+        ok = success_count == required_steps(record)
+        if not screenshots.before_transfer and screenshots.wants_article(artikel_nr, ok):
+            with trace_step("screenshot", artikel=artikel_nr):
+                screenshot_path = screenshots.capture(page, f"excel_import_artikel_{artikel_nr}", temp_dir)
+            print(f"Screenshot: {screenshot_path}")
+        
+        if on_row_done:
+            on_row_done(record, {"success": success_count, "fields": field_count, "ok": ok,
+                                 "seconds": time.perf_counter() - row_started})
+    
+    return result
+
+def import_rows_odata(page, records, temp_dir=TEMP_DIR, batch_fill=False, journal=None,
+                      batch_size=ODATA_BATCH_SIZE):
+    """
+    Trägt Artikel über die OData-Engine ein (experimentell, siehe lib/odata_engine.py)
+    
+    Die ersten ODATA_SAMPLE_ROWS Artikel laufen über die Oberfläche und dienen
+    als Muster; danach werden alle Artikel, die die Vorlage abbildet, als
+    $batch direkt angelegt. Vom nächsten übrigen Artikel an geht es über die
+    Oberfläche weiter: jeder dort eingetragene Artikel wird aufgezeichnet und
+    verfeinert die Vorlage, bevor die restlichen Artikel erneut geprüft werden.
+    Vom Server abgelehnte Artikel werden nur noch über die Oberfläche eingetragen.
+    
+    Args:
+        batch_size (int): Artikel je $batch-Anfrage
+        (übrige wie import_rows)
+    
+    Returns:
+        dict: processed, success, fields, odata (davon direkt angelegt)
+    """
+    result = {"processed": 0, "success": 0, "fields": 0, "odata": 0}
+    pending = list(journal.pending(records)) if journal else list(records)
+    rejected = set()        # vom Server abgelehnte Artikel (Index)
+    position_open = True    # leere Position auf der Artikel-Eingabe-Seite geöffnet
+    odata_enabled = True
+    known_fields = None
+    submitter = None
+    
+    recorder = ODataRecorder()
+    recorder.attach(page)
+    try:
+        while pending:
+            template = None
+            if odata_enabled and len(recorder.samples) >= ODATA_SAMPLE_ROWS:
+                template, reason = learn_template(recorder.samples)
+                if template is None:
+                    print(f">> OData: keine Vorlage ({reason}) - alle weiteren Artikel über die Oberfläche")
+                    odata_enabled = False
+                elif template.fields != known_fields:
+                    known_fields = template.fields
+                    print(f">> OData: Vorlage aus {len(recorder.samples)} Muster-Artikeln, zugeordnete "
+                          f"Spalten: {', '.join(known_fields) or '-'} ({template.save()})")
+            
+            if template is not None:
+                if submitter is None:
+                    submitter = ODataSubmitter(page.context.request, template)
+                submitter.template = template
+                direct = [record for record in pending
+                          if record.index not in rejected and template.accepts(record)]
+                for start in range(0, len(direct), batch_size):
+                    batch = direct[start:start + batch_size]
+                    try:
+                        with trace_step("odata_batch", artikel=batch[0].index + 1):
+                            accepted = submitter.submit(batch)
+                    except Exception as e:
+                        print(f">> OData: $batch fehlgeschlagen ({e}) - restliche Artikel über die Oberfläche")
+                        odata_enabled = False
+                        break
+                    for record, ok in zip(batch, accepted):
+                        if not ok:
+                            rejected.add(record.index)
+                            continue
+                        pending.remove(record)
+                        steps = required_steps(record)
+                        result["processed"] += 1
+                        result["success"] += steps
+                        result["fields"] += steps
+                        result["odata"] += 1
+                        if journal:
+                            journal.record(record, STATE_TRANSFERRED)
+                    print(f">> OData: Artikel {batch[0].index + 1}-{batch[-1].index + 1}: "
+                          f"{sum(accepted)}/{len(batch)} angelegt")
+                if not pending:
+                    break
+            
+            # Nächsten Artikel über die Oberfläche eintragen (und als Muster aufzeichnen)
+            record = pending.pop(0)
+            ui_result = import_rows(page, [record], temp_dir, batch_fill, journal, position_open,
+                                    on_row_done=recorder.row_done)
+            for key in ("processed", "success", "fields"):
+                result[key] += ui_result[key]
+            position_open = position_open and not ui_result["processed"]
+    finally:
+        recorder.detach()
+    return result
+
+def import_shard(page, shard_df, shard_nr, batch_fill=False):
+    """Importiert einen Shard in den Warenkorb seines Browser-Kontexts"""
+    temp_dir = ensure_temp_dir()
+    screenshots = get_screenshot_policy()
+    try:
+        result = import_rows(page, normalize_articles(shard_df), temp_dir, batch_fill)
+    except Exception:
+        if screenshots.enabled:
+            screenshots.capture(page, f"excel_import_error_shard{shard_nr}", temp_dir)
+        raise
+    
+    if screenshots.enabled:
+        final_screenshot_path = screenshots.capture(page, f"excel_import_complete_shard{shard_nr}", temp_dir)
+        print(f"\nFinal Screenshot Shard {shard_nr}: {final_screenshot_path}")
+    return result
+
+def prepare_workbook(excel_filename):
+    """
+    Liest eine Excel-Datei ein, bereitet die Artikel auf und prüft sie
+    
+    Returns:
+        tuple: (df, records) oder None, wenn die Datei nicht importiert werden kann
+    """
     # Excel-Datei einlesen
     df = read_excel_file(excel_filename)
     if df is None:
-        return
+        return None
+    
+    # Kategorien gegen den lokalen Katalog prüfen (falls vorhanden)
+    if not apply_category_catalog(df):
+        print("ABBRUCH: Unbekannte Kategorien in der Excel-Datei")
+        return None
         
+    # Alle Werte vorab spaltenweise aufbereiten
+    records = normalize_articles(df)
+    
+    # Alle Zeilen prüfen, bevor der Browser startet
+    if not check_records(records):
+        return None
+    
     print(f"\n>> {len(df)} Artikel werden importiert:")
-    for i, row in df.iterrows():
-        artikel_name = row.get('Artikelbeschreibung', f'Artikel {i+1}')
-        print(f"   {i+1}. {artikel_name}")
+    for record in records:
+        artikel_name = record.get('Artikelbeschreibung', f'Artikel {record.index + 1}')
+        print(f"   {record.index + 1}. {artikel_name}")
     print()
+    return df, records
+
+def excel_import_test(excel_filename, shards=1, shard_column=None, batch_fill=False, reuse_session=True,
+                      use_daemon=True, stream=False, resume=False, username=None, password=None,
+                      engine="sync", odata_batch_size=ODATA_BATCH_SIZE):
+    """
+    Hauptfunktion für Excel-Import-Test
+    
+    Args:
+        excel_filename (str): Pfad zur Excel-Datei
+        shards (int): Anzahl paralleler Browser-Kontexte (1 = klassischer Import)
+        shard_column (str): Gruppierungsspalte für die Shard-Aufteilung (optional)
+        batch_fill (bool): Felder gesammelt über die UI5-Control-API setzen
+        reuse_session (bool): Gespeicherte Sitzung wiederverwenden statt neu anzumelden
+        use_daemon (bool): Mit laufendem Browser-Daemon verbinden (falls vorhanden)
+        stream (bool): Excel-Datei zeilenweise lesen, während bereits importiert wird
+        resume (bool): Im Journal als übernommen vermerkte Artikel überspringen
+        username (str): HSA-Benutzername (optional, sonst gespeichert/abgefragt)
+        password (str): HSA-Passwort (optional)
+        engine (str): "sync" (Oberfläche) oder "odata" (Muster-Artikel über die
+            Oberfläche, übrige direkt über OData)
+        odata_batch_size (int): Artikel je $batch-Anfrage der OData-Engine
+    
+    Returns:
+        dict: rows, processed, success, fields, startup_seconds, import_seconds
+              (None bei Abbruch vor dem Import oder beim parallelen Import)
+    """
+    started = time.perf_counter()
+    start_trace(Path(excel_filename).stem)
+    print("=== AUTOBANF EXCEL-IMPORT TEST ===")
+    print(f"Excel-Datei: {excel_filename}")
+    print()
+    
+    if stream and (shards > 1 or shard_column):
+        print(">> HINWEIS: --stream gilt nur für den Import in einem Browser - Datei wird vollständig gelesen")
+        stream = False
+    if resume and (shards > 1 or shard_column):
+        print(">> HINWEIS: --resume gilt nur für den Import in einem Browser - wird ignoriert")
+        resume = False
+    
+    df = None
+    if stream:
+        # Zeilen werden erst beim Import gelesen
+        if not os.path.exists(excel_filename):
+            print(f"FEHLER: Datei '{excel_filename}' nicht gefunden!")
+            return
+        print(">> Streaming-Modus: Artikel werden während des Einlesens importiert")
+    else:
+        prepared = prepare_workbook(excel_filename)
+        if prepared is None:
+            return
+        df, records = prepared
     
     # Anmelden
-    cred_manager = SecureCredentials()
-    username, password = cred_manager.get_credentials_interactive()
+    if not username or not password:
+        cred_manager = SecureCredentials()
+        username, password = cred_manager.get_credentials_interactive()
     
     if not username or not password:
         print("ABBRUCH: Keine gültigen Anmeldedaten erhalten")
         return
     
-    # Zur Artikel-Seite navigieren
-    success, browser, page = navigate_to_artikel_page(username, password, create_screenshots=False)
+    # Paralleler Import in mehreren Browser-Kontexten
+    if shards > 1 or shard_column:
+        try:
+            process_shard = functools.partial(import_shard, batch_fill=batch_fill)
+            results = run_sharded_import(df, username, password, shards, process_shard, shard_column,
+                                         reuse_session=reuse_session)
+        except ValueError as e:
+            print(f"FEHLER: {e}")
+            return
+        print_shard_summary(results)
+        get_screenshot_policy().print_summary()
+        get_network_filter().print_summary()
+        get_launch_profile().print_summary()
+        get_pacing_controller().print_summary()
+        get_pacing_controller().save()
+        get_selector_registry().save()
+        print_trace_report()
+        return
+    
+    # Zur Artikel-Seite navigieren (oder Daemon-Browser übernehmen)
+    success, browser, page, attached = open_artikel_page(username, password, reuse_session, use_daemon)
     if not success:
         return
+    startup_seconds = time.perf_counter() - started
+    
+    temp_dir = ensure_temp_dir()
+    journal = ImportJournal(excel_filename, resume)
+    summary = None
         
     try:
-        time.sleep(1)
-        
-        # Temp-Ordner für Screenshots erstellen
-        temp_dir = ".temp"
-        if not os.path.exists(temp_dir):
-            os.makedirs(temp_dir)
-            print(f">> Temp-Ordner '{temp_dir}' erstellt")
-        
-        total_success = 0
-        total_fields = 0
+        wait_for_ui5_idle(page, "navigation")
         
         # Alle Artikel durchgehen
-        for index, row in df.iterrows():
-            artikel_nr = index + 1
-            
-            # Neue Position hinzufügen (außer beim ersten Artikel)
-            if not add_new_article_position(page, artikel_nr):
-                print(f"ABBRUCH: Konnte keine neue Position für Artikel {artikel_nr} hinzufügen")
-                break
-                
-            # Artikel-Formular ausfüllen
-            success_count, field_count = fill_article_form(page, row, artikel_nr)
-            total_success += success_count
-            total_fields += field_count
-            
-            # Screenshot nach jedem Artikel
-            screenshot_path = os.path.join(temp_dir, f"excel_import_artikel_{artikel_nr}.png")
-            page.screenshot(path=screenshot_path, full_page=True)
-            print(f"Screenshot: {screenshot_path}")
+        stream_problems = []
+        if stream:
+            # Ungültige Zeilen werden übersprungen und am Ende gemeldet
+            records = validated_records(
+                normalize_rows(catalog_checked_rows(stream_article_rows(excel_filename))),
+                stream_problems
+            )
+        import_started = time.perf_counter()
+        if engine == "odata":
+            result = import_rows_odata(page, records, temp_dir, batch_fill, journal, odata_batch_size)
+        else:
+            result = import_rows(page, records, temp_dir, batch_fill, journal)
+        summary = {
+            "rows": len(df) if df is not None else result["processed"],
+            **result,
+            "startup_seconds": round(startup_seconds, 2),
+            "import_seconds": round(time.perf_counter() - import_started, 2)
+        }
+        total_success = result["success"]
+        total_fields = result["fields"]
             
         # Final Screenshot
-        final_screenshot_path = os.path.join(temp_dir, "excel_import_complete.png")
-        page.screenshot(path=final_screenshot_path, full_page=True)
-        print(f"\nFinal Screenshot: {final_screenshot_path}")
+        screenshots = get_screenshot_policy()
+        if screenshots.enabled:
+            final_screenshot_path = screenshots.capture(page, "excel_import_complete", temp_dir)
+            print(f"\nFinal Screenshot: {final_screenshot_path}")
         
         print(f"\n{'='*60}")
         print("EXCEL-IMPORT ABGESCHLOSSEN!")
-        print(f"Artikel verarbeitet: {len(df)}")
-        print(f"Gesamterfolg: {total_success}/{total_fields} Felder ({total_success/total_fields*100:.1f}%)")
+        if df is not None:
+            print(f"Artikel verarbeitet: {result['processed']}/{len(df)}")
+        else:
+            print(f"Artikel verarbeitet: {result['processed']}")
+        if journal.skipped:
+            print(f"Übersprungen (bereits im Warenkorb): {journal.skipped}")
+        if result.get("odata"):
+            print(f"Davon direkt über OData angelegt: {result['odata']} "
+                  f"(erscheinen erst nach dem Neuladen des Warenkorbs)")
+        if total_fields:
+            print(f"Gesamterfolg: {total_success}/{total_fields} Felder ({total_success/total_fields*100:.1f}%)")
         print(f"{'='*60}")
+        if stream_problems:
+            print_validation_report(stream_problems)
+        get_pacing_controller().print_summary()
         
     except Exception as e:
         print(f"FEHLER: {e}")
-        error_screenshot_path = os.path.join(temp_dir, "excel_import_error.png")
-        page.screenshot(path=error_screenshot_path, full_page=True)
+        if get_screenshot_policy().enabled:
+            get_screenshot_policy().capture(page, "excel_import_error", temp_dir)
         
     finally:
-        close_browser_safely(browser)
+        hand_back_browser(browser, attached)
+        get_pacing_controller().save()
+        get_selector_registry().save()
+        get_screenshot_policy().print_summary()
+        get_network_filter().print_summary()
+        get_launch_profile().print_summary()
+        print_trace_report()
+    
+    return summary
+
+def batch_import(excel_filenames, single_cart=False, batch_fill=False, reuse_session=True,
+                 use_daemon=True, resume=False, username=None, password=None):
+    """
+    Importiert mehrere Excel-Dateien nacheinander in einem angemeldeten Browser
+    
+    Alle Dateien werden vorab geprüft; Browserstart, Login und Navigation
+    fallen nur einmal an. Jede Datei kommt in einen eigenen Warenkorb (siehe
+    import_into_cart) - mit single_cart alle in denselben. Screenshots liegen je Datei in
+    .temp/batch_NN_<Dateiname>/.
+    
+    Args:
+        excel_filenames (list): Pfade der Excel-Dateien (siehe expand_workbook_paths)
+        single_cart (bool): Alle Dateien in einen gemeinsamen Warenkorb
+        batch_fill (bool): Felder gesammelt über die UI5-Control-API setzen
+        reuse_session (bool): Gespeicherte Sitzung wiederverwenden statt neu anzumelden
+        use_daemon (bool): Mit laufendem Browser-Daemon verbinden (falls vorhanden)
+        resume (bool): Im Journal der jeweiligen Datei als übernommen vermerkte Artikel überspringen
+        username (str): HSA-Benutzername (optional, sonst gespeichert/abgefragt)
+        password (str): HSA-Passwort (optional)
+    
+    Returns:
+        list: Ergebnis je Datei (dict) - file, cart, rows, processed, success,
+              fields, skipped, seconds, error
+    """
+    print("=== AUTOBANF STAPEL-IMPORT ===")
+    print(f">> {len(excel_filenames)} Excel-Dateien, "
+          f"{'ein gemeinsamer Warenkorb' if single_cart else 'ein Warenkorb je Datei'}")
+    
+    # Alle Dateien prüfen, bevor der Browser startet
+    results = []
+    workbooks = []
+    for excel_filename in excel_filenames:
+        print(f"\n--- {excel_filename} ---")
+        result = {"file": excel_filename, "cart": None, "rows": 0, "processed": 0, "success": 0,
+                  "fields": 0, "skipped": 0, "seconds": 0.0, "error": None}
+        results.append(result)
+        prepared = prepare_workbook(excel_filename)
+        if prepared is None:
+            result["error"] = "Datei nicht importierbar (siehe Prüfung)"
+            continue
+        df, records = prepared
+        result["rows"] = len(df)
+        workbooks.append((result, records))
+    
+    if not workbooks:
+        print_batch_summary(results)
+        return results
+    
+    if not username or not password:
+        username, password = SecureCredentials().get_credentials_interactive()
+    if not username or not password:
+        print("ABBRUCH: Keine gültigen Anmeldedaten erhalten")
+        return results
+    
+    success, browser, page, attached = open_artikel_page(username, password, reuse_session, use_daemon)
+    if not success:
+        for result, _ in workbooks:
+            result["error"] = "Artikel-Seite nicht erreicht"
+        print_batch_summary(results)
+        return results
+    
+    state = new_cart_state(browser, page, username, password)
+    try:
+        for nr, (result, records) in enumerate(workbooks, start=1):
+            print(f"\n{'#'*60}")
+            print(f"DATEI {nr}/{len(workbooks)}: {result['file']}")
+            print(f"{'#'*60}")
+            temp_dir = os.path.join(TEMP_DIR, f"batch_{nr:02d}_{Path(result['file']).stem}")
+            import_into_cart(state, result, records, temp_dir, single_cart, batch_fill, resume)
+    finally:
+        hand_back_browser(state["browser"], attached)
+        print_batch_summary(results)
+        get_screenshot_policy().print_summary()
+        get_network_filter().print_summary()
+        get_launch_profile().print_summary()
+        get_pacing_controller().print_summary()
+        get_pacing_controller().save()
+        get_selector_registry().save()
+        print_trace_report()
+    
+    return results
+
+def new_cart_state(browser, page, username, password):
+    """
+    Zustand eines Browsers, der nacheinander mehrere Dateien importiert
+    
+    Erwartet eine Seite auf der Artikel-Eingabe mit leerer Position (open_artikel_page).
+    """
+    return {
+        "browser": browser,
+        "page": page,
+        "username": username,
+        "password": password,
+        "cart": 1,
+        "cart_items": 0,        # Artikel im aktuellen Warenkorb
+        "page_ready": True,     # False nach einem Fehler: Zustand der Seite unbekannt
+        "position_open": True   # leere Position auf der Artikel-Eingabe-Seite geöffnet
+    }
+
+def import_into_cart(state, result, records, temp_dir, single_cart=False, batch_fill=False, resume=False,
+                     on_row_done=None, stop_event=None):
+    """
+    Importiert die geprüften Artikel einer Datei im Browser eines Stapel-/Inbox-Laufs
+    
+    Enthält der aktuelle Warenkorb schon Artikel (oder ist die Seite nach einem
+    Fehler in unbekanntem Zustand), wird die Navigation ab dem Launchpad
+    wiederholt und damit ein neuer Warenkorb begonnen; eine abgelaufene
+    Sitzung meldet sap_login() dabei neu an. Mit single_cart wird stattdessen
+    eine weitere Position im bestehenden Warenkorb angelegt.
+    
+    Args:
+        state (dict): Zustand aus new_cart_state() (wird fortgeschrieben)
+        result (dict): Ergebnis der Datei (file, rows, ...; wird ergänzt)
+        records (list): ArticleRecords aus prepare_workbook()
+        temp_dir (str): Ordner für die Screenshots dieser Datei
+        single_cart (bool): Alle Dateien in einen gemeinsamen Warenkorb
+        batch_fill (bool): Felder gesammelt über die UI5-Control-API setzen
+        resume (bool): Im Journal der Datei als übernommen vermerkte Artikel überspringen
+        on_row_done (callable): Rückruf nach jedem Artikel (siehe import_rows)
+        stop_event (threading.Event): Import vor dem nächsten Artikel beenden (siehe import_rows)
+    
+    Returns:
+        dict: result
+    """
+    started = time.perf_counter()
+    # Eigener Trace je Datei; Schritte danach (z.B. Browserstart) landen im nächsten
+    start_trace(Path(result["file"]).stem)
+    page = state["page"]
+    try:
+        if not single_cart and (state["cart_items"] or not state["page_ready"]):
+            # Neuer Warenkorb: Navigation wiederholen, Anmeldung bleibt bestehen
+            state["page_ready"], state["browser"], page = navigate_to_artikel_page(
+                state["username"], state["password"], state["browser"], page, create_screenshots=False
+            )
+            state["page"] = page
+            state["cart"] += 1
+            state["cart_items"] = 0
+            state["position_open"] = True
+        elif not state["page_ready"]:
+            # Gemeinsamer Warenkorb: nur eine neue Position darin anlegen
+            state["page_ready"] = ensure_artikel_page(state["username"], state["password"], page)
+            state["position_open"] = True
+        if not state["page_ready"]:
+            result["error"] = "Artikel-Seite nicht erreicht"
+            return result
+        
+        temp_dir = ensure_temp_dir(temp_dir)
+        journal = ImportJournal(result["file"], resume)
+        result["cart"] = state["cart"]
+        imported = import_rows(page, records, temp_dir, batch_fill, journal, state["position_open"],
+                               on_row_done, stop_event)
+        result.update(imported)
+        result["skipped"] = journal.skipped
+        state["cart_items"] += imported["processed"]
+        state["position_open"] = state["position_open"] and not imported["processed"]
+        if imported["processed"] < len(records) - journal.skipped:
+            result["error"] = "Import abgebrochen"
+            state["page_ready"] = False
+        
+        screenshots = get_screenshot_policy()
+        if screenshots.enabled:
+            screenshots.capture(page, "excel_import_complete", temp_dir)
+    except Exception as e:
+        print(f"FEHLER bei {result['file']}: {e}")
+        result["error"] = str(e)
+        state["page_ready"] = False
+        if get_screenshot_policy().enabled:
+            try:
+                get_screenshot_policy().capture(page, "excel_import_error", ensure_temp_dir(temp_dir))
+            except Exception:
+                pass
+    finally:
+        result["seconds"] = time.perf_counter() - started
+        print_trace_report()
+    return result
+
+def watch_inbox(inbox, batch_fill=False, reuse_session=True, poll_seconds=POLL_SECONDS):
+    """
+    Überwacht einen Eingangsordner und importiert neue Excel-Dateien nacheinander
+    
+    Der Browser wird beim ersten Auftrag gestartet und bleibt mit seiner
+    Anmeldung offen; jede Datei kommt in einen eigenen Warenkorb
+    (import_into_cart). Bearbeitete Dateien wandern nach processed/ bzw.
+    failed/. Lässt sich die Artikel-Seite nicht erreichen (z.B. kein Netz),
+    bleibt die Datei liegen und wird nach BROWSER_RETRY_SECONDS erneut
+    versucht. Läuft, bis Strg+C gedrückt wird.
+    
+    Args:
+        inbox (str): Eingangsordner
+        batch_fill (bool): Felder gesammelt über die UI5-Control-API setzen
+        reuse_session (bool): Gespeicherte Sitzung wiederverwenden statt neu anzumelden
+        poll_seconds (int): Prüfintervall des Ordners
+    
+    Returns:
+        list: Ergebnis je bearbeiteter Datei (dict, wie batch_import)
+    """
+    print("=== AUTOBANF EINGANGSORDNER ===")
+    watcher = InboxWatcher(inbox)
+    print(f">> Überwache {watcher.inbox.resolve()} - erledigt: {watcher.processed_dir.name}/, "
+          f"fehlerhaft: {watcher.failed_dir.name}/ (Strg+C beendet)")
+    
+    username, password = SecureCredentials().get_credentials_interactive()
+    if not username or not password:
+        print("ABBRUCH: Keine gültigen Anmeldedaten erhalten")
+        return []
+    
+    results = []
+    state = None
+    try:
+        while True:
+            for path in watcher.ready_files():
+                print(f"\n{'#'*60}")
+                print(f"NEUE DATEI: {path.name}")
+                print(f"{'#'*60}")
+                result = {"file": str(path), "cart": None, "rows": 0, "processed": 0, "success": 0,
+                          "fields": 0, "skipped": 0, "seconds": 0.0, "error": None}
+                prepared = prepare_workbook(str(path))
+                if prepared is None:
+                    result["error"] = "Datei nicht importierbar (siehe Prüfung)"
+                else:
+                    # Browser beim ersten Auftrag bzw. nach einem Absturz (neu) starten
+                    if state is None or not state["browser"].is_connected():
+                        if state is not None:
+                            close_browser_safely(state["browser"])
+                            state = None
+                        try:
+                            success, browser, page, _ = open_artikel_page(username, password, reuse_session,
+                                                                          use_daemon=False)
+                        except Exception as e:
+                            print(f"FEHLER beim Browserstart: {e}")
+                            success, browser = False, None
+                        if not success:
+                            if browser is not None:
+                                close_browser_safely(browser)
+                            print(f">> Artikel-Seite nicht erreicht - neuer Versuch in {BROWSER_RETRY_SECONDS} s")
+                            time.sleep(BROWSER_RETRY_SECONDS)
+                            break
+                        state = new_cart_state(browser, page, username, password)
+                    df, records = prepared
+                    result["rows"] = len(df)
+                    temp_dir = os.path.join(TEMP_DIR, "watch", f"{time.strftime('%Y%m%d_%H%M%S')}_{path.stem}")
+                    import_into_cart(state, result, records, temp_dir, batch_fill=batch_fill)
+                
+                ok = result["error"] is None
+                target = watcher.move_done(path, ok, result["error"])
+                results.append(result)
+                print(f"\n>> {path.name}: {result['processed']}/{result['rows']} Artikel, "
+                      f"{'OK' if ok else 'FEHLER: ' + result['error']} -> {target.parent.name}/")
+            time.sleep(poll_seconds)
+    except KeyboardInterrupt:
+        print("\n>> Überwachung des Eingangsordners wird beendet")
+    finally:
+        if state is not None:
+            close_browser_safely(state["browser"])
+        if results:
+            print_batch_summary(results)
+        get_screenshot_policy().print_summary()
+        get_network_filter().print_summary()
+        get_launch_profile().print_summary()
+        get_pacing_controller().print_summary()
+        get_pacing_controller().save()
+        get_selector_registry().save()
+        print_trace_report()
+    
+    return results
+
+def job_worker(worker_nr, args, username, password, storage_state):
+    """
+    Worker-Prozess der Auftrags-Warteschlange (--workers)
+    
+    Startet den Browser beim ersten Auftrag mit der gemeinsamen Anmeldung
+    (storage_state) und behält ihn für alle weiteren; jeder Auftrag kommt in
+    einen eigenen Warenkorb. Ergebnis und Dauer jeder Zeile landen sofort in
+    der Datenbank. Ein übernommener Auftrag eines abgestürzten Workers wird
+    über das Journal fortgesetzt.
+    """
+    apply_settings(args)
+    queue = JobQueue(args.job_db)
+    worker = worker_name(worker_nr)
+    state = None
+    
+    def process_job(job, lease_lost):
+        nonlocal state
+        result = {"file": job["workbook"], "cart": None, "rows": 0, "processed": 0, "success": 0,
+                  "fields": 0, "skipped": 0, "seconds": 0.0, "error": None}
+        prepared = prepare_workbook(job["workbook"])
+        if prepared is None:
+            result["error"] = "Datei nicht importierbar (siehe Prüfung)"
+            return result
+        df, records = prepared
+        result["rows"] = len(df)
+        
+        if state is None or not state["browser"].is_connected():
+            if state is not None:
+                close_browser_safely(state["browser"])
+                state = None
+            browser = None
+            try:
+                browser, page = create_browser_page(storage_state=storage_state)
+                success, browser, page = navigate_to_artikel_page(
+                    username, password, browser, page, create_screenshots=False
+                )
+            except Exception as e:
+                print(f"FEHLER beim Browserstart: {e}")
+                success = False
+            if not success:
+                # Browser samt Playwright schließen, damit der nächste Auftrag neu starten kann
+                if browser is not None:
+                    close_browser_safely(browser)
+                result["error"] = "Artikel-Seite nicht erreicht"
+                return result
+            state = new_cart_state(browser, page, username, password)
+        
+        def on_row_done(record, row_result):
+            queue.record_row(job["id"], record.index, record.get("Artikelbeschreibung"),
+                             row_result["success"], row_result["fields"], row_result["ok"],
+                             row_result["seconds"])
+        
+        options = job["options"]
+        temp_dir = os.path.join(TEMP_DIR, "jobs", f"job_{job['id']:04d}")
+        return import_into_cart(state, result, records, temp_dir,
+                                batch_fill=options.get("batch_fill", False),
+                                resume=options.get("resume", False) or job["attempts"] > 1,
+                                on_row_done=on_row_done, stop_event=lease_lost)
+    
+    try:
+        done = work_jobs(queue, worker, process_job)
+        print(f"\n>> {worker}: Warteschlange leer - {done} Auftrag/Aufträge bearbeitet")
+    finally:
+        if state is not None:
+            close_browser_safely(state["browser"])
+        queue.close()
+        get_selector_registry().save()
+        get_screenshot_policy().print_summary()
+        get_launch_profile().print_summary()
+
+def run_job_workers(count, args):
+    """
+    Arbeitet die Auftrags-Warteschlange mit count Worker-Prozessen ab
+    
+    Angemeldet wird einmal im Hauptprozess; die Worker übernehmen die
+    Sitzung über den storage_state (wie beim parallelen Import).
+    """
+    print("=== AUTOBANF AUFTRAGS-WORKER ===")
+    queue = JobQueue(args.job_db)
+    reclaimed = queue.reclaim_expired()
+    if reclaimed:
+        print(f">> {reclaimed} Aufträge abgestürzter Worker wieder freigegeben")
+    pending = len(queue.jobs(STATE_QUEUED))
+    queue.close()
+    if not pending:
+        print(">> Keine wartenden Aufträge")
+        return
+    
+    username, password = SecureCredentials().get_credentials_interactive()
+    if not username or not password:
+        print("ABBRUCH: Keine gültigen Anmeldedaten erhalten")
+        return
+    storage_state = export_login_state(username, password, args.reuse_session)
+    if storage_state is None:
+        return
+    
+    count = min(count, pending)
+    print(f">> {pending} Aufträge, {count} Worker")
+    started = time.perf_counter()
+    run_worker_pool(count, job_worker, (args, username, password, storage_state))
+    print(f"\n>> Worker beendet nach {time.perf_counter() - started:.1f} s")
+    JobQueue(args.job_db).print_status()
+
+def print_batch_summary(results):
+    """Gibt die Übersicht je Excel-Datei eines Stapel-Imports aus"""
+    print(f"\n{'='*78}")
+    print("STAPEL-ÜBERSICHT")
+    print(f"{'='*78}")
+    print(f"{'Datei':<30}  {'Korb':>4}  {'Artikel':>9}  {'Felder OK':>11}  {'Dauer':>8}  Status")
+    
+    total_rows = total_processed = total_success = total_fields = 0
+    for result in results:
+        name = Path(result["file"]).name
+        if len(name) > 30:
+            name = name[:27] + "..."
+        cart = result["cart"] if result["cart"] is not None else "-"
+        status = "OK" if result["error"] is None else f"FEHLER: {result['error']}"
+        if result["skipped"]:
+            status += f" ({result['skipped']} übersprungen)"
+        print(f"{name:<30}  {cart:>4}  {result['processed']:>4}/{result['rows']:<4}  "
+              f"{result['success']:>5}/{result['fields']:<5}  {result['seconds']:>7.1f}s  {status}")
+        total_rows += result["rows"]
+        total_processed += result["processed"]
+        total_success += result["success"]
+        total_fields += result["fields"]
+    
+    print(f"{'-'*78}")
+    print(f"Dateien: {len(results)}, davon fehlerfrei: {sum(1 for r in results if r['error'] is None)}")
+    print(f"Artikel verarbeitet: {total_processed}/{total_rows}")
+    if total_fields:
+        print(f"Gesamterfolg: {total_success}/{total_fields} Felder ({total_success/total_fields*100:.1f}%)")
+    print(f"{'='*78}")
+
+def validate_workbook(excel_filename):
+    """
+    Prüft die Excel-Datei vollständig, ohne den Browser zu starten
+    
+    Returns:
+        bool: True, wenn keine Probleme gefunden wurden
+    """
+    print("=== AUTOBANF EXCEL-PRÜFUNG ===")
+    print(f"Excel-Datei: {excel_filename}")
+    
+    df = read_excel_file(excel_filename)
+    if df is None:
+        return False
+    
+    catalog_ok = apply_category_catalog(df)
+    problems = validate_records(normalize_articles(df))
+    print_validation_report(problems, len(df))
+    return catalog_ok and not problems
+
+def crawl_categories(reuse_session=True, use_daemon=True):
+    """Liest den vollständigen Kategorie-Baum und speichert ihn als lokalen Katalog"""
+    print("=== AUTOBANF KATEGORIE-KATALOG ERSTELLEN ===")
+    cred_manager = SecureCredentials()
+    username, password = cred_manager.get_credentials_interactive()
+    if not username or not password:
+        print("ABBRUCH: Keine gültigen Anmeldedaten erhalten")
+        return
+    
+    success, browser, page, attached = open_artikel_page(username, password, reuse_session, use_daemon)
+    if not success:
+        return
+    
+    try:
+        catalog = crawl_category_catalog(page)
+        if catalog is None:
+            return
+        catalog.save()
+        set_category_catalog(catalog)
+        print(f">> {len(catalog.entries)} Kategorien in {CATALOG_FILE} gespeichert")
+    except Exception as e:
+        print(f"FEHLER beim Erstellen des Katalogs: {e}")
+    finally:
+        hand_back_browser(browser, attached)
+
+def compare_launch_profiles(runs=2):
+    """
+    Startet jedes Startprofil mehrmals und vergleicht Startdauer, Ladezeit und Speicher
+    
+    Geöffnet wird nur die Portal-Startseite (ohne Anmeldung). Ab dem zweiten
+    Durchlauf zeigt sich bei headless-production der Nutzen des Caches.
+    
+    Args:
+        runs (int): Starts je Profil
+    
+    Returns:
+        list: Messwerte je Start (dict)
+    """
+    print("=== AUTOBANF STARTPROFILE VERGLEICHEN ===")
+    print(f"Seite: {SAP_PORTAL_URL}")
+    results = []
+    for name in LAUNCH_PROFILES:
+        set_launch_profile(name)
+        for run in range(1, runs + 1):
+            result = {"profile": name, "run": run, "launch_seconds": None, "load_seconds": None,
+                      "memory_bytes": None, "error": None}
+            browser = None
+            try:
+                started = time.perf_counter()
+                browser, page = create_browser_page()
+                result["launch_seconds"] = time.perf_counter() - started
+                started = time.perf_counter()
+                page.goto(SAP_PORTAL_URL, timeout=30000)
+                wait_for_ui5_idle(page, "login")
+                result["load_seconds"] = time.perf_counter() - started
+                result["memory_bytes"] = chromium_memory_bytes()
+            except Exception as e:
+                result["error"] = str(e)
+            finally:
+                if browser is not None:
+                    close_browser_safely(browser)
+            results.append(result)
+    
+    print(f"\n{'Profil':<22}{'Lauf':>5}{'Start':>9}{'Laden':>9}{'Speicher':>12}")
+    for result in results:
+        if result["error"]:
+            print(f"{result['profile']:<22}{result['run']:>5}   FEHLER: {result['error']}")
+            continue
+        print(f"{result['profile']:<22}{result['run']:>5}{result['launch_seconds']:>8.1f}s"
+              f"{result['load_seconds']:>8.1f}s{format_megabytes(result['memory_bytes']):>12}")
+    set_launch_profile(DEFAULT_LAUNCH_PROFILE)
+    return results
+
+def parse_arguments(argv=None):
+    """Liest die Kommandozeilen-Parameter"""
+    parser = argparse.ArgumentParser(
+        prog="autoBANF.py",
+        description="AutoBANF - Automatischer Import von Excel zu GISA easyBANF",
+        epilog="BEISPIEL: python autoBANF.py templates\\mouser.xlsx"
+    )
+    parser.add_argument("excel_filenames", nargs="*", metavar="excel_filename",
+                        help="Excel-Datei(en) mit dem Blatt 'Artikel_Import'; mehrere Dateien oder "
+                             "Platzhalter wie bestellungen\\*.xlsx werden nacheinander mit einer Anmeldung importiert")
+    parser.add_argument("--watch", metavar="ORDNER",
+                        help="Eingangsordner überwachen und neue Excel-Dateien nacheinander importieren; "
+                             "erledigte Dateien nach ORDNER/processed, fehlerhafte nach ORDNER/failed")
+    parser.add_argument("--submit", action="store_true",
+                        help="Excel-Dateien nur als Aufträge in die Warteschlange (--job-db) einstellen")
+    parser.add_argument("--workers", type=int, default=0, metavar="N",
+                        help="N Worker-Prozesse mit je eigenem Browser arbeiten die Warteschlange ab")
+    parser.add_argument("--jobs", action="store_true",
+                        help="Aufträge der Warteschlange mit Zustand, Artikeln und Dauer anzeigen")
+    parser.add_argument("--job-db", default=str(JOB_DB_FILE), metavar="PFAD",
+                        help=f"SQLite-Datei der Warteschlange (Standard: {JOB_DB_FILE})")
+    parser.add_argument("--single-cart", action="store_true",
+                        help="Bei mehreren Dateien alle Artikel in einen gemeinsamen Warenkorb "
+                             "(Standard: ein Warenkorb je Datei)")
+    parser.add_argument("--shards", type=int, default=1, metavar="N",
+                        help="Artikel auf N parallele Browser-Kontexte/Warenkörbe verteilen")
+    parser.add_argument("--shard-by", metavar="SPALTE",
+                        help="Shards nach Spalte gruppieren, z.B. Kontierungsobjekt")
+    parser.add_argument("--batch-fill", action="store_true",
+                        help="Alle Felder eines Artikels in einem Aufruf über die UI5-Control-API setzen "
+                             "(nicht gesetzte Felder weiterhin einzeln über die Oberfläche)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Excel-Datei zeilenweise lesen und sofort importieren (für sehr große Listen)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Abgebrochenen Import fortsetzen: bereits übernommene Artikel überspringen, "
+                             "geänderte Zeilen neu eintragen")
+    parser.add_argument("--engine", choices=["sync", "async", "odata"], default="sync",
+                        help="sync: klassischer Import, async: asyncio-Engine mit --shards Seiten in einer Event-Loop, "
+                             "odata: experimentell - erste Artikel über die Oberfläche, übrige direkt über OData")
+    parser.add_argument("--odata-batch-size", type=int, default=ODATA_BATCH_SIZE, metavar="N",
+                        help=f"Artikel je $batch-Anfrage bei --engine odata (Standard: {ODATA_BATCH_SIZE})")
+    parser.add_argument("--pacing", choices=list(PACING_PROFILES), default=DEFAULT_PROFILE,
+                        help="Wartezeiten-Profil: fast, normal, vpn (langsame Verbindung) "
+                             "oder legacy (altes festes slow_mo=800)")
+    parser.add_argument("--no-session-reuse", dest="reuse_session", action="store_false",
+                        help="Gespeicherte Sitzung nicht verwenden, immer neu anmelden")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Browser-Daemon starten: hält einen angemeldeten Browser auf der Artikel-Seite bereit")
+    parser.add_argument("--no-daemon", dest="use_daemon", action="store_false",
+                        help="Laufenden Browser-Daemon nicht verwenden, eigenen Browser starten")
+    parser.add_argument("--validate", action="store_true",
+                        help="Excel-Datei nur prüfen (Dropdown-Werte, Einheiten, Zahlen, Datumsangaben) "
+                             "und alle Probleme auflisten, ohne den Browser zu starten")
+    parser.add_argument("--crawl-categories", action="store_true",
+                        help=f"Kategorie-Baum einmal vollständig einlesen und in {CATALOG_FILE} speichern")
+    parser.add_argument("--screenshots", choices=SCREENSHOT_MODES, default=DEFAULT_SCREENSHOT_MODE,
+                        help="Wann Screenshots entstehen: all (nach jedem Artikel), every-n, "
+                             "on-failure (nur fehlerhafte Artikel) oder none")
+    parser.add_argument("--screenshot-every", type=int, default=DEFAULT_SCREENSHOT_EVERY, metavar="N",
+                        help=f"Bei --screenshots every-n: jeden N-ten Artikel (Standard: {DEFAULT_SCREENSHOT_EVERY})")
+    parser.add_argument("--screenshot-scope", choices=SCREENSHOT_SCOPES, default=DEFAULT_SCREENSHOT_SCOPE,
+                        help="Ausschnitt: page (ganze Seite), viewport (sichtbarer Bereich) "
+                             "oder element (nur Artikel-Ansicht vor dem Übernehmen)")
+    parser.add_argument("--screenshot-format", choices=SCREENSHOT_FORMATS, default="png",
+                        help="Bildformat der Screenshots (jpeg ist deutlich kleiner)")
+    parser.add_argument("--screenshot-quality", type=int, default=DEFAULT_JPEG_QUALITY, metavar="Q",
+                        help=f"JPEG-Qualität 1-100 (Standard: {DEFAULT_JPEG_QUALITY})")
+    parser.add_argument("--block", choices=list(BLOCK_PROFILES), default=DEFAULT_BLOCK_PROFILE,
+                        help="Nicht benötigte Ressourcen blockieren: off, safe (Bilder, Medien, Tracking; "
+                             "Standard) oder strict (zusätzlich Webfonts)")
+    parser.add_argument("--block-measure", action="store_true",
+                        help="Nichts blockieren, sondern messen, wie viele Anfragen und Bytes --block einsparen würde")
+    parser.add_argument("--launch", choices=list(LAUNCH_PROFILES), default=DEFAULT_LAUNCH_PROFILE,
+                        help="Startprofil: interactive (sichtbar, Standard), headless-production "
+                             "(ohne Fenster, mit Cache) oder low-memory (ohne Fenster, wenig Speicher)")
+    parser.add_argument("--compare-launch-profiles", action="store_true",
+                        help="Alle Startprofile nacheinander starten und Startdauer, Ladezeit "
+                             "und Speicher vergleichen")
+    parser.add_argument("--record-har", nargs="?", const="", default=None, metavar="PFAD",
+                        help="Netzwerkverkehr des Laufs als HAR-Datei aufzeichnen "
+                             "(Standard: .temp/har/session_<Zeitstempel>.har.zip)")
+    parser.add_argument("--replay-har", metavar="PFAD",
+                        help="Alle Anfragen aus einer aufgezeichneten HAR-Datei beantworten - ohne Netzwerk")
+    args = parser.parse_args(argv)
+    args.excel_filenames = expand_workbook_paths(args.excel_filenames)
+    args.excel_filename = args.excel_filenames[0] if args.excel_filenames else None
+    if not args.excel_filename and not args.crawl_categories and not args.daemon \
+            and not args.compare_launch_profiles and not args.watch \
+            and not args.workers and not args.jobs:
+        parser.error("Excel-Datei fehlt")
+    if args.submit or args.workers or args.jobs:
+        if args.excel_filenames and not args.submit:
+            parser.error("Excel-Dateien mit --submit als Aufträge einstellen")
+        if args.workers < 0 or args.daemon or args.watch or args.engine == "async" or args.shards > 1 \
+                or args.shard_by or args.stream or args.record_har is not None or args.replay_har:
+            parser.error("--submit/--workers/--jobs sind nicht mit --daemon, --watch, --engine async, --shards, "
+                         "--shard-by, --stream oder HAR kombinierbar")
+    elif len(args.excel_filenames) > 1 and not args.validate:
+        if args.engine == "async" or args.shards > 1 or args.shard_by or args.stream:
+            parser.error("Mehrere Excel-Dateien werden nur nacheinander in einem Browser importiert "
+                         "(ohne --engine async, --shards, --shard-by, --stream)")
+    if args.record_har is not None or args.replay_har:
+        if args.record_har is not None and args.replay_har:
+            parser.error("--record-har und --replay-har schließen sich aus")
+        if args.daemon or args.watch or args.engine == "async" or args.shards > 1 or args.shard_by:
+            parser.error("--record-har/--replay-har gelten nur für den Import in einem Browser "
+                         "(ohne --daemon, --watch, --engine async, --shards, --shard-by)")
+    if args.engine == "odata":
+        if len(args.excel_filenames) > 1 or args.watch or args.submit or args.workers or args.jobs \
+                or args.daemon or args.shards > 1 or args.shard_by or args.stream:
+            parser.error("--engine odata gilt nur für den Import einer Excel-Datei in einem Browser "
+                         "(ohne --watch, Aufträge, --daemon, --shards, --shard-by, --stream)")
+        if args.odata_batch_size < 1:
+            parser.error("--odata-batch-size muss mindestens 1 sein")
+    if args.watch and (args.excel_filenames or args.daemon or args.engine == "async"
+                       or args.shards > 1 or args.shard_by or args.stream):
+        parser.error("--watch importiert die Dateien des Eingangsordners nacheinander in einem Browser "
+                     "(ohne Excel-Datei, --daemon, --engine async, --shards, --shard-by, --stream)")
+    return args
+
+def apply_settings(args):
+    """Überträgt Pacing, Screenshots, Block-Liste und Startprofil aus den Parametern"""
+    set_pacing_profile(args.pacing)
+    set_screenshot_policy(args.screenshots, args.screenshot_scope, args.screenshot_every,
+                          args.screenshot_format, args.screenshot_quality)
+    set_network_filter(args.block, args.block_measure)
+    set_launch_profile(args.launch)
 
 def main():
     """Hauptprogramm mit Parameterverarbeitung"""
-    if len(sys.argv) != 2:
-        print("VERWENDUNG: python excel_import_with_params.py <excel_filename>")
-        print("BEISPIEL:   python excel_import_with_params.py Test.xlsx")
+    args = parse_arguments()
+    apply_settings(args)
+    if args.submit or args.workers or args.jobs:
+        queue = JobQueue(args.job_db)
+        if args.submit:
+            options = {"batch_fill": args.batch_fill, "resume": args.resume}
+            for excel_filename in args.excel_filenames:
+                print(f">> Auftrag {queue.submit(excel_filename, options)}: {excel_filename}")
+        queue.close()
+        if args.workers:
+            run_job_workers(args.workers, args)
+        elif args.jobs:
+            JobQueue(args.job_db).print_status()
         return
-        
-    excel_filename = sys.argv[1]
-    excel_import_test(excel_filename)
+    if args.compare_launch_profiles:
+        compare_launch_profiles()
+        return
+    if args.daemon:
+        run_daemon(reuse_session=args.reuse_session)
+        return
+    if args.record_har is not None or args.replay_har:
+        mode = MODE_RECORD if args.record_har is not None else MODE_REPLAY
+        try:
+            har_path = set_har_mode(mode, args.record_har or args.replay_har)
+        except FileNotFoundError as e:
+            print(f"FEHLER: {e}")
+            sys.exit(1)
+        # Aufzeichnung und Wiedergabe müssen denselben Ablauf sehen: immer neu anmelden
+        args.reuse_session = False
+        args.use_daemon = False
+        if mode == MODE_RECORD:
+            print(f">> Netzwerkverkehr wird aufgezeichnet: {har_path}")
+    if args.watch:
+        watch_inbox(args.watch, batch_fill=args.batch_fill, reuse_session=args.reuse_session)
+        return
+    if args.crawl_categories:
+        crawl_categories(reuse_session=args.reuse_session, use_daemon=args.use_daemon)
+        return
+    if args.validate:
+        results = [validate_workbook(excel_filename) for excel_filename in args.excel_filenames]
+        if not all(results):
+            sys.exit(1)
+        return
+    if args.engine == "async":
+        if args.resume:
+            print(">> HINWEIS: --resume wird von der asyncio-Engine nicht unterstützt")
+        asyncio.run(import_workbook(args.excel_filename, concurrency=args.shards,
+                                    group_column=args.shard_by, batch_fill=args.batch_fill,
+                                    reuse_session=args.reuse_session))
+        return
+    if len(args.excel_filenames) > 1:
+        batch_import(args.excel_filenames, single_cart=args.single_cart, batch_fill=args.batch_fill,
+                     reuse_session=args.reuse_session, use_daemon=args.use_daemon, resume=args.resume)
+        return
+    excel_import_test(args.excel_filename, shards=args.shards, shard_column=args.shard_by,
+                      batch_fill=args.batch_fill, reuse_session=args.reuse_session,
+                      use_daemon=args.use_daemon, stream=args.stream, resume=args.resume,
+                      engine=args.engine, odata_batch_size=args.odata_batch_size)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
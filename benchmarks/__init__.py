@@ -0,0 +1,10 @@
+"""
+autoBANF Benchmarks
+===================
+
+Durchsatzmessungen ohne Produktivsystem:
+
+- mock_easybanf: Lokaler Nachbau von SAP-Login und easyBANF-Artikelansicht
+- generate_workbook: Test-Arbeitsmappen mit 10 bis 1000 gültigen Artikeln
+- run_benchmark: Import gegen den Nachbau, Auswertung Artikel/min, Startzeit, Speicher
+"""
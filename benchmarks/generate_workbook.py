@@ -0,0 +1,92 @@
+"""
+generate_workbook.py - Erzeugt Test-Arbeitsmappen für die Messungen
+===================================================================
+
+Schreibt ein Blatt "Artikel_Import" mit gültigen Werten: Dropdown-Optionen
+aus DROPDOWN_CONFIG, Einheiten aus KNOWN_UNITS und Kategorien aus dem
+easyBANF-Nachbau (MOCK_CATEGORIES). Mit gleichem seed entstehen identische
+Dateien, damit Läufe vergleichbar bleiben.
+
+Verwendung:
+    python -m benchmarks.generate_workbook .temp/benchmarks/artikel_100.xlsx --rows 100
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from lib.complete_form_fill import DROPDOWN_CONFIG, KNOWN_UNITS
+from lib.excel_reader import SHEET_NAME, ARTICLE_COLUMNS
+from .mock_easybanf import MOCK_CATEGORIES
+
+def generate_rows(rows, seed=0):
+    """
+    Erzeugt gültige Artikelzeilen
+
+    Args:
+        rows (int): Anzahl Artikel
+        seed (int): Startwert des Zufallsgenerators
+
+    Returns:
+        list: dicts mit den Spalten aus ARTICLE_COLUMNS
+    """
+    rng = random.Random(seed)
+    categories = [f"{main}->{sub}" for main, subs in MOCK_CATEGORIES.items() for sub in subs]
+    options = {field: list(spec["options"]) for field, spec in DROPDOWN_CONFIG.items()}
+    start = date(2026, 1, 1)
+
+    generated = []
+    for nr in range(1, rows + 1):
+        begin = start + timedelta(days=rng.randrange(0, 180))
+        offer = begin - timedelta(days=rng.randrange(1, 30))
+        generated.append({
+            'Kategorie': rng.choice(categories),
+            'Artikelbeschreibung': f"Messartikel {nr:04d}",
+            'Steuerkennzeichen': rng.choice(options["Steuerkennzeichen"]),
+            'Preisart': rng.choice(options["Preisart"]),
+            'Preis_je_Mengeneinheit': round(rng.uniform(0.5, 500), 2),
+            'Waehrung': rng.choice(options["Waehrung"]),
+            'Rabatttyp': rng.choice(options["Rabatttyp"]),
+            'Rabattwert': rng.randrange(0, 15),
+            'Laufzeit': f"{begin:%d.%m.%Y} - {begin + timedelta(days=365):%d.%m.%Y}",
+            'Bestellmenge': rng.randrange(1, 50),
+            'Einheit': rng.choice(KNOWN_UNITS),
+            'Lange_Artikelbeschreibung': f"Automatisch erzeugter Messartikel Nr. {nr}",
+            'Angebotsreferenz': f"AN-{rng.randrange(10000, 99999)}",
+            'Angebotsdatum': offer.strftime("%d.%m.%Y"),
+            'Kontierungsobjekttyp': rng.choice(options["Kontierungsobjekttyp"]),
+            'Kontierungsobjekt': str(rng.randrange(1000000, 9999999))
+        })
+    return generated
+
+def generate_workbook(path, rows, seed=0):
+    """
+    Schreibt eine Test-Arbeitsmappe
+
+    Args:
+        path (str): Ziel-Datei (.xlsx)
+        rows (int): Anzahl Artikel
+        seed (int): Startwert des Zufallsgenerators
+
+    Returns:
+        Path: Pfad der geschriebenen Datei
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df = pd.DataFrame(generate_rows(rows, seed), columns=ARTICLE_COLUMNS)
+    df.to_excel(path, sheet_name=SHEET_NAME, index=False)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Test-Arbeitsmappe für Messungen erzeugen")
+    parser.add_argument("path", help="Ziel-Datei (.xlsx)")
+    parser.add_argument("--rows", type=int, default=100, help="Anzahl Artikel (Standard: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert des Zufallsgenerators")
+    args = parser.parse_args()
+    print(f">> {generate_workbook(args.path, args.rows, args.seed)} ({args.rows} Artikel)")
+
+if __name__ == "__main__":
+    main()
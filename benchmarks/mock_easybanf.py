@@ -0,0 +1,682 @@
+"""
+mock_easybanf.py - Lokaler Nachbau von SAP-Login und easyBANF-Artikelansicht
+============================================================================
+
+Für Messungen ohne das Produktivsystem. Der Server liefert:
+
+- Login-Seite (input[name=username], POST auf /loginuserpass.php)
+- Launchpad mit der Kachel "GISA easyBANF"
+- Warenkorb mit "Neuer Artikel", "Neue Position anlegen" und "Freitext"
+- Artikelansicht mit denselben Element-IDs wie easyBANF
+  (__componentNN---idCatItemView--..., idButtonTransfer, die Dropdown-IDs,
+  CategorySelPopover--idCategoryTree) und einer minimalen
+  sap.ui.getCore()-Nachbildung für Kategorie-Baum und --batch-fill
+
+- OData-Dienst unter ODATA_SERVICE: "Bearbeitung abschließen" legt die
+  Position wie UI5 über $batch an (CSRF-Token-Abruf, ein Changeset mit
+  POST CartItemSet); die OData-Engine (--engine odata) spricht ihn direkt an
+
+Jede Server-Anfrage (Dropdown öffnen, Dialog laden, Feldprüfung, neue
+Position, Übernehmen) wird um latency_ms ± jitter_ms verzögert. Übernommene
+Positionen speichert der Server; cart_items() liefert sie zur Kontrolle.
+
+Verwendung:
+    python -m benchmarks.mock_easybanf --port 8765 --latency 150
+    set AUTOBANF_PORTAL_URL=http://127.0.0.1:8765/
+"""
+
+import argparse
+import json
+import random
+import secrets
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Kategorie-Baum des Nachbaus (Hauptkategorie -> Unterkategorien)
+MOCK_CATEGORIES = {
+    "Abfall und Entsorgung": [
+        "Altpapierentsorgung",
+        "Aufw. f. Abfall- und Entsorgung"
+    ],
+    "Bedarf Labore und Werkstätten": [
+        "Allg. Bedarf Labore und Werkstätten",
+        "Aufwendungen für Elektro-,Elektronikmaterial, Medizintechnik",
+        "Aufwendungen für Holz, Kunststoff, Glas, Metall",
+        "Laborutensilien, Werkzeuge und Kleinteile"
+    ],
+    "Büromaterial": [
+        "Papier und Druckerzubehör",
+        "Schreibwaren"
+    ],
+    "IT-Ausstattung": [
+        "Hardware",
+        "Software und Lizenzen",
+        "Zubehör und Verbrauchsmaterial"
+    ]
+}
+
+SESSION_COOKIE = "MOCKBANFSESSION"
+
+ODATA_SERVICE = "/sap/opu/odata/sap/ZMOCK_BANF_SRV/"
+ODATA_ENTITY_SET = "CartItemSet"
+
+LOGIN_HTML = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Anmeldung (Mock)</title></head>
+<body>
+<h2>Anmeldung</h2>
+<form method="post" action="/loginuserpass.php">
+    <label>Benutzername <input name="username" type="text"></label><br>
+    <label>Passwort <input name="password" type="password"></label><br>
+    <button type="submit">Anmelden</button>
+</form>
+</body></html>'''
+
+LAUNCHPAD_HTML = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Launchpad (Mock)</title></head>
+<body>
+<h2>Startseite</h2>
+<a id="tile-easybanf" href="/easybanf" style="display:inline-block;padding:2em;border:1px solid #888">GISA easyBANF</a>
+</body></html>'''
+
+EASYBANF_HTML = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>easyBANF (Mock)</title>
+<style>
+    body { font-family: sans-serif; margin: 1em; }
+    .row { margin: 0.4em 0; }
+    .row label { display: inline-block; width: 16em; }
+    .sapMSlt { display: inline-block; border: 1px solid #888; padding: 2px 6px; min-width: 12em; cursor: pointer; }
+    .sapMPopover { position: absolute; background: #fff; border: 1px solid #444; z-index: 10; }
+    .sapMPopover li { padding: 4px 8px; cursor: pointer; list-style: none; }
+    .sapMDialog { position: fixed; top: 5%; left: 20%; width: 60%; max-height: 80%; overflow: auto;
+                  background: #fff; border: 2px solid #444; padding: 1em; z-index: 20; }
+    [role="treeitem"] { list-style: none; padding: 2px; display: flex; }
+    [role="treeitem"][aria-level="2"] { padding-left: 2em; }
+    .sapMTreeItemBaseExpander { width: 1.2em; cursor: pointer; }
+    .sapUiLocalBusyIndicator { position: fixed; top: 0; right: 0; padding: 4px; background: #fc0; }
+</style>
+</head>
+<body>
+<h2>Warenkorb (Mock)</h2>
+<div id="app"></div>
+<div id="busy" class="sapUiLocalBusyIndicator" style="display:none">...</div>
+<script>
+const CONFIG = __CONFIG__;
+
+// ---- minimale UI5-Nachbildung: sap.ui.getCore().byId() ----
+const controls = {};
+const core = { byId: (id) => controls[id] || null, getUIDirty: () => false };
+window.sap = { ui: { getCore: () => core } };
+
+let pending = 0;
+async function busy(work) {
+    pending++;
+    document.getElementById('busy').style.display = '';
+    try {
+        return await work();
+    } finally {
+        pending--;
+        if (!pending) document.getElementById('busy').style.display = 'none';
+    }
+}
+
+function call(path, body) {
+    return busy(async () => {
+        const options = body === undefined ? {} :
+            { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(body) };
+        const response = await fetch(path, options);
+        return await response.json();
+    });
+}
+
+// ---- OData: Position wie UI5 als $batch mit einem Changeset anlegen ----
+const ODATA = '__ODATA__';
+let csrfToken = null;
+
+function createItem(item) {
+    return busy(async () => {
+        if (!csrfToken) {
+            const response = await fetch(ODATA, { headers: { 'X-CSRF-Token': 'Fetch' } });
+            csrfToken = response.headers.get('X-CSRF-Token');
+        }
+        const body = [
+            '--batch_ui5', 'Content-Type: multipart/mixed; boundary=changeset_ui5', '',
+            '--changeset_ui5', 'Content-Type: application/http', 'Content-Transfer-Encoding: binary', '',
+            'POST CartItemSet HTTP/1.1', 'Content-Type: application/json', 'Accept: application/json', '',
+            JSON.stringify(item),
+            '--changeset_ui5--', '', '--batch_ui5--', ''
+        ].join('\r\n');
+        await fetch(ODATA + '$batch', {
+            method: 'POST',
+            headers: { 'Content-Type': 'multipart/mixed; boundary=batch_ui5', 'X-CSRF-Token': csrfToken },
+            body
+        });
+    });
+}
+
+const esc = (s) => String(s).replace(/[&<>"]/g, c => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' }[c]));
+const app = document.getElementById('app');
+let component = 10;
+let clone = 0;
+let positions = [];
+let cartId = null;
+
+// ---- Warenkorb ----
+function showStart() {
+    app.innerHTML = '<button id="__xmlview0--idButtonNewItem">Neuer Artikel</button>';
+    document.getElementById('__xmlview0--idButtonNewItem').onclick = async () => {
+        cartId = (await call('/api/cart')).cartId;
+        showCart();
+    };
+}
+
+function showCart() {
+    for (const id of Object.keys(controls)) delete controls[id];
+    const list = positions.map((p, i) => '<li>Position ' + (i + 1) + ': ' + esc(p) + '</li>').join('');
+    app.innerHTML = '<ul id="__xmlview0--idPositionList">' + list + '</ul>' +
+        '<button id="__xmlview0--idButtonAddItem">Neue Position anlegen</button>' +
+        '<div id="__xmlview0--idItemTypeMenu"></div>';
+    document.getElementById('__xmlview0--idButtonAddItem').onclick = async () => {
+        await call('/api/item-types');
+        document.getElementById('__xmlview0--idItemTypeMenu').innerHTML =
+            '<ul role="menu"><li role="menuitem" id="__menuitem0">Freitext</li></ul>';
+        document.getElementById('__menuitem0').onclick = async () => {
+            await call('/api/position', {});
+            showItemView();
+        };
+    };
+}
+
+// ---- Artikelansicht ----
+function showItemView() {
+    component += 1;
+    clone += 1;
+    const p = '__component' + component + '---idCatItemView--';
+    const input = (label, suffix) => '<div class="row"><label>' + label + '</label><input id="' + p + suffix + '"></div>';
+    const select = (label, id) => '<div class="row"><label>' + label + '</label>' +
+        '<div class="sapMSlt" id="' + id + '" tabindex="0"><input readonly tabindex="-1"></div></div>';
+
+    app.innerHTML = '<div id="' + p.slice(0, -2) + '">' +
+        '<div class="row"><label>Kategorie</label><input readonly id="' + p + 'idCategoryValue">' +
+        ' <button id="' + p + 'idCategoryButton">Kategorie auswählen</button></div>' +
+        input('Artikelbeschreibung', 'MaterialText-inner') +
+        select('Steuerkennzeichen', p + 'idTaxCodeValidValues') +
+        select('Preisart', p + 'PriceIsGross') +
+        input('Preis je Mengeneinheit', 'Price-inner') +
+        select('Währung', p + 'ItemPriceCurrency') +
+        select('Rabatttyp', p + 'idDiscountTypeValidValues') +
+        input('Rabattwert', 'DiscountValue-inner') +
+        input('Laufzeit', 'idDRGeneralTerms-inner') +
+        input('Bestellmenge', 'idQuantityStepInput-input-inner') +
+        '<div class="row"><label>Einheit</label><span id="' + p + 'idCBPOUnit">' +
+        '<input id="' + p + 'idCBPOUnit-inner"><span id="' + p + 'idCBPOUnit-arrow">&#9662;</span></span></div>' +
+        input('Lange Artikelbeschreibung', 'idCFControl-GENERAL-ARTIKELLANG-generated-inner') +
+        input('Angebotsreferenz', 'idCFControl-GENERAL-ANGEBOTSREFERENZ-generated-inner') +
+        input('Angebotsdatum', 'idCFControl-GENERAL-ANGEBOTSDATUM-generated-inner') +
+        '<div class="row"><label>Kontierung</label><div class="sapMSlt" id="__select2-__clone' + clone + '" tabindex="0">' +
+        '<span title="Kontierungsobjekttyp"></span><input readonly tabindex="-1"></div></div>' +
+        '<div class="row"><label>Kontierung Nr.</label><input id="__input3-__clone' + clone + '-inner"></div>' +
+        '<button id="__xmlview0--idButtonTransfer">Bearbeitung abschließen</button>' +
+        '</div>';
+
+    for (const el of app.querySelectorAll('input:not([readonly])')) {
+        el.addEventListener('change', () => call('/api/validate', { field: el.id, value: el.value }));
+        if (el.id.endsWith('-inner') && !el.id.endsWith('idCBPOUnit-inner')) {
+            registerInput(el);
+        }
+    }
+
+    const selects = {
+        Steuerkennzeichen: p + 'idTaxCodeValidValues',
+        Preisart: p + 'PriceIsGross',
+        Waehrung: p + 'ItemPriceCurrency',
+        Rabatttyp: p + 'idDiscountTypeValidValues',
+        Kontierungsobjekttyp: '__select2-__clone' + clone
+    };
+    for (const [field, id] of Object.entries(selects)) {
+        registerSelect(document.getElementById(id), CONFIG.dropdowns[field], 'sap.m.Select');
+        document.getElementById(id).onclick = () => openList(document.getElementById(id), CONFIG.dropdowns[field]);
+    }
+
+    const unit = document.getElementById(p + 'idCBPOUnit');
+    registerSelect(unit, CONFIG.units, 'sap.m.ComboBoxBase');
+    document.getElementById(p + 'idCBPOUnit-arrow').onclick = () => openList(unit, CONFIG.units);
+
+    document.getElementById(p + 'idCategoryButton').onclick = () => openCategoryDialog(p);
+    document.getElementById('__xmlview0--idButtonTransfer').onclick = () => transfer(p);
+}
+
+function valueInput(container) {
+    return container.tagName === 'INPUT' ? container : container.querySelector('input');
+}
+
+function setSelected(container, text) {
+    valueInput(container).value = text;
+    call('/api/validate', { field: container.id, value: text });
+}
+
+function openList(container, options) {
+    closeLists();
+    call('/api/options?field=' + encodeURIComponent(container.id)).then(() => {
+        const rect = container.getBoundingClientRect();
+        const popover = document.createElement('div');
+        popover.className = 'sapMPopover';
+        popover.id = container.id + '-popover';
+        popover.style.left = (rect.left + window.scrollX) + 'px';
+        popover.style.top = (rect.bottom + window.scrollY) + 'px';
+        popover.innerHTML = '<ul role="listbox">' +
+            options.map(o => '<li role="option">' + esc(o) + '</li>').join('') + '</ul>';
+        popover.onclick = (event) => {
+            const option = event.target.closest('li');
+            if (!option) return;
+            setSelected(container, option.textContent);
+            closeLists();
+        };
+        document.body.appendChild(popover);
+    });
+}
+
+function closeLists() {
+    for (const el of document.querySelectorAll('.sapMPopover')) el.remove();
+}
+
+function registerInput(el) {
+    controls[el.id.replace(/-inner$/, '')] = {
+        isA: (name) => name === 'sap.m.Input',
+        setValue: (value) => { el.value = value; },
+        getValue: () => el.value,
+        fireChange: () => call('/api/validate', { field: el.id, value: el.value }),
+        getValueState: () => 'None'
+    };
+}
+
+function registerSelect(container, options, type) {
+    let selected = null;
+    const items = options.map(text => ({ getText: () => text, getKey: () => text }));
+    controls[container.id] = {
+        isA: (name) => name === type,
+        getItems: () => items,
+        setSelectedItem: (item) => { selected = item; valueInput(container).value = item.getText(); },
+        getSelectedItem: () => selected,
+        getValue: () => valueInput(container).value,
+        fireChange: () => call('/api/validate', { field: container.id, value: valueInput(container).value }),
+        fireSelectionChange: () => {},
+        getValueState: () => 'None'
+    };
+}
+
+// ---- Kategorie-Dialog ----
+const TREE_ID = '__xmlview1--CategorySelPopover--idCategoryTree';
+let expanded = new Set();
+
+async function openCategoryDialog(prefix) {
+    const categories = await call('/api/categories');
+    const dialog = document.createElement('div');
+    dialog.className = 'sapMDialog';
+    dialog.setAttribute('role', 'dialog');
+    dialog.id = '__xmlview1--CategorySelPopover';
+    dialog.innerHTML = '<ul role="tree" id="' + TREE_ID + '"></ul>';
+    document.body.appendChild(dialog);
+    expanded = new Set();
+
+    const tree = dialog.querySelector('ul');
+    const select = (title) => {
+        document.getElementById(prefix + 'idCategoryValue').value = title;
+        dialog.remove();
+        delete controls[TREE_ID];
+        call('/api/validate', { field: 'Kategorie', value: title });
+    };
+    const activate = (li) => {
+        const main = li.dataset.main;
+        if (li.dataset.sub) return select(main + '->' + li.dataset.sub);
+        if (!categories[main].length) return select(main);
+        toggle(main);
+    };
+    const toggle = (main) => {
+        if (expanded.has(main)) expanded.delete(main); else expanded.add(main);
+        render();
+    };
+
+    function render() {
+        let html = '';
+        let position = 0;
+        const item = (level, main, sub, title) => {
+            const isOpen = level === 1 && expanded.has(main);
+            return '<li role="treeitem" tabindex="-1" id="__item' + position + '-' + TREE_ID + '-' + (position++) + '"' +
+                ' aria-level="' + level + '"' + (level === 1 ? ' aria-expanded="' + isOpen + '"' : '') +
+                ' data-main="' + esc(main) + '"' + (sub ? ' data-sub="' + esc(sub) + '"' : '') + '>' +
+                '<span class="sapMTreeItemBaseExpander">' + (level === 1 ? (isOpen ? '&#9662;' : '&#9656;') : '') + '</span>' +
+                '<div class="sapMLIBContent">' + esc(title) + '</div></li>';
+        };
+        for (const [main, subs] of Object.entries(categories)) {
+            html += item(1, main, null, main);
+            if (expanded.has(main)) {
+                for (const sub of subs) html += item(2, main, sub, sub);
+            }
+        }
+        tree.innerHTML = html;
+        for (const li of tree.querySelectorAll('[role="treeitem"]')) {
+            li.querySelector('.sapMTreeItemBaseExpander').onclick = (event) => {
+                event.stopPropagation();
+                if (!li.dataset.sub) toggle(li.dataset.main);
+            };
+            li.onclick = () => activate(li);
+            li.onkeydown = (event) => { if (event.key === 'Enter') activate(li); };
+        }
+    }
+
+    controls[TREE_ID] = {
+        expandToLevel: (level) => {
+            expanded = level >= 1 ? new Set(Object.keys(categories)) : new Set();
+            render();
+        },
+        getItems: () => Array.from(tree.querySelectorAll('[role="treeitem"]')).map(li => ({
+            getId: () => li.id,
+            getTitle: () => li.querySelector('.sapMLIBContent').textContent,
+            getLevel: () => parseInt(li.getAttribute('aria-level'), 10) - 1,
+            getDomRef: () => document.getElementById(li.id)
+        }))
+    };
+    render();
+}
+
+document.addEventListener('keydown', (event) => {
+    if (event.key !== 'Escape') return;
+    closeLists();
+    const dialog = document.getElementById('__xmlview1--CategorySelPopover');
+    if (dialog) { dialog.remove(); delete controls[TREE_ID]; }
+});
+
+// ---- Übernehmen ----
+async function transfer(prefix) {
+    const text = (id) => document.getElementById(id).value;
+    const choice = (id) => valueInput(document.getElementById(id)).value;
+    const number = (value) => value.replace(',', '.');
+    const date = (value) => {
+        const m = /^(\d{2})\.(\d{2})\.(\d{4})$/.exec(value);
+        return m ? '/Date(' + Date.UTC(+m[3], m[2] - 1, +m[1]) + ')/' : '';
+    };
+    const item = {
+        CartId: cartId,
+        Category: text(prefix + 'idCategoryValue'),
+        Description: text(prefix + 'MaterialText-inner'),
+        TaxCode: choice(prefix + 'idTaxCodeValidValues'),
+        PriceType: choice(prefix + 'PriceIsGross'),
+        Price: number(text(prefix + 'Price-inner')),
+        Currency: choice(prefix + 'ItemPriceCurrency'),
+        DiscountType: choice(prefix + 'idDiscountTypeValidValues'),
+        DiscountValue: number(text(prefix + 'DiscountValue-inner')),
+        Period: text(prefix + 'idDRGeneralTerms-inner'),
+        Quantity: number(text(prefix + 'idQuantityStepInput-input-inner')),
+        Unit: text(prefix + 'idCBPOUnit-inner'),
+        LongText: text(prefix + 'idCFControl-GENERAL-ARTIKELLANG-generated-inner'),
+        OfferReference: text(prefix + 'idCFControl-GENERAL-ANGEBOTSREFERENZ-generated-inner'),
+        OfferDate: date(text(prefix + 'idCFControl-GENERAL-ANGEBOTSDATUM-generated-inner')),
+        AccountAssignmentType: choice('__select2-__clone' + clone),
+        AccountAssignment: text('__input3-__clone' + clone + '-inner')
+    };
+    await createItem(item);
+    positions.push(item.Description || '(ohne Beschreibung)');
+    showCart();
+}
+
+showStart();
+</script>
+</body></html>'''
+
+def free_port(host="127.0.0.1"):
+    """Freier lokaler Port (z.B. um AUTOBANF_PORTAL_URL vor dem Import von lib zu setzen)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+class MockEasyBanfServer:
+    """HTTP-Server mit Login, Launchpad und easyBANF-Nachbau in einem Hintergrund-Thread"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=100, jitter_ms=20, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._sessions = set()
+        self._csrf_tokens = {}     # Sitzung -> CSRF-Token
+        self._carts = set()
+        self._cart = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        """Basis-URL, z.B. für AUTOBANF_PORTAL_URL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def delay(self, factor=1.0):
+        """Simulierte Server-Antwortzeit"""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(0.0, (self.latency_ms + jitter) * factor) / 1000)
+
+    def cart_items(self):
+        """Alle übernommenen Positionen (OData-Eigenschaft -> Wert)"""
+        with self._lock:
+            return list(self._cart)
+
+    def reset(self):
+        """Leert den Warenkorb (z.B. zwischen zwei Messungen)"""
+        with self._lock:
+            self._cart.clear()
+
+    def create_items(self, items):
+        """
+        Legt die Positionen eines Changesets an - alle oder keine
+
+        Returns:
+            list: Antworten {"status", "body"} je Position bzw. eine
+                  Fehlerantwort für das ganze Changeset
+        """
+        with self._lock:
+            for item in items:
+                if item is None or item.get("CartId") not in self._carts:
+                    return [_odata_error(400, "Unbekannter Warenkorb")]
+                if not item.get("Description") or not item.get("Category"):
+                    return [_odata_error(400, "Beschreibung und Kategorie sind Pflichtfelder")]
+            responses = []
+            for item in items:
+                self._cart.append(item)
+                entity = dict(item, ItemNo=len(self._cart))
+                responses.append({"status": 201, "body": json.dumps({"d": entity}, ensure_ascii=False)})
+            return responses
+
+    def start(self):
+        """Startet den Server im Hintergrund"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-easybanf", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Beendet den Server"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _handler_class(self):
+        # Erst hier importieren: lib liest AUTOBANF_PORTAL_URL beim Import
+        from lib.complete_form_fill import DROPDOWN_CONFIG, KNOWN_UNITS
+        from lib.odata_engine import parse_batch, build_batch_response
+
+        server = self
+        config = json.dumps({
+            "dropdowns": {field: list(spec["options"]) for field, spec in DROPDOWN_CONFIG.items()},
+            "units": KNOWN_UNITS
+        }, ensure_ascii=False)
+        app_html = EASYBANF_HTML.replace("__CONFIG__", config).replace("__ODATA__", ODATA_SERVICE)
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _session(self):
+                cookies = self.headers.get("Cookie", "")
+                for part in cookies.split(";"):
+                    name, _, value = part.strip().partition("=")
+                    if name == SESSION_COOKIE and value in server._sessions:
+                        return value
+                return None
+
+            def _logged_in(self):
+                return self._session() is not None
+
+            def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Cache-Control", "no-store")
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _json(self, value):
+                self._send(200, json.dumps(value, ensure_ascii=False), "application/json; charset=utf-8")
+
+            def _redirect(self, location, headers=None):
+                self.send_response(303)
+                self.send_header("Location", location)
+                self.send_header("Content-Length", "0")
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length).decode("utf-8") if length else ""
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path == "/":
+                    server.delay()
+                    self._send(200, LAUNCHPAD_HTML if self._logged_in() else LOGIN_HTML)
+                elif path == "/easybanf":
+                    if not self._logged_in():
+                        return self._redirect("/")
+                    server.delay(2)
+                    self._send(200, app_html)
+                elif path == "/api/categories":
+                    server.delay()
+                    self._json(MOCK_CATEGORIES)
+                elif path == ODATA_SERVICE:
+                    self._odata_service_document()
+                elif path == "/api/cart":
+                    server.delay()
+                    cart_id = secrets.token_hex(8)
+                    with server._lock:
+                        server._carts.add(cart_id)
+                    self._json({"ok": True, "cartId": cart_id})
+                elif path in ("/api/item-types", "/api/options"):
+                    server.delay()
+                    self._json({"ok": True})
+                else:
+                    self._send(404, "not found", "text/plain")
+
+            def do_POST(self):
+                path = urlparse(self.path).path
+                body = self._body()
+                if path == "/loginuserpass.php":
+                    form = parse_qs(body)
+                    if not form.get("username") or not form.get("password"):
+                        return self._send(200, LOGIN_HTML)
+                    token = secrets.token_hex(16)
+                    with server._lock:
+                        server._sessions.add(token)
+                    server.delay(2)
+                    return self._redirect("/", {"Set-Cookie": f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"})
+                if not self._logged_in():
+                    return self._send(401, "{}", "application/json")
+                if path == ODATA_SERVICE + "$batch":
+                    self._odata_batch(body)
+                elif path in ("/api/validate", "/api/position"):
+                    server.delay()
+                    self._json({"ok": True})
+                else:
+                    self._send(404, "{}", "application/json")
+
+            def _odata_service_document(self):
+                session = self._session()
+                if session is None:
+                    return self._send(401, "{}", "application/json")
+                server.delay()
+                headers = {}
+                if self.headers.get("X-CSRF-Token", "").lower() == "fetch":
+                    with server._lock:
+                        token = server._csrf_tokens.setdefault(session, secrets.token_hex(12))
+                    headers["X-CSRF-Token"] = token
+                self._send(200, json.dumps({"d": {"EntitySets": [ODATA_ENTITY_SET]}}),
+                           "application/json; charset=utf-8", headers)
+
+            def _odata_batch(self, body):
+                session = self._session()
+                with server._lock:
+                    token = server._csrf_tokens.get(session)
+                if token is None or self.headers.get("X-CSRF-Token") != token:
+                    return self._send(403, "CSRF token validation failed", "text/plain",
+                                      {"X-CSRF-Token": "Required"})
+                try:
+                    groups = parse_batch(body, self.headers.get("Content-Type", ""))
+                except ValueError:
+                    return self._send(400, "Ungültiger $batch", "text/plain")
+                # Eine Position kostet etwa so viel wie ein Übernehmen in der Oberfläche,
+                # weitere im selben $batch nur einen Bruchteil
+                server.delay(2 + 0.2 * max(0, len(groups) - 1))
+                responses = []
+                for parts in groups:
+                    if any(part.get("method") != "POST" or part.get("url") != ODATA_ENTITY_SET for part in parts):
+                        responses.append([_odata_error(405, "Nur POST auf " + ODATA_ENTITY_SET)])
+                        continue
+                    responses.append(server.create_items([_json_or_none(part["body"]) for part in parts]))
+                response, content_type = build_batch_response(responses)
+                self._send(202, response, content_type)
+
+        return Handler
+
+def _json_or_none(text):
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+def _odata_error(status, message):
+    return {"status": status, "body": json.dumps({"error": {"message": {"lang": "de", "value": message}}},
+                                                 ensure_ascii=False)}
+
+def main():
+    """Startet den Nachbau im Vordergrund (Strg+C beendet)"""
+    parser = argparse.ArgumentParser(description="Lokaler easyBANF-Nachbau für Messungen")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=int, default=100, metavar="MS", help="Server-Antwortzeit in ms")
+    parser.add_argument("--jitter", type=int, default=20, metavar="MS", help="Zufällige Abweichung in ms")
+    args = parser.parse_args()
+
+    server = MockEasyBanfServer(port=args.port, latency_ms=args.latency, jitter_ms=args.jitter)
+    print(f">> easyBANF-Nachbau läuft auf {server.url} (Latenz {args.latency}±{args.jitter} ms)")
+    print(f">> set AUTOBANF_PORTAL_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
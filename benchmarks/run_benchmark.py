@@ -0,0 +1,169 @@
+"""
+run_benchmark.py - Durchsatzmessung des Imports gegen den easyBANF-Nachbau
+=========================================================================
+
+Startet den lokalen Nachbau (mock_easybanf), erzeugt Arbeitsmappen mit
+10 bis 1000 Artikeln und lässt excel_import_test() unverändert dagegen
+laufen - mit echtem Chromium, aber ohne Produktivsystem. Gemessen werden:
+
+- Artikel pro Minute (nur die Import-Phase)
+- Startzeit bis zur Artikel-Eingabe-Seite (Browserstart, Login, Navigation)
+- höchster Arbeitsspeicher aller Chromium-Prozesse (browser_metrics)
+- ob alle Artikel beim Server angekommen sind
+
+Die Ergebnisse stehen als Tabelle auf der Konsole und als JSON in
+.temp/benchmarks/. So lassen sich Pacing-Profile, --batch-fill oder
+Änderungen am Code bei gleicher Server-Latenz vergleichen.
+
+Verwendung:
+    python -m benchmarks.run_benchmark --rows 10 100 --latency 150
+    python -m benchmarks.run_benchmark --rows 1000 --pacing fast --batch-fill
+    python -m benchmarks.run_benchmark --rows 100 --launch headless-production
+    python -m benchmarks.run_benchmark --rows 100 --engine odata
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .mock_easybanf import MockEasyBanfServer, free_port
+
+BENCHMARK_DIR = Path(".temp") / "benchmarks"
+
+DEFAULT_ROWS = [10, 100, 1000]
+
+def run_single(rows, server, pacing="normal", batch_fill=False, seed=0, engine="sync"):
+    """
+    Ein Import-Lauf mit einer erzeugten Arbeitsmappe
+
+    Returns:
+        dict: rows, processed, transferred, articles_per_minute, startup_seconds,
+              import_seconds, peak_memory_bytes, fields, success
+    """
+    # Erst nach dem Setzen von AUTOBANF_PORTAL_URL importieren (siehe main)
+    from autoBANF import excel_import_test
+    from lib.browser_metrics import MemorySampler
+    from lib.pacing import set_pacing_profile
+    from .generate_workbook import generate_workbook
+
+    workbook = generate_workbook(BENCHMARK_DIR / f"artikel_{rows}.xlsx", rows, seed)
+    set_pacing_profile(pacing)
+    server.reset()
+
+    with MemorySampler() as sampler:
+        result = excel_import_test(
+            str(workbook),
+            batch_fill=batch_fill,
+            reuse_session=False,
+            use_daemon=False,
+            username="benchmark",
+            password="benchmark",
+            engine=engine
+        )
+
+    transferred = len(server.cart_items())
+    if not result:
+        return {"rows": rows, "processed": 0, "transferred": transferred, "articles_per_minute": 0.0,
+                "startup_seconds": None, "import_seconds": None, "fields": 0, "success": 0,
+                "peak_memory_bytes": sampler.peak_bytes}
+
+    minutes = result["import_seconds"] / 60
+    return {
+        "rows": rows,
+        "processed": result["processed"],
+        "transferred": transferred,
+        "articles_per_minute": round(result["processed"] / minutes, 1) if minutes else 0.0,
+        "startup_seconds": result["startup_seconds"],
+        "import_seconds": result["import_seconds"],
+        "fields": result["fields"],
+        "success": result["success"],
+        "peak_memory_bytes": sampler.peak_bytes
+    }
+
+def print_results(results, settings):
+    """Gibt die Messergebnisse als Tabelle aus"""
+    from lib.browser_metrics import format_megabytes
+
+    print(f"\n{'='*78}")
+    print(f"BENCHMARK  Latenz {settings['latency_ms']}±{settings['jitter_ms']} ms, "
+          f"Pacing '{settings['pacing']}'{', batch-fill' if settings['batch_fill'] else ''}, "
+          f"Engine '{settings['engine']}'")
+    print(f"{'='*78}")
+    print(f"{'Artikel':>8} {'übernommen':>11} {'Artikel/min':>12} {'Start (s)':>10} "
+          f"{'Import (s)':>11} {'Felder':>9} {'Speicher':>10}")
+    print(f"{'-'*78}")
+    for row in results:
+        startup = f"{row['startup_seconds']:.1f}" if row['startup_seconds'] is not None else "-"
+        duration = f"{row['import_seconds']:.1f}" if row['import_seconds'] is not None else "-"
+        fields = f"{row['success']}/{row['fields']}"
+        mark = "" if row['transferred'] == row['rows'] else " !"
+        print(f"{row['rows']:>8} {row['transferred']:>9}{mark:<2} {row['articles_per_minute']:>12.1f} "
+              f"{startup:>10} {duration:>11} {fields:>9} {format_megabytes(row['peak_memory_bytes']):>10}")
+    print(f"{'='*78}")
+
+def save_results(results, settings):
+    """Schreibt die Ergebnisse nach .temp/benchmarks/benchmark_<Zeitstempel>.json"""
+    BENCHMARK_DIR.mkdir(parents=True, exist_ok=True)
+    path = BENCHMARK_DIR / f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"settings": settings, "results": results}, f, indent=2, ensure_ascii=False)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Durchsatzmessung gegen den lokalen easyBANF-Nachbau")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="Artikelanzahlen der Läufe (Standard: 10 100 1000)")
+    parser.add_argument("--latency", type=int, default=100, metavar="MS", help="Server-Antwortzeit in ms")
+    parser.add_argument("--jitter", type=int, default=20, metavar="MS", help="Zufällige Abweichung in ms")
+    parser.add_argument("--pacing", default="normal", help="Pacing-Profil (fast, normal, vpn, legacy)")
+    parser.add_argument("--batch-fill", action="store_true", help="Felder über die UI5-Control-API setzen")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert für Arbeitsmappe und Jitter")
+    parser.add_argument("--launch", default="interactive",
+                        help="Startprofil (interactive, headless-production, low-memory)")
+    parser.add_argument("--engine", choices=["sync", "odata"], default="sync",
+                        help="sync: alle Artikel über die Oberfläche, odata: übrige Artikel direkt über OData")
+    args = parser.parse_args()
+
+    # Portal-URL setzen, bevor lib (autobanf_base) zum ersten Mal importiert wird
+    port = free_port()
+    os.environ["AUTOBANF_PORTAL_URL"] = f"http://127.0.0.1:{port}/"
+    server = MockEasyBanfServer(port=port, latency_ms=args.latency, jitter_ms=args.jitter,
+                                seed=args.seed).start()
+
+    # Ein lokaler Katalog des Produktivsystems passt nicht zu den Kategorien des Nachbaus
+    from lib.category_catalog import set_category_catalog
+    from lib.launch_profiles import set_launch_profile
+    set_category_catalog(None)
+    set_launch_profile(args.launch)
+
+    settings = {
+        "latency_ms": args.latency,
+        "jitter_ms": args.jitter,
+        "pacing": args.pacing,
+        "batch_fill": args.batch_fill,
+        "launch": args.launch,
+        "engine": args.engine,
+        "seed": args.seed,
+        "started": datetime.now().isoformat(timespec="seconds")
+    }
+    print(f">> easyBANF-Nachbau auf {server.url}")
+
+    results = []
+    try:
+        for rows in args.rows:
+            print(f"\n>> Lauf mit {rows} Artikeln")
+            started = time.perf_counter()
+            results.append(run_single(rows, server, args.pacing, args.batch_fill, seed=args.seed,
+                                      engine=args.engine))
+            print(f">> Lauf beendet nach {time.perf_counter() - started:.1f} s")
+    finally:
+        server.stop()
+
+    print_results(results, settings)
+    print(f"Ergebnisse: {save_results(results, settings)}")
+
+if __name__ == "__main__":
+    main()
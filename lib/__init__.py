@@ -6,6 +6,27 @@ Dieses Paket enthält die Kernfunktionen für die autoBANF SAP-Automatisierung:
 
 - autobanf_base: Basis-Funktionen für SAP-Navigation und Credential-Management
 - complete_form_fill: Spezialisierte Formular-Ausfüllfunktionen
+- ui5_wait: Ereignisgesteuertes Warten auf SAPUI5 statt fester Pausen
+- pacing: Nachlaufzeiten je Schritt statt festem slow_mo
+- step_trace: Zeitmessung je Schritt mit p50/p95-Auswertung
+- sharding: Paralleler Import in mehreren Browser-Kontexten
+- excel_reader: Einlesen der Excel-Artikellisten
+- article_records: Spaltenweise Aufbereitung in kompakte Artikel-Datensätze
+- validation: Prüfung aller Zeilen vor dem Browserstart
+- checkpoint: Journal zum Fortsetzen abgebrochener Importe
+- async_engine: asyncio-Variante von Navigation, Formular und Kategorie
+- odata_engine: Positionen direkt über OData anlegen (experimentell, Oberfläche als Rückfallebene)
+- session: Sitzungsdaten je Seite (z.B. Präfix der Artikel-Ansicht)
+- selector_registry: Selektor-Listen nach bisheriger Trefferquote
+- category_catalog: Lokaler Katalog der easyBANF-Kategorien
+- browser_daemon: Vorgewärmter Browser, an den sich Importe über CDP anhängen
+- browser_metrics: Arbeitsspeicher der Chromium-Prozesse
+- har_replay: Netzwerkverkehr aufzeichnen und offline wiedergeben
+- screenshots: Screenshot-Regeln (Modus, Ausschnitt, Format) und Schreiben im Hintergrund
+- network_filter: Blockieren nicht benötigter Netzwerk-Ressourcen
+- job_queue: Import-Aufträge in einer SQLite-Warteschlange mit Worker-Prozessen
+- watch_folder: Eingangsordner auf neue Excel-Dateien überwachen
+- launch_profiles: Startprofile für Chromium (headless, Argumente, Fenstergröße, Cache)
 """
 
 # Imports für einfache Verwendung
@@ -13,7 +34,10 @@ from .autobanf_base import (
     SecureCredentials,
     get_credentials,
     create_browser_page,
+    sap_login,
+    load_saved_session,
     navigate_to_artikel_page,
+    ensure_artikel_page,
     analyze_form_fields,
     fill_field_by_criteria,
     close_browser_safely
@@ -24,7 +48,126 @@ from .complete_form_fill import (
     fill_numeric_field,
     select_dropdown_option,
     select_combobox_option,
-    select_category_and_subcategory
+    select_category_and_subcategory,
+    select_category_from_index,
+    crawl_category_catalog,
+    fill_form_field,
+    batch_fill_article_fields,
+    DROPDOWN_CONFIG,
+    KNOWN_UNITS,
+    ARTICLE_FIELDS
+)
+
+from .excel_reader import (
+    read_excel_file,
+    stream_article_rows,
+    expand_workbook_paths,
+    convert_to_german_number
+)
+
+from .article_records import (
+    ArticleRecord,
+    normalize_articles,
+    normalize_rows
+)
+
+from .checkpoint import ImportJournal
+
+from .step_trace import (
+    trace_step,
+    get_step_tracer,
+    start_trace,
+    print_trace_report
+)
+
+from .pacing import (
+    PacingController,
+    get_pacing_controller,
+    set_pacing_profile
+)
+
+from .validation import (
+    validate_records,
+    check_records,
+    print_validation_report
+)
+
+from .ui5_wait import (
+    WAIT_LIMITS,
+    wait_for_ui5_idle,
+    settle_after_miss
+)
+
+from .sharding import (
+    split_into_shards,
+    run_sharded_import,
+    print_shard_summary
+)
+
+from .session import (
+    get_session,
+    discover_item_view
+)
+
+from .selector_registry import (
+    SelectorRegistry,
+    get_selector_registry
+)
+
+from .category_catalog import (
+    CategoryCatalog,
+    get_category_catalog,
+    apply_category_catalog
+)
+
+from .browser_daemon import (
+    open_artikel_page,
+    hand_back_browser,
+    run_daemon
+)
+
+from .screenshots import (
+    ScreenshotPolicy,
+    get_screenshot_policy,
+    set_screenshot_policy
+)
+
+from .network_filter import (
+    NetworkFilter,
+    get_network_filter,
+    set_network_filter
+)
+
+from .launch_profiles import (
+    LaunchProfile,
+    get_launch_profile,
+    set_launch_profile
+)
+
+from .watch_folder import InboxWatcher
+
+from .job_queue import (
+    JobQueue,
+    work_jobs,
+    run_worker_pool
+)
+
+from .har_replay import (
+    set_har_mode,
+    get_har_mode
+)
+
+from .browser_metrics import (
+    MemorySampler,
+    chromium_memory_bytes
+)
+
+from .async_engine import import_workbook
+
+from .odata_engine import (
+    ODataRecorder,
+    ODataSubmitter,
+    learn_template
 )
 
 __version__ = "1.0.0"
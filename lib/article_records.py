@@ -0,0 +1,186 @@
+"""
+article_records.py - Aufbereitete Artikel-Zeilen für die Browser-Schleife
+=========================================================================
+
+Alle Excel-Werte werden vor dem Import spaltenweise mit pandas in die Form
+gebracht, in der sie in easyBANF eingetragen werden:
+
+- Preis, Rabattwert, Bestellmenge: deutsche Notation ("1,91", "2")
+- Angebotsdatum: TT.MM.JJJJ statt "2025-07-23 00:00:00"
+- Laufzeit: "TT.MM.JJJJ - TT.MM.JJJJ"
+- sich wiederholende Texte (Kategorie, Einheit, ...) als category-Spalte,
+  sodass alle Artikel dieselben String-Objekte teilen
+
+Ergebnis ist je Artikel ein kompakter ArticleRecord (__slots__) mit den
+fertigen Strings bzw. None für leere Zellen. Die Browser-Schleife greift nur
+noch über record.get(spalte) darauf zu und braucht kein pandas mehr.
+
+Verwendung:
+    from lib.article_records import normalize_articles
+    for record in normalize_articles(df):
+        record.get('Preis_je_Mengeneinheit')  # -> "1,91"
+"""
+
+import pandas as pd
+from .excel_reader import (
+    ARTICLE_COLUMNS,
+    NUMERIC_COLUMNS,
+    DATE_COLUMNS,
+    RANGE_COLUMNS
+)
+
+# Anteil verschiedener Werte, unter dem eine Textspalte als category gespeichert wird
+CATEGORICAL_RATIO = 0.5
+
+# Zeilen je Block beim Aufbereiten gestreamter Zeilen
+STREAM_CHUNK_ROWS = 25
+
+DATE_FORMAT = "%d.%m.%Y"
+RANGE_SEPARATOR = " - "
+
+class ArticleRecord:
+    """Ein Artikel mit fertig formatierten Feldwerten (str oder None)"""
+
+    __slots__ = ("index",) + tuple(ARTICLE_COLUMNS)
+
+    def __init__(self, index, values):
+        self.index = index
+        for column in ARTICLE_COLUMNS:
+            setattr(self, column, values.get(column))
+
+    def get(self, column, default=None):
+        """Wert einer Excel-Spalte wie bei dict.get()"""
+        value = getattr(self, column, None) if column in ARTICLE_COLUMNS else None
+        return default if value is None else value
+
+    def __getitem__(self, column):
+        if column not in ARTICLE_COLUMNS:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def as_dict(self):
+        """Alle Spalten als dict (z.B. für Protokolle)"""
+        return {column: getattr(self, column) for column in ARTICLE_COLUMNS}
+
+    def __repr__(self):
+        return f"ArticleRecord({self.index}, {self.get('Artikelbeschreibung')!r})"
+
+def _text(series):
+    """Zellen als getrimmter Text, leere Zellen als NA"""
+    text = series.astype("string").str.strip()
+    return text.mask(text == "")
+
+def _format_numeric(series):
+    """Zahlen in deutscher Notation (wie convert_to_german_number, spaltenweise)"""
+    numbers = pd.to_numeric(series, errors="coerce")
+    whole = numbers.notna() & (numbers == numbers.round())
+
+    formatted = numbers.astype("string").str.replace(".", ",", regex=False)
+    formatted = formatted.mask(whole, numbers.where(whole).astype("Int64").astype("string"))
+
+    # Texte, die keine Zahl sind: Komma bleibt, sonst Punkt -> Komma
+    text = _text(series)
+    text = text.where(text.str.contains(",", regex=False), text.str.replace(".", ",", regex=False))
+    return formatted.fillna(text)
+
+def _format_date(series):
+    """Datumswerte als TT.MM.JJJJ, nicht erkennbare Werte unverändert"""
+    text = _text(series)
+    # ISO-Daten (auch Excel-Datumszellen) nicht als Tag-zuerst lesen
+    iso = text.str.match(r"^\d{4}-\d{2}-\d{2}").fillna(False).astype(bool)
+    dates = pd.to_datetime(text.where(iso), errors="coerce", format="ISO8601")
+    dates = dates.fillna(pd.to_datetime(text.where(~iso), errors="coerce", format="mixed", dayfirst=True))
+    return dates.dt.strftime(DATE_FORMAT).astype("string").fillna(text)
+
+def _format_range(series):
+    """Zeiträume "von - bis" mit beiden Daten als TT.MM.JJJJ"""
+    text = _text(series)
+    parts = text.str.extract(r"^(.+?)\s+[-–]\s+(.+)$")
+    start = _format_date(parts[0])
+    end = _format_date(parts[1])
+    ranges = (start + RANGE_SEPARATOR + end).where(parts[0].notna() & parts[1].notna())
+    # Einzelne Datumszelle statt Zeitraum
+    return ranges.fillna(_format_date(series.where(parts[0].isna())))
+
+def _format_text(series):
+    """Textspalten; ganzzahlige Zahlenspalten ohne ".0" (z.B. Angebotsreferenz 12345)"""
+    if pd.api.types.is_numeric_dtype(series):
+        return _format_numeric(series).str.replace(",", ".", regex=False)
+    return _text(series)
+
+def _compact(series):
+    """Sich wiederholende Werte als category, damit gleiche Strings geteilt werden"""
+    values = series.dropna()
+    if len(values) and values.nunique() <= len(values) * CATEGORICAL_RATIO:
+        return series.astype("category")
+    return series
+
+def normalize_columns(df):
+    """
+    Formatiert alle Artikel-Spalten eines DataFrames auf einmal
+
+    Returns:
+        dict: Spalte -> Series mit fertigen Werten (NA für leere Zellen)
+    """
+    columns = {}
+    for column in ARTICLE_COLUMNS:
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if column in NUMERIC_COLUMNS:
+            formatted = _format_numeric(series)
+        elif column in DATE_COLUMNS:
+            formatted = _format_date(series)
+        elif column in RANGE_COLUMNS:
+            formatted = _format_range(series)
+        else:
+            formatted = _format_text(series)
+        columns[column] = _compact(formatted.astype(object).where(formatted.notna(), None))
+    return columns
+
+def normalize_articles(df):
+    """
+    Wandelt die Excel-Zeilen in ArticleRecords um
+
+    Args:
+        df (DataFrame): Artikel-Zeilen (der Index wird als record.index übernommen)
+
+    Returns:
+        list: ArticleRecord je Zeile, in Tabellenreihenfolge
+    """
+    columns = normalize_columns(df)
+    names = list(columns)
+    value_lists = [
+        [None if pd.isna(value) else value for value in columns[name].tolist()]
+        for name in names
+    ]
+    return [
+        ArticleRecord(index, dict(zip(names, values)))
+        for index, *values in zip(df.index.tolist(), *value_lists)
+    ]
+
+def normalize_rows(rows, chunk_size=STREAM_CHUNK_ROWS):
+    """
+    Bereitet gestreamte (index, row)-Paare blockweise auf
+
+    Der erste Block besteht aus nur einer Zeile, damit der Import sofort
+    beginnen kann; danach werden jeweils chunk_size Zeilen gesammelt.
+
+    Yields:
+        ArticleRecord
+    """
+    chunk = []
+    limit = 1
+    for index, row in rows:
+        chunk.append((index, row))
+        if len(chunk) >= limit:
+            yield from _normalize_chunk(chunk)
+            chunk = []
+            limit = chunk_size
+    if chunk:
+        yield from _normalize_chunk(chunk)
+
+def _normalize_chunk(chunk):
+    """Ein Block gestreamter Zeilen als DataFrame aufbereiten"""
+    df = pd.DataFrame([row for _, row in chunk], index=[index for index, _ in chunk])
+    return normalize_articles(df)
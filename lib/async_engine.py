@@ -0,0 +1,852 @@
+"""
+async_engine.py - asyncio-Engine für autoBANF
+=============================================
+
+Asynchrone Variante der Navigation, der Feld-Ausfüllfunktionen und der
+Kategorieauswahl auf Basis von playwright.async_api. Das Verhalten
+entspricht dem synchronen Pfad (autobanf_base, complete_form_fill,
+autoBANF.py); Selektoren, Feldtabelle und JavaScript werden von dort
+übernommen. Mehrere Seiten laufen in einer Event-Loop, Wartezeiten und
+Screenshots verschiedener Seiten überlappen sich.
+
+Verwendung:
+    import asyncio
+    from lib.async_engine import import_workbook
+    asyncio.run(import_workbook("templates/mouser.xlsx", concurrency=4))
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from pathlib import Path
+from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from .autobanf_base import (
+    SAP_PORTAL_URL,
+    POSITION_SELECTORS,
+    FREITEXT_SELECTORS,
+    SecureCredentials,
+    load_saved_session
+)
+from .selector_registry import get_selector_registry
+from .pacing import get_pacing_controller
+from .step_trace import record_step, trace_step, trace_laps, start_trace, print_trace_report
+from .ui5_wait import (
+    WAIT_LIMITS,
+    POLLING_INTERVAL_MS,
+    IDLE_HOOK_JS,
+    UI5_IDLE_JS,
+    idle_wait_arg
+)
+from .complete_form_fill import (
+    DROPDOWN_CONFIG,
+    TEXT_FIELD_SELECTORS,
+    NUMERIC_FIELD_SELECTORS,
+    ARTICLE_FIELDS,
+    TOTAL_ARTICLE_FIELDS,
+    TRANSFER_SELECTORS,
+    DIALOG_OPEN_JS,
+    EXPAND_MAIN_CATEGORY_JS,
+    CLICK_SUBCATEGORY_JS,
+    CATEGORY_TREE_MARKER,
+    EXPAND_CATEGORY_TREE_JS,
+    READ_CATEGORY_TREE_JS,
+    CLICK_CATEGORY_ITEM_JS,
+    CLICK_CATEGORY_PATH_JS,
+    BATCH_FILL_JS,
+    UNIT_COMBOBOX_SUFFIX,
+    UNIT_ARROW_SUFFIX,
+    build_batch_items,
+    build_category_index,
+    required_steps
+)
+from .screenshots import get_screenshot_policy
+from .network_filter import get_network_filter
+from .launch_profiles import get_launch_profile
+from .session import (
+    get_session,
+    ITEM_VIEW_MARKER,
+    ITEM_VIEW_PROBE_SUFFIX,
+    FIELD_LOOKUP_TIMEOUT_MS,
+    DISCOVER_ITEM_VIEW_JS
+)
+from .category_catalog import get_category_catalog, apply_category_catalog
+from .excel_reader import read_excel_file
+from .article_records import normalize_articles
+from .validation import check_records
+from .sharding import split_into_shards, print_shard_summary
+
+TEMP_DIR = ".temp"
+
+_hooked_pages = weakref.WeakSet()
+
+# ========================================
+# WARTEN AUF SAPUI5
+# ========================================
+
+async def wait_for_ui5_idle(page, step="default", timeout=None):
+    """Asynchrone Variante von ui5_wait.wait_for_ui5_idle()"""
+    if timeout is None:
+        timeout = WAIT_LIMITS.get(step, WAIT_LIMITS["default"])
+
+    if page not in _hooked_pages:
+        try:
+            await page.add_init_script(IDLE_HOOK_JS)
+        except Exception:
+            pass
+        _hooked_pages.add(page)
+
+    started = time.monotonic()
+    idle = await _wait_until_idle(page, started + timeout)
+
+    waited = time.monotonic() - started
+    record_step("wait", waited, idle, type=step)
+
+    delay = get_pacing_controller().observe(step, waited, idle)
+    if delay:
+        await asyncio.sleep(delay)
+        record_step("settle", delay, type=step)
+    return idle
+
+async def settle_after_miss(step):
+    """Asynchrone Variante von ui5_wait.settle_after_miss()"""
+    delay = get_pacing_controller().record_miss(step)
+    if delay:
+        await asyncio.sleep(delay)
+        record_step("settle", delay, type=step)
+
+async def _wait_until_idle(page, deadline):
+    """Asynchrone Variante von ui5_wait._wait_until_idle()"""
+    arg = idle_wait_arg()
+    while True:
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        if remaining_ms <= 0:
+            return False
+        try:
+            await page.wait_for_function(
+                UI5_IDLE_JS,
+                arg=arg,
+                timeout=remaining_ms,
+                polling=POLLING_INTERVAL_MS
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        except Exception:
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=max(remaining_ms, 1))
+            except Exception:
+                return False
+
+# ========================================
+# BROWSER UND NAVIGATION
+# ========================================
+
+async def create_context_page(browser, viewport_width=None, viewport_height=None, storage_state=None):
+    """
+    Erstellt einen Browser-Kontext mit einer Seite (Fenstergröße aus dem Startprofil)
+
+    Returns:
+        tuple: (context, page)
+    """
+    viewport = get_launch_profile().viewport
+    if viewport_width is not None:
+        viewport["width"] = viewport_width
+    if viewport_height is not None:
+        viewport["height"] = viewport_height
+    context = await browser.new_context(
+        viewport=viewport,
+        storage_state=storage_state
+    )
+    await get_network_filter().attach_async(context)
+    page = await context.new_page()
+    return context, page
+
+async def sap_login(page, username, password):
+    """Asynchrone Variante von autobanf_base.sap_login()"""
+    await page.goto(SAP_PORTAL_URL, timeout=30000)
+    await wait_for_ui5_idle(page, "login")
+
+    login_form = page.locator("input[name='username']")
+    launchpad = page.locator("text=GISA easyBANF")
+    await login_form.or_(launchpad).first.wait_for(state="visible", timeout=10000)
+
+    if await login_form.count() == 0:
+        print(">> Bestehende Sitzung aktiv - Login übersprungen")
+        return False
+
+    await login_form.fill(username)
+    await page.locator("input[name='password']").fill(password)
+    await page.locator("button[type='submit']").click()
+
+    await page.wait_for_function(
+        "() => !window.location.href.includes('loginuserpass.php')",
+        timeout=30000
+    )
+    print(">> Login erfolgreich")
+    return True
+
+async def _find_first(page, target, selectors):
+    """Asynchrone Variante von SelectorRegistry.find_first()"""
+    registry = get_selector_registry()
+    for selector in registry.ordered(target, selectors):
+        try:
+            elements = page.locator(selector)
+            if await elements.count() > 0:
+                registry.record_hit(target, selector)
+                return elements.first, selector
+        except Exception:
+            continue
+    return None, None
+
+async def _select_freitext_in_dropdowns(page):
+    """Sucht 'Freitext' in <select>-Elementen und wählt es aus"""
+    selects = page.locator("select")
+    for i in range(await selects.count()):
+        try:
+            select_element = selects.nth(i)
+            options = select_element.locator("option")
+            for j in range(await options.count()):
+                try:
+                    option_text = (await options.nth(j).inner_text()).strip()
+                    if "freitext" in option_text.lower():
+                        print(f">> FREITEXT GEFUNDEN in Dropdown! Waehle: '{option_text}'")
+                        await select_element.select_option(index=j)
+                        await wait_for_ui5_idle(page, "navigation")
+                        return True
+                except Exception:
+                    continue
+        except Exception:
+            continue
+    return False
+
+async def navigate_to_artikel_page(page, username, password):
+    """
+    Asynchrone Variante von autobanf_base.navigate_to_artikel_page()
+
+    Login > GISA easyBANF > Neuer Artikel > Neue Position anlegen > Freitext
+
+    Returns:
+        bool: Erfolg der Navigation
+    """
+    try:
+        print("\n=== Navigation zur Artikel-Eingabe-Seite ===")
+        laps = trace_laps("navigation")
+
+        print(">> SCHRITT 1: Anmeldung bei SAP")
+        await sap_login(page, username, password)
+        laps.lap("login")
+
+        print("\n>> SCHRITT 2: GISA easyBANF klicken")
+        await wait_for_ui5_idle(page, "navigation")
+        gisa_element = page.locator("text=GISA easyBANF")
+        await gisa_element.wait_for(state="visible", timeout=10000)
+        await gisa_element.click()
+        print(">> GISA easyBANF geklickt")
+        await wait_for_ui5_idle(page, "navigation")
+        laps.lap("easybanf")
+
+        print("\n>> SCHRITT 3: 'Neuer Artikel' klicken")
+        neuer_artikel_element = page.locator("text=Neuer Artikel")
+        await neuer_artikel_element.wait_for(state="visible", timeout=10000)
+        await neuer_artikel_element.click()
+        print(">> 'Neuer Artikel' geklickt")
+        await wait_for_ui5_idle(page, "navigation")
+        laps.lap("neuer_artikel")
+
+        print("\n>> SCHRITT 4: 'Neue Position anlegen' suchen und klicken")
+        position_element, selector = await _find_first(page, "neue_position", POSITION_SELECTORS)
+        if position_element is None:
+            print(">> 'Neue Position anlegen' nicht gefunden!")
+            laps.lap("neue_position", ok=False)
+            return False
+        print(f">> 'Neue Position anlegen' gefunden mit: {selector}")
+        await position_element.click()
+        print(">> 'Neue Position anlegen' geklickt")
+        await wait_for_ui5_idle(page, "navigation")
+        laps.lap("neue_position")
+
+        print("\n>> SCHRITT 5: 'Freitext' auswaehlen")
+        freitext_element, selector = await _find_first(page, "freitext", FREITEXT_SELECTORS)
+        if freitext_element is not None:
+            print(f">> 'Freitext' gefunden mit: {selector}")
+            await freitext_element.click()
+            print(">> 'Freitext' geklickt")
+            await wait_for_ui5_idle(page, "navigation")
+        else:
+            print(">> Suche 'Freitext' in Dropdown-Menues...")
+            if not await _select_freitext_in_dropdowns(page):
+                print(">> 'Freitext' nicht gefunden!")
+                laps.lap("freitext", ok=False)
+                return False
+            print(">> 'Freitext' aus Dropdown ausgewaehlt")
+        laps.lap("freitext")
+
+        print("\n>> SCHRITT 6: Artikel-Eingabe-Seite erreicht!")
+        await wait_for_ui5_idle(page, "navigation")
+        component_prefix = await discover_item_view(page)
+        if component_prefix:
+            print(f">> Artikel-Ansicht: {component_prefix}")
+        laps.lap("artikelseite")
+        print(f">> Aktuelle Seite: {await page.title()}")
+        print(f">> URL: {page.url}")
+        return True
+
+    except Exception as e:
+        print(f">> Fehler bei der Navigation: {e}")
+        return False
+
+# ========================================
+# FORMULARFELDER
+# ========================================
+
+async def discover_item_view(page):
+    """Asynchrone Variante von session.discover_item_view()"""
+    session = get_session(page)
+    try:
+        session.component_prefix = await page.evaluate(
+            DISCOVER_ITEM_VIEW_JS, [ITEM_VIEW_MARKER, ITEM_VIEW_PROBE_SUFFIX]
+        )
+    except Exception:
+        session.component_prefix = None
+    return session.component_prefix
+
+async def click_item_view_element(page, suffix):
+    """Asynchrone Variante von session.click_item_view_element()"""
+    session = get_session(page)
+    for _ in range(2):
+        if session.component_prefix is None and await discover_item_view(page) is None:
+            return None
+        element = page.locator(f"[id='{session.item_view_id(suffix)}']")
+        try:
+            await element.click(timeout=FIELD_LOOKUP_TIMEOUT_MS)
+            return element
+        except Exception:
+            session.invalidate_item_view()
+    return None
+
+async def _type_into(page, element, value):
+    """Leeren, Wert eintragen, Tab - wie im synchronen Pfad (Element ist bereits angeklickt)"""
+    await element.fill('')
+    await wait_for_ui5_idle(page, "field")
+    await element.fill(str(value))
+    await element.press('Tab')
+
+async def fill_text_field(page, field_name, value):
+    """Füllt ein Textfeld aus"""
+    try:
+        if field_name not in TEXT_FIELD_SELECTORS:
+            print(f"   FEHLER: Unbekanntes Textfeld '{field_name}'")
+            return False
+
+        field_suffix = TEXT_FIELD_SELECTORS[field_name]
+
+        if field_name == "Kontierungsobjekt":
+            try:
+                element = page.locator(field_suffix)
+                if await element.count() > 0:
+                    await element.click()
+                    await _type_into(page, element, value)
+                    print(f"   OK {field_name} '{value}' erfolgreich")
+                    return True
+            except Exception:
+                pass
+        else:
+            element = await click_item_view_element(page, field_suffix)
+            if element is not None:
+                await _type_into(page, element, value)
+                print(f"   OK {field_name} '{value}' erfolgreich")
+                return True
+
+        print(f"   FEHLER: {field_name}-Feld nicht gefunden")
+        return False
+
+    except Exception as e:
+        print(f"   FEHLER bei {field_name}: {e}")
+        return False
+
+async def fill_numeric_field(page, field_name, value):
+    """Füllt ein numerisches Feld aus"""
+    try:
+        if field_name not in NUMERIC_FIELD_SELECTORS:
+            print(f"   FEHLER: Unbekanntes numerisches Feld '{field_name}'")
+            return False
+
+        element = await click_item_view_element(page, NUMERIC_FIELD_SELECTORS[field_name])
+        if element is not None:
+            await _type_into(page, element, value)
+            print(f"   OK {field_name} '{value}' erfolgreich")
+            return True
+
+        print(f"   FEHLER: {field_name}-Feld nicht gefunden")
+        return False
+
+    except Exception as e:
+        print(f"   FEHLER bei {field_name}: {e}")
+        return False
+
+async def select_combobox_option(page, option_text):
+    """Spezielle Behandlung für Einheit-ComboBox"""
+    try:
+        combobox = await click_item_view_element(page, UNIT_COMBOBOX_SUFFIX)
+        if combobox is None:
+            print("   FEHLER: Einheit-ComboBox nicht gefunden")
+            return False
+        await wait_for_ui5_idle(page, "dropdown")
+
+        arrow_id = get_session(page).item_view_id(UNIT_ARROW_SUFFIX)
+        arrow = page.locator(f"[id='{arrow_id}']")
+        if await arrow.count() == 0:
+            print("   FEHLER: Dropdown-Pfeil der Einheit nicht gefunden")
+            return False
+        await arrow.click(timeout=FIELD_LOOKUP_TIMEOUT_MS)
+        await wait_for_ui5_idle(page, "dropdown")
+
+        option = page.locator(f"text={option_text}")
+        if await option.count() == 0:
+            await settle_after_miss("dropdown")
+        if await option.count() > 0:
+            await option.first.click()
+            print(f"   OK Einheit '{option_text}' erfolgreich")
+            return True
+        print(f"   FEHLER: Einheit-Option '{option_text}' nicht gefunden")
+        return False
+
+    except Exception as e:
+        print(f"   FEHLER bei Einheit: {e}")
+        return False
+
+async def select_dropdown_option(page, field_name, option_text):
+    """Optimierte Dropdown-Auswahl"""
+    try:
+        if field_name not in DROPDOWN_CONFIG:
+            print(f"   FEHLER: Unbekanntes Dropdown-Feld '{field_name}'")
+            return False
+
+        config = DROPDOWN_CONFIG[field_name]
+
+        dropdown = page.locator(config["selector"])
+        if await dropdown.count() == 0:
+            print(f"   FEHLER: Dropdown für '{field_name}' nicht gefunden")
+            return False
+
+        await dropdown.first.click()
+        await wait_for_ui5_idle(page, "dropdown")
+
+        if option_text not in config["options"]:
+            print(f"   FEHLER: Option '{option_text}' nicht in Konfiguration")
+            return False
+
+        option = page.locator(config["options"][option_text])
+        if await option.count() == 0:
+            await settle_after_miss("dropdown")
+        if await option.count() > 0:
+            await option.first.click()
+            print(f"   OK {field_name} '{option_text}' erfolgreich")
+            return True
+        print(f"   FEHLER: Option '{option_text}' nicht gefunden")
+        return False
+
+    except Exception as e:
+        print(f"   FEHLER bei {field_name}: {e}")
+        return False
+
+async def fill_form_field(page, field_spec, value):
+    """Füllt ein Feld des Artikel-Formulars passend zu seinem Typ aus"""
+    field_type = field_spec["type"]
+    if field_type == "text":
+        return await fill_text_field(page, field_spec["field"], value)
+    if field_type == "numeric":
+        return await fill_numeric_field(page, field_spec["field"], value)
+    if field_type == "dropdown":
+        return await select_dropdown_option(page, field_spec["field"], value)
+    if field_type == "combobox":
+        return await select_combobox_option(page, value)
+    print(f"   FEHLER: Unbekannter Feldtyp '{field_type}'")
+    return False
+
+async def batch_fill_article_fields(page, field_values):
+    """Asynchrone Variante von complete_form_fill.batch_fill_article_fields()"""
+    items = build_batch_items(field_values)
+    if not items:
+        return {}
+    try:
+        result = await page.evaluate(BATCH_FILL_JS, items)
+    except Exception as e:
+        print(f"   WARNUNG: Batch-Ausfüllen fehlgeschlagen: {e}")
+        return {}
+    await wait_for_ui5_idle(page, "field")
+    return result
+
+# ========================================
+# KATEGORIE
+# ========================================
+
+async def index_category_tree(page):
+    """Asynchrone Variante von complete_form_fill.index_category_tree()"""
+    session = get_session(page)
+    try:
+        if await page.evaluate(EXPAND_CATEGORY_TREE_JS, [CATEGORY_TREE_MARKER, 1]):
+            await wait_for_ui5_idle(page, "category")
+        items = await page.evaluate(READ_CATEGORY_TREE_JS, CATEGORY_TREE_MARKER)
+    except Exception:
+        items = []
+    session.category_index = build_category_index(items)
+    return session.category_index
+
+async def select_category_from_catalog(page, main_category, subcategory):
+    """Asynchrone Variante von complete_form_fill.select_category_from_catalog()"""
+    catalog = get_category_catalog()
+    path = catalog.path_for(main_category, subcategory) if catalog else None
+    if path is None:
+        return False
+    try:
+        await page.evaluate(EXPAND_CATEGORY_TREE_JS, [CATEGORY_TREE_MARKER, 1])
+        title = subcategory or main_category
+        if await page.evaluate(CLICK_CATEGORY_PATH_JS, [CATEGORY_TREE_MARKER, path, title]):
+            await wait_for_ui5_idle(page, "category")
+            return True
+    except Exception:
+        pass
+    return False
+
+async def select_category_from_index(page, main_category, subcategory):
+    """Asynchrone Variante von complete_form_fill.select_category_from_index()"""
+    if await select_category_from_catalog(page, main_category, subcategory):
+        return True
+
+    session = get_session(page)
+    key = (main_category, subcategory or None)
+    for rebuilt in (False, True):
+        if rebuilt or session.category_index is None:
+            await index_category_tree(page)
+        entry = session.category_index.get(key)
+        if entry is None:
+            continue
+        try:
+            await page.evaluate(EXPAND_CATEGORY_TREE_JS, [CATEGORY_TREE_MARKER, 1])
+            title = subcategory or main_category
+            if await page.evaluate(CLICK_CATEGORY_ITEM_JS, {"id": entry["id"], "title": title}):
+                await wait_for_ui5_idle(page, "category")
+                return True
+        except Exception:
+            pass
+    return False
+
+async def select_category_robust(page, main_category, subcategory, artikel_nr):
+    """Robuste Kategorieauswahl die verschiedene Zustände des Dialogs behandelt"""
+    try:
+        print(f"   Robuste Kategorie-Auswahl für Artikel {artikel_nr}: '{main_category}' -> '{subcategory}'")
+
+        if not await page.evaluate(DIALOG_OPEN_JS):
+            print(f"   Dialog ist geschlossen - öffne für Artikel {artikel_nr}")
+            await page.evaluate("window.scrollTo(0, 0)")
+            await wait_for_ui5_idle(page, "default")
+
+            kategorie_button = page.locator("text=Kategorie auswählen")
+            if await kategorie_button.count() == 0:
+                print("   WARNUNG: Kategorie-Button nicht gefunden")
+                return False
+            if not await kategorie_button.first.is_visible():
+                await kategorie_button.first.scroll_into_view_if_needed()
+                await wait_for_ui5_idle(page, "default")
+            await kategorie_button.click()
+            await wait_for_ui5_idle(page, "dialog")
+            if not await page.evaluate(DIALOG_OPEN_JS):
+                await settle_after_miss("dialog")
+            print("   Dialog geöffnet")
+        else:
+            print(f"   Dialog bereits offen für Artikel {artikel_nr}")
+
+        await wait_for_ui5_idle(page, "dialog")
+
+        if await select_category_from_index(page, main_category, subcategory):
+            print("   Kategorie über Sitzungs-Verzeichnis ausgewählt")
+            return True
+
+        if await page.evaluate(EXPAND_MAIN_CATEGORY_JS, main_category):
+            print(f"   Hauptkategorie '{main_category}' aufgeklappt")
+            await wait_for_ui5_idle(page, "category")
+        else:
+            print(f"   Hauptkategorie '{main_category}' schon aufgeklappt oder nicht gefunden")
+
+        try:
+            subcategory_locator = page.locator(f"text={subcategory}").first
+            if await subcategory_locator.count() > 0 and await subcategory_locator.is_visible():
+                await subcategory_locator.click(timeout=10000)
+                print(f"   Unterkategorie '{subcategory}' erfolgreich geklickt!")
+                await wait_for_ui5_idle(page, "category")
+                return True
+        except Exception as e:
+            print(f"   Playwright-Klick fehlgeschlagen: {e}")
+
+        if await page.evaluate(CLICK_SUBCATEGORY_JS, subcategory):
+            print(f"   Unterkategorie '{subcategory}' mit SAP-JavaScript erfolgreich geklickt!")
+            await wait_for_ui5_idle(page, "category")
+            return True
+
+        print(f"   FEHLER: Unterkategorie '{subcategory}' konnte nicht geklickt werden")
+        await page.keyboard.press("Escape")
+        await wait_for_ui5_idle(page, "dialog")
+        return False
+
+    except Exception as e:
+        print(f"   FEHLER bei robuster Kategorieauswahl: {e}")
+        try:
+            await page.keyboard.press("Escape")
+        except Exception:
+            pass
+        return False
+
+# ========================================
+# ARTIKEL
+# ========================================
+
+async def fill_article_form(page, row_data, artikel_nr, batch_fill=False):
+    """Füllt das Formular für einen Artikel aus"""
+    print(f"\n>> ARTIKEL {artikel_nr} - FORMULAR AUSFÜLLEN")
+
+    success_count = 0
+    total_fields = TOTAL_ARTICLE_FIELDS
+
+    try:
+        kategorie = row_data.get('Kategorie')
+        if kategorie:
+            if '->' in kategorie:
+                main_cat, sub_cat = kategorie.split('->', 1)
+                with trace_step("category", artikel=artikel_nr):
+                    if await select_category_robust(page, main_cat.strip(), sub_cat.strip(), artikel_nr):
+                        success_count += 1
+                    await wait_for_ui5_idle(page, "category")
+
+        field_values = [
+            (field_spec, row_data.get(field_spec["column"]))
+            for field_spec in ARTICLE_FIELDS
+            if row_data.get(field_spec["column"]) is not None
+        ]
+
+        batch_result = {}
+        if batch_fill:
+            with trace_step("batch_fill", artikel=artikel_nr):
+                batch_result = await batch_fill_article_fields(page, field_values)
+
+        for field_spec, value in field_values:
+            if batch_result.get(field_spec["field"]):
+                success_count += 1
+                continue
+            with trace_step("field", type=field_spec["type"], field=field_spec["field"], artikel=artikel_nr):
+                if await fill_form_field(page, field_spec, value):
+                    success_count += 1
+
+        screenshots = get_screenshot_policy()
+        if screenshots.before_transfer and screenshots.wants_article(
+                artikel_nr, success_count == required_steps(row_data) - 1):
+            with trace_step("screenshot", artikel=artikel_nr):
+                await screenshots.capture_async(page, f"excel_import_artikel_{artikel_nr}", TEMP_DIR,
+                                                element=True)
+
+        with trace_step("transfer", artikel=artikel_nr):
+            button, _ = await _find_first(page, "transfer_button", TRANSFER_SELECTORS)
+            if button is not None:
+                await button.click()
+                print(f"   OK 'Bearbeitung abschließen' geklickt (Artikel {artikel_nr})")
+                await wait_for_ui5_idle(page, "transfer")
+                success_count += 1
+            else:
+                print("   FEHLER: 'Bearbeitung abschließen' Button nicht gefunden")
+
+    except Exception as e:
+        print(f"FEHLER bei Artikel {artikel_nr}: {e}")
+
+    print(f">> Artikel {artikel_nr} abgeschlossen: {success_count}/{total_fields} Felder erfolgreich")
+    return success_count, total_fields
+
+async def add_new_article_position(page, artikel_nr):
+    """Fügt eine neue Artikelposition hinzu"""
+    try:
+        neue_position_button = page.locator("text=Neue Position anlegen")
+        if await neue_position_button.count() == 0:
+            await settle_after_miss("transfer")
+        if await neue_position_button.count() == 0:
+            print("   FEHLER: 'Neue Position anlegen' Button nicht gefunden")
+            return False
+        await neue_position_button.click()
+        await wait_for_ui5_idle(page, "position")
+
+        await page.locator("text=Freitext").first.click()
+        await wait_for_ui5_idle(page, "position")
+        await discover_item_view(page)
+        print(f">> Neue Position für Artikel {artikel_nr} angelegt")
+        return True
+
+    except Exception as e:
+        print(f"FEHLER beim Hinzufügen neuer Position für Artikel {artikel_nr}: {e}")
+        return False
+
+async def import_rows(page, records, temp_dir=TEMP_DIR, batch_fill=False):
+    """
+    Trägt Artikel-Zeilen nacheinander in den Warenkorb der Seite ein
+
+    Returns:
+        dict: processed, success, fields
+    """
+    result = {"processed": 0, "success": 0, "fields": 0}
+
+    for position, record in enumerate(records, start=1):
+        artikel_nr = record.index + 1
+
+        if position > 1:
+            with trace_step("new_position", artikel=artikel_nr):
+                added = await add_new_article_position(page, artikel_nr)
+            if not added:
+                print(f"ABBRUCH: Konnte keine neue Position für Artikel {artikel_nr} hinzufügen")
+                break
+
+        with trace_step("article", artikel=artikel_nr):
+            success_count, field_count = await fill_article_form(page, record, artikel_nr, batch_fill)
+        result["processed"] += 1
+        result["success"] += success_count
+        result["fields"] += field_count
+
+        screenshots = get_screenshot_policy()
+        ok = success_count == required_steps(record)
+        if not screenshots.before_transfer and screenshots.wants_article(artikel_nr, ok):
+            with trace_step("screenshot", artikel=artikel_nr):
+                await screenshots.capture_async(page, f"excel_import_artikel_{artikel_nr}", temp_dir)
+
+    return result
+
+# ========================================
+# EINSTIEGSPUNKT
+# ========================================
+
+async def _run_worker(browser, shard_nr, records, username, password, storage_state, temp_dir,
+                      batch_fill=False):
+    """Verarbeitet einen Shard (Liste von ArticleRecords) in einem eigenen Browser-Kontext"""
+    result = {
+        "shard": shard_nr,
+        "rows": len(records),
+        "processed": 0,
+        "success": 0,
+        "fields": 0,
+        "seconds": 0.0,
+        "error": None
+    }
+    started = time.monotonic()
+    screenshots = get_screenshot_policy()
+    context, page = await create_context_page(browser, storage_state=storage_state)
+
+    try:
+        if not await navigate_to_artikel_page(page, username, password):
+            result["error"] = "Navigation zur Artikel-Seite fehlgeschlagen"
+            return result
+
+        result.update(await import_rows(page, records, temp_dir, batch_fill))
+        if screenshots.enabled:
+            await screenshots.capture_async(page, f"excel_import_complete_shard{shard_nr}", temp_dir)
+    except Exception as e:
+        result["error"] = str(e)
+        try:
+            if screenshots.enabled:
+                await screenshots.capture_async(page, f"excel_import_error_shard{shard_nr}", temp_dir)
+        except Exception:
+            pass
+    finally:
+        result["seconds"] = time.monotonic() - started
+        await context.close()
+
+    return result
+
+async def import_workbook(path, concurrency=1, group_column=None, username=None, password=None,
+                          headless=None, slow_mo=None, batch_fill=False, reuse_session=True):
+    """
+    Importiert eine Excel-Arbeitsmappe mit mehreren Seiten in einer Event-Loop
+
+    Args:
+        path (str): Pfad zur Excel-Datei
+        concurrency (int): Anzahl gleichzeitig bearbeiteter Seiten/Warenkörbe
+        group_column (str): Gruppierungsspalte für die Aufteilung (optional)
+        username (str): HSA-Benutzername (sonst aus SecureCredentials)
+        password (str): HSA-Passwort (sonst aus SecureCredentials)
+        headless (bool): Browser im Hintergrund ausführen (Standard: aus dem Startprofil)
+        slow_mo (int): Millisekunden zwischen Aktionen (Standard: aus dem Pacing-Profil)
+        batch_fill (bool): Felder gesammelt über die UI5-Control-API setzen
+        reuse_session (bool): Gespeicherte Sitzung aus .credentials/ wiederverwenden
+
+    Returns:
+        list: Ergebnis je Seite (dict), leer bei Abbruch
+    """
+    start_trace(Path(path).stem)
+    df = await asyncio.to_thread(read_excel_file, path)
+    if df is None:
+        return []
+    if not apply_category_catalog(df):
+        print("ABBRUCH: Unbekannte Kategorien in der Excel-Datei")
+        return []
+
+    # Aufbereiten und prüfen, bevor der Browser startet
+    shards = [normalize_articles(shard_df) for shard_df in split_into_shards(df, concurrency, group_column)]
+    if not shards:
+        print("ABBRUCH: Keine Artikel-Zeilen in der Excel-Datei - nichts zu importieren")
+        return []
+    if not check_records([record for records in shards for record in records]):
+        return []
+
+    if not username or not password:
+        username, password = SecureCredentials().get_credentials_interactive()
+        if not username or not password:
+            print("ABBRUCH: Keine gültigen Anmeldedaten erhalten")
+            return []
+
+    os.makedirs(TEMP_DIR, exist_ok=True)
+    print(f"\n>> {len(df)} Artikel auf {len(shards)} Seiten verteilt")
+
+    # Alle Seiten teilen sich einen Browser mit mehreren Kontexten - das
+    # Cache-Verzeichnis des Startprofils (persistenter Kontext) entfällt hier
+    profile = get_launch_profile()
+    if headless is None:
+        headless = profile.headless
+    async with async_playwright() as playwright:
+        if slow_mo is None:
+            slow_mo = get_pacing_controller().slow_mo
+        started = time.perf_counter()
+        browser = await playwright.chromium.launch(headless=headless, slow_mo=slow_mo, args=profile.args)
+        profile.record_launch(time.perf_counter() - started)
+        try:
+            # Einmal anmelden, Sitzung an alle Kontexte weitergeben
+            login_context, login_page = await create_context_page(
+                browser, storage_state=load_saved_session(reuse_session)
+            )
+            try:
+                with trace_step("login"):
+                    await sap_login(login_page, username, password)
+                storage_state = await login_context.storage_state()
+                if reuse_session:
+                    SecureCredentials().save_session_state(storage_state)
+            except Exception as e:
+                # Wie im synchronen Ablauf: Meldung statt Traceback aus asyncio.run
+                print(f"FEHLER bei der Anmeldung: {e}")
+                print("ABBRUCH: Anmeldung fehlgeschlagen - keine Artikel übertragen")
+                return []
+            finally:
+                await login_context.close()
+
+            results = await asyncio.gather(*[
+                _run_worker(browser, shard_nr, records, username, password, storage_state, TEMP_DIR,
+                            batch_fill)
+                for shard_nr, records in enumerate(shards, start=1)
+            ])
+        finally:
+            await browser.close()
+
+    print_shard_summary(results)
+    get_screenshot_policy().print_summary()
+    get_network_filter().print_summary()
+    profile.print_summary()
+    get_pacing_controller().print_summary()
+    get_pacing_controller().save()
+    get_selector_registry().save()
+    print_trace_report()
+    return list(results)
@@ -12,24 +12,83 @@ Verwendung:
 """
 
 from playwright.sync_api import sync_playwright
+from .ui5_wait import wait_for_ui5_idle
+from .session import discover_item_view, get_session, ITEM_VIEW_PROBE_SUFFIX
+from .selector_registry import get_selector_registry
+from .pacing import get_pacing_controller
+from .step_trace import trace_laps
+from .har_replay import har_context_options, apply_har_replay
+from .network_filter import get_network_filter
+from .launch_profiles import get_launch_profile, PersistentBrowser
 import time
 import json
 import os
+import threading
 from pathlib import Path
 from cryptography.fernet import Fernet
 import getpass
 
+# Einstiegsseite des SAP-Portals (AUTOBANF_PORTAL_URL z.B. für den lokalen Nachbau in benchmarks/)
+SAP_PORTAL_URL = os.environ.get("AUTOBANF_PORTAL_URL", "https://prod.sap.hsa.fms-bayern.de/")
+
+# Selektoren für "Neue Position anlegen" (Reihenfolge nach Trefferquote, siehe selector_registry)
+POSITION_SELECTORS = [
+    "text=Neue Position anlegen",
+    "*:has-text('Neue Position anlegen')",
+    "button:has-text('Neue Position anlegen')",
+    "a:has-text('Neue Position anlegen')",
+    "*[title*='Neue Position anlegen']"
+]
+
+# Prüft, ob das Feld (Artikelbeschreibung) sichtbar und noch leer ist (Argument: Element-ID)
+EMPTY_FIELD_JS = '''(id) => {
+    const el = document.getElementById(id);
+    return !!el && el.offsetParent !== null && !el.value;
+}'''
+
+# Selektoren für "Freitext"
+FREITEXT_SELECTORS = [
+    "text=Freitext",
+    "*:has-text('Freitext')",
+    "option:has-text('Freitext')",
+    "button:has-text('Freitext')",
+    "a:has-text('Freitext')"
+]
+
+# Playwright-Instanz je Browser. Sie wird beim Schließen mit beendet - eine noch
+# laufende Instanz lässt jeden weiteren sync_playwright().start() im selben
+# Thread scheitern (z.B. Benchmark-Läufe, Neustart im Überwachungsmodus).
+_playwright_instances = {}
+_playwright_lock = threading.Lock()
+
+def register_playwright(browser, playwright):
+    """Verknüpft einen Browser mit der Playwright-Instanz, die ihn gestartet hat"""
+    with _playwright_lock:
+        # Der Eintrag hält den Browser fest, die id() wird also nicht wiederverwendet
+        _playwright_instances[id(browser)] = (browser, playwright)
+
+def stop_playwright(browser):
+    """Beendet die Playwright-Instanz eines (bereits geschlossenen) Browsers"""
+    with _playwright_lock:
+        _, playwright = _playwright_instances.pop(id(browser), (None, None))
+    if playwright is not None:
+        try:
+            playwright.stop()
+        except Exception:
+            pass
+
 class SecureCredentials:
     """
     Sichere Speicherung und Verwaltung von Anmeldedaten mit Verschlüsselung
     """
     
-    def __init__(self, config_file="autobanf_config.enc"):
+    def __init__(self, config_file="autobanf_config.enc", session_file="session_state.enc"):
         # Credentials-Ordner erstellen falls nicht vorhanden
         self.cred_dir = Path(".credentials")
         self.cred_dir.mkdir(exist_ok=True)
         
         self.config_file = self.cred_dir / config_file
+        self.session_file = self.cred_dir / session_file
         self.key_file = self.cred_dir / ".autobanf_key"
         
     def _get_or_create_key(self):
@@ -137,11 +196,58 @@ class SecureCredentials:
         
         return username, password
     
+    def save_session_state(self, storage_state):
+        """Speichert den storage_state einer angemeldeten Sitzung verschlüsselt"""
+        try:
+            fernet = Fernet(self._get_or_create_key())
+            encrypted_data = fernet.encrypt(json.dumps(storage_state).encode())
+            
+            with open(self.session_file, 'wb') as f:
+                f.write(encrypted_data)
+            
+            try:
+                os.chmod(self.session_file, 0o600)
+            except:
+                pass
+            return True
+            
+        except Exception as e:
+            print(f">> Fehler beim Speichern der Sitzung: {e}")
+            return False
+    
+    def load_session_state(self):
+        """Lädt den gespeicherten storage_state oder None"""
+        try:
+            if not self.session_file.exists() or not self.key_file.exists():
+                return None
+            
+            fernet = Fernet(self._get_or_create_key())
+            with open(self.session_file, 'rb') as f:
+                encrypted_data = f.read()
+            
+            return json.loads(fernet.decrypt(encrypted_data).decode())
+            
+        except Exception as e:
+            print(f">> Gespeicherte Sitzung nicht lesbar: {e}")
+            return None
+    
+    def delete_session_state(self):
+        """Löscht die gespeicherte Sitzung"""
+        try:
+            if self.session_file.exists():
+                self.session_file.unlink()
+            return True
+        except Exception as e:
+            print(f">> Fehler beim Loeschen der Sitzung: {e}")
+            return False
+    
     def delete_credentials(self):
         """Löscht gespeicherte Anmeldedaten"""
         try:
             if self.config_file.exists():
                 self.config_file.unlink()
+            if self.session_file.exists():
+                self.session_file.unlink()
             if self.key_file.exists():
                 self.key_file.unlink()
             print(">> Anmeldedaten geloescht")
@@ -183,26 +289,283 @@ def get_credentials():
     
     return username, password, cred_manager
 
-def create_browser_page(headless=False, slow_mo=800, viewport_width=1600, viewport_height=1000):
+def create_browser_page(headless=None, slow_mo=None, viewport_width=None, viewport_height=None,
+                        storage_state=None):
     """
-    Erstellt einen Browser und eine Seite mit Standardeinstellungen
+    Erstellt einen Browser und eine Seite nach dem aktiven Startprofil
+    
+    Headless-Modus, Chromium-Argumente, Fenstergröße und Cache-Verzeichnis
+    kommen aus dem Startprofil (--launch); übergebene Werte haben Vorrang.
+    Mit Cache-Verzeichnis wird ein persistenter Kontext gestartet und in
+    einen PersistentBrowser gehüllt.
     
     Args:
-        headless (bool): Browser im Hintergrund ausführen
-        slow_mo (int): Millisekunden zwischen Aktionen (reduziert von 1500 auf 800)
-        viewport_width (int): Browser-Breite
-        viewport_height (int): Browser-Höhe
+        headless (bool): Browser im Hintergrund ausführen (Standard: aus dem Startprofil)
+        slow_mo (int): Millisekunden zwischen Aktionen (Standard: aus dem Pacing-Profil,
+            gewartet wird sonst gezielt über wait_for_ui5_idle)
+        viewport_width (int): Browser-Breite (Standard: aus dem Startprofil)
+        viewport_height (int): Browser-Höhe (Standard: aus dem Startprofil)
+        storage_state (dict): Cookies/Storage einer bestehenden Anmeldung (optional)
     
     Returns:
         tuple: (browser, page)
     """
+    profile = get_launch_profile()
+    if headless is None:
+        headless = profile.headless
+    if slow_mo is None:
+        slow_mo = get_pacing_controller().slow_mo
+    viewport = profile.viewport
+    if viewport_width is not None:
+        viewport["width"] = viewport_width
+    if viewport_height is not None:
+        viewport["height"] = viewport_height
+    
+    started = time.perf_counter()
     playwright = sync_playwright().start()
-    browser = playwright.chromium.launch(headless=headless, slow_mo=slow_mo)
-    page = browser.new_page()
-    page.set_viewport_size({"width": viewport_width, "height": viewport_height})
+    browser = None
+    try:
+        if profile.cache_dir:
+            slot, release = profile.acquire_cache_slot()
+            try:
+                context = playwright.chromium.launch_persistent_context(
+                    slot,
+                    headless=headless,
+                    slow_mo=slow_mo,
+                    args=profile.args,
+                    viewport=viewport,
+                    **har_context_options()
+                )
+            except Exception:
+                release()
+                raise
+            browser = PersistentBrowser(context, release)
+            # Aus dem Profilordner wird nur der HTTP-Cache übernommen
+            context.clear_cookies()
+            if storage_state:
+                context.add_cookies(storage_state.get("cookies", []))
+        else:
+            browser = playwright.chromium.launch(headless=headless, slow_mo=slow_mo, args=profile.args)
+            context = browser.new_context(
+                viewport=viewport,
+                storage_state=storage_state,
+                **har_context_options()
+            )
+    except Exception:
+        # Fehlgeschlagener Start: Browser und Playwright nicht offen lassen
+        if browser is not None:
+            try:
+                browser.close()
+            except Exception:
+                pass
+        playwright.stop()
+        raise
+    register_playwright(browser, playwright)
+    apply_har_replay(context)
+    get_network_filter().attach(context)
+    page = context.pages[0] if context.pages else context.new_page()
+    profile.record_launch(time.perf_counter() - started)
     return browser, page
 
-def navigate_to_artikel_page(username, password, browser=None, page=None, create_screenshots=True):
+def sap_login(page, username, password, create_screenshots=False):
+    """
+    Meldet sich am SAP-Portal an
+    
+    Ist der Browser-Kontext bereits angemeldet (z.B. über storage_state),
+    wird das Login-Formular übersprungen.
+    
+    Args:
+        page: Playwright page object
+        username (str): HSA-Benutzername
+        password (str): HSA-Passwort
+        create_screenshots (bool): Screenshots erstellen
+    
+    Returns:
+        bool: True wenn ein neues Login durchgeführt wurde, False bei bestehender Sitzung
+    """
+    page.goto(SAP_PORTAL_URL, timeout=30000)
+    wait_for_ui5_idle(page, "login")
+    
+    login_form = page.locator("input[name='username']")
+    launchpad = page.locator("text=GISA easyBANF")
+    login_form.or_(launchpad).first.wait_for(state="visible", timeout=10000)
+    
+    if login_form.count() == 0:
+        print(">> Bestehende Sitzung aktiv - Login übersprungen")
+        return False
+    
+    login_form.fill(username)
+    page.locator("input[name='password']").fill(password)
+    page.locator("button[type='submit']").click()
+    
+    page.wait_for_function(
+        "() => !window.location.href.includes('loginuserpass.php')",
+        timeout=30000
+    )
+    print(">> Login erfolgreich")
+    
+    if create_screenshots:
+        page.screenshot(path="base_01_nach_login.png")
+    return True
+
+def load_saved_session(reuse_session=True):
+    """
+    Liefert den gespeicherten storage_state der letzten Anmeldung
+    
+    Returns:
+        dict: storage_state oder None (keine Sitzung gespeichert oder Wiederverwendung aus)
+    """
+    if not reuse_session:
+        return None
+    storage_state = SecureCredentials().load_session_state()
+    if storage_state is not None:
+        print(">> Gespeicherte Sitzung gefunden - versuche Wiederverwendung")
+    return storage_state
+
+def save_session(page):
+    """Speichert die Sitzung der Seite für den nächsten Lauf"""
+    try:
+        if SecureCredentials().save_session_state(page.context.storage_state()):
+            print(">> Sitzung für den nächsten Lauf gespeichert")
+    except Exception as e:
+        print(f">> WARNUNG: Sitzung nicht gespeichert: {e}")
+
+def login_with_saved_session(page, username, password, reuse_session=True, create_screenshots=False):
+    """
+    Meldet sich an und pflegt die gespeicherte Sitzung
+    
+    Der Kontext der Seite wurde mit load_saved_session() erstellt. sap_login()
+    erkennt eine noch gültige Sitzung am Launchpad; nur wenn sie abgelaufen ist,
+    wird das Login-Formular ausgefüllt. Danach wird die (ggf. erneuerte)
+    Sitzung gespeichert.
+    
+    Returns:
+        bool: True wenn ein neues Login durchgeführt wurde
+    """
+    new_login = sap_login(page, username, password, create_screenshots)
+    if reuse_session:
+        save_session(page)
+    return new_login
+
+def open_freitext_position(page, create_screenshots=False):
+    """
+    Legt im geöffneten Warenkorb eine neue Freitext-Position an (Schritte 4-6)
+    
+    Args:
+        page: Playwright page object im Warenkorb
+        create_screenshots (bool): Screenshots erstellen
+    
+    Returns:
+        bool: True wenn die Artikel-Eingabe-Seite erreicht wurde
+    """
+    # ========================================
+    # SCHRITT 4: NEUE POSITION ANLEGEN
+    # ========================================
+    print("\n>> SCHRITT 4: 'Neue Position anlegen' suchen und klicken")
+    laps = trace_laps("navigation")
+    
+    selector_registry = get_selector_registry()
+    position_element, selector = selector_registry.find_first(page, "neue_position", POSITION_SELECTORS)
+    if position_element:
+        print(f">> 'Neue Position anlegen' gefunden mit: {selector}")
+    
+    if not position_element:
+        print(">> 'Neue Position anlegen' nicht gefunden!")
+        laps.lap("neue_position", ok=False)
+        return False
+    
+    position_element.click()
+    print(">> 'Neue Position anlegen' geklickt")
+    
+    wait_for_ui5_idle(page, "navigation")
+    laps.lap("neue_position")
+    
+    if create_screenshots:
+        page.screenshot(path="base_04_nach_neue_position.png")
+    
+    # ========================================
+    # SCHRITT 5: FREITEXT AUSWÄHLEN
+    # ========================================
+    print("\n>> SCHRITT 5: 'Freitext' auswaehlen")
+    
+    # Erst direkt nach Freitext-Elementen suchen
+    freitext_element, selector = selector_registry.find_first(page, "freitext", FREITEXT_SELECTORS)
+    if freitext_element:
+        print(f">> 'Freitext' gefunden mit: {selector}")
+    
+    # Falls nicht direkt gefunden, in Dropdowns suchen
+    if not freitext_element:
+        print(">> Suche 'Freitext' in Dropdown-Menues...")
+        
+        selects = page.locator("select")
+        select_count = selects.count()
+        
+        for i in range(select_count):
+            try:
+                select_element = selects.nth(i)
+                options = select_element.locator("option")
+                option_count = options.count()
+                
+                for j in range(option_count):
+                    try:
+                        option_text = options.nth(j).inner_text().strip()
+                        
+                        if "freitext" in option_text.lower():
+                            print(f">> FREITEXT GEFUNDEN in Dropdown! Waehle: '{option_text}'")
+                            select_element.select_option(index=j)
+                            freitext_element = "found_in_dropdown"
+                            wait_for_ui5_idle(page, "navigation")
+                            break
+                    except:
+                        continue
+                
+                if freitext_element:
+                    break
+                    
+            except:
+                continue
+    
+    # Normales Element klicken falls gefunden
+    if freitext_element and freitext_element != "found_in_dropdown":
+        freitext_element.click()
+        print(">> 'Freitext' geklickt")
+        wait_for_ui5_idle(page, "navigation")
+    elif freitext_element == "found_in_dropdown":
+        print(">> 'Freitext' aus Dropdown ausgewaehlt")
+    else:
+        print(">> 'Freitext' nicht gefunden!")
+        laps.lap("freitext", ok=False)
+        return False
+    laps.lap("freitext")
+    
+    # ========================================
+    # SCHRITT 6: ARTIKEL-SEITE ERREICHT
+    # ========================================
+    print("\n>> SCHRITT 6: Artikel-Eingabe-Seite erreicht!")
+    
+    wait_for_ui5_idle(page, "navigation")
+    
+    if create_screenshots:
+        page.screenshot(path="base_05_artikelseite.png")
+    
+    # Aktive Artikel-Ansicht einmal ermitteln und für die Sitzung merken
+    component_prefix = discover_item_view(page)
+    if component_prefix:
+        print(f">> Artikel-Ansicht: {component_prefix}")
+    else:
+        print(">> WARNUNG: Artikel-Ansicht nicht erkannt - wird beim ersten Feld erneut gesucht")
+    laps.lap("artikelseite")
+    
+    # Seiteninformationen
+    current_url = page.url
+    current_title = page.title()
+    print(f">> Aktuelle Seite: {current_title}")
+    print(f">> URL: {current_url}")
+    
+    return True
+
+def navigate_to_artikel_page(username, password, browser=None, page=None, create_screenshots=True,
+                             reuse_session=True):
     """
     Navigiert zur SAP Artikel-Eingabe-Seite
     
@@ -215,55 +578,42 @@ def navigate_to_artikel_page(username, password, browser=None, page=None, create
         browser: Existing browser instance (optional)
         page: Existing page instance (optional)
         create_screenshots (bool): Screenshots erstellen
+        reuse_session (bool): Gespeicherte Sitzung aus .credentials/ wiederverwenden
     
     Returns:
         tuple: (success, browser, page) - browser und page für weitere Verwendung
     """
     
     # Browser erstellen falls nicht übergeben
-    own_browser = browser is None
+    # Bei persistenten Kontexten (Startprofil mit Cache) ist page.context.browser None
+    own_browser = page is None
     if own_browser:
-        browser, page = create_browser_page()
+        browser, page = create_browser_page(storage_state=load_saved_session(reuse_session))
     
     try:
         print("\n=== Navigation zur Artikel-Eingabe-Seite ===")
+        laps = trace_laps("navigation")
         
         # ========================================
         # SCHRITT 1: LOGIN
         # ========================================
         print(">> SCHRITT 1: Anmeldung bei SAP")
-        page.goto("https://prod.sap.hsa.fms-bayern.de/", timeout=30000)
-        page.wait_for_load_state("networkidle", timeout=15000)
-        page.wait_for_selector("input[name='username']", timeout=10000)
-        
-        page.locator("input[name='username']").fill(username)
-        page.locator("input[name='password']").fill(password)
-        page.locator("button[type='submit']").click()
-        
-        time.sleep(3)
-        page.wait_for_function(
-            "() => !window.location.href.includes('loginuserpass.php')",
-            timeout=30000
-        )
-        print(">> Login erfolgreich")
-        
-        if create_screenshots:
-            page.screenshot(path="base_01_nach_login.png")
+        login_with_saved_session(page, username, password, reuse_session and own_browser, create_screenshots)
+        laps.lap("login")
         
         # ========================================
         # SCHRITT 2: GISA easyBANF
         # ========================================
         print("\n>> SCHRITT 2: GISA easyBANF klicken")
-        page.wait_for_load_state("networkidle", timeout=15000)
-        time.sleep(2)  # Reduziert von 3 auf 2
+        wait_for_ui5_idle(page, "navigation")
         
         gisa_element = page.locator("text=GISA easyBANF")
         gisa_element.wait_for(state="visible", timeout=10000)
         gisa_element.click()
         print(">> GISA easyBANF geklickt")
         
-        time.sleep(2)  # Reduziert von 4 auf 2
-        page.wait_for_load_state("networkidle", timeout=15000)
+        wait_for_ui5_idle(page, "navigation")
+        laps.lap("easybanf")
         
         if create_screenshots:
             page.screenshot(path="base_02_warenkorb.png")
@@ -278,134 +628,15 @@ def navigate_to_artikel_page(username, password, browser=None, page=None, create
         neuer_artikel_element.click()
         print(">> 'Neuer Artikel' geklickt")
         
-        time.sleep(2)  # Reduziert von 4 auf 2
-        page.wait_for_load_state("networkidle", timeout=15000)
+        wait_for_ui5_idle(page, "navigation")
+        laps.lap("neuer_artikel")
         
         if create_screenshots:
             page.screenshot(path="base_03_nach_neuer_artikel.png")
         
-        # ========================================
-        # SCHRITT 4: NEUE POSITION ANLEGEN
-        # ========================================
-        print("\n>> SCHRITT 4: 'Neue Position anlegen' suchen und klicken")
-        
-        position_selectors = [
-            "text=Neue Position anlegen",
-            "*:has-text('Neue Position anlegen')",
-            "button:has-text('Neue Position anlegen')",
-            "a:has-text('Neue Position anlegen')",
-            "*[title*='Neue Position anlegen']"
-        ]
-        
-        position_element = None
-        for selector in position_selectors:
-            try:
-                elements = page.locator(selector)
-                if elements.count() > 0:
-                    position_element = elements.first
-                    print(f">> 'Neue Position anlegen' gefunden mit: {selector}")
-                    break
-            except:
-                continue
-        
-        if not position_element:
-            print(">> 'Neue Position anlegen' nicht gefunden!")
-            return False, browser, page
-        
-        position_element.click()
-        print(">> 'Neue Position anlegen' geklickt")
-        
-        time.sleep(2)  # Reduziert von 4 auf 2
-        page.wait_for_load_state("networkidle", timeout=15000)
-        
-        if create_screenshots:
-            page.screenshot(path="base_04_nach_neue_position.png")
-        
-        # ========================================
-        # SCHRITT 5: FREITEXT AUSWÄHLEN
-        # ========================================
-        print("\n>> SCHRITT 5: 'Freitext' auswaehlen")
-        
-        # Erst direkt nach Freitext-Elementen suchen
-        freitext_selectors = [
-            "text=Freitext",
-            "*:has-text('Freitext')",
-            "option:has-text('Freitext')",
-            "button:has-text('Freitext')",
-            "a:has-text('Freitext')"
-        ]
-        
-        freitext_element = None
-        for selector in freitext_selectors:
-            try:
-                elements = page.locator(selector)
-                if elements.count() > 0:
-                    freitext_element = elements.first
-                    print(f">> 'Freitext' gefunden mit: {selector}")
-                    break
-            except:
-                continue
-        
-        # Falls nicht direkt gefunden, in Dropdowns suchen
-        if not freitext_element:
-            print(">> Suche 'Freitext' in Dropdown-Menues...")
-            
-            selects = page.locator("select")
-            select_count = selects.count()
-            
-            for i in range(select_count):
-                try:
-                    select_element = selects.nth(i)
-                    options = select_element.locator("option")
-                    option_count = options.count()
-                    
-                    for j in range(option_count):
-                        try:
-                            option_text = options.nth(j).inner_text().strip()
-                            
-                            if "freitext" in option_text.lower():
-                                print(f">> FREITEXT GEFUNDEN in Dropdown! Waehle: '{option_text}'")
-                                select_element.select_option(index=j)
-                                freitext_element = "found_in_dropdown"
-                                time.sleep(2)  # Reduziert von 3 auf 2
-                                break
-                        except:
-                            continue
-                    
-                    if freitext_element:
-                        break
-                        
-                except:
-                    continue
-        
-        # Normales Element klicken falls gefunden
-        if freitext_element and freitext_element != "found_in_dropdown":
-            freitext_element.click()
-            print(">> 'Freitext' geklickt")
-            time.sleep(2)  # Reduziert von 3 auf 2
-        elif freitext_element == "found_in_dropdown":
-            print(">> 'Freitext' aus Dropdown ausgewaehlt")
-        else:
-            print(">> 'Freitext' nicht gefunden!")
+        if not open_freitext_position(page, create_screenshots):
             return False, browser, page
         
-        # ========================================
-        # SCHRITT 6: ARTIKEL-SEITE ERREICHT
-        # ========================================
-        print("\n>> SCHRITT 6: Artikel-Eingabe-Seite erreicht!")
-        
-        time.sleep(2)  # Reduziert von 4 auf 2
-        page.wait_for_load_state("networkidle", timeout=15000)
-        
-        if create_screenshots:
-            page.screenshot(path="base_05_artikelseite.png")
-        
-        # Seiteninformationen
-        current_url = page.url
-        current_title = page.title()
-        print(f">> Aktuelle Seite: {current_title}")
-        print(f">> URL: {current_url}")
-        
         return True, browser, page
         
     except Exception as e:
@@ -420,6 +651,43 @@ def navigate_to_artikel_page(username, password, browser=None, page=None, create
         
         return False, browser, page
 
+def ensure_artikel_page(username, password, page, create_screenshots=False):
+    """
+    Bringt eine bestehende Seite auf die Artikel-Eingabe-Seite
+    
+    Bereits erledigte Schritte werden übersprungen:
+    - leere Artikel-Ansicht offen: nichts zu tun
+    - Warenkorb offen ("Neue Position anlegen" sichtbar): nur Schritte 4-6
+    - sonst vollständige Navigation (Login entfällt bei gültiger Sitzung)
+    
+    Args:
+        username (str): HSA-Benutzername
+        password (str): HSA-Passwort
+        page: Playwright page object (z.B. aus dem Browser-Daemon)
+        create_screenshots (bool): Screenshots erstellen
+    
+    Returns:
+        bool: True wenn die Artikel-Eingabe-Seite erreicht wurde
+    """
+    try:
+        if discover_item_view(page) is not None:
+            probe_id = get_session(page).item_view_id(ITEM_VIEW_PROBE_SUFFIX)
+            if page.evaluate(EMPTY_FIELD_JS, probe_id):
+                print(">> Artikel-Eingabe-Seite bereits geöffnet - Navigation übersprungen")
+                return True
+        
+        neue_position = page.locator("text=Neue Position anlegen")
+        if neue_position.count() > 0 and neue_position.first.is_visible():
+            print(">> Warenkorb bereits geöffnet - nur neue Freitext-Position anlegen")
+            return open_freitext_position(page, create_screenshots)
+    except Exception as e:
+        print(f">> Zustand der Seite nicht erkannt ({e}) - vollständige Navigation")
+    
+    success, _, _ = navigate_to_artikel_page(
+        username, password, page.context.browser, page, create_screenshots
+    )
+    return success
+
 def analyze_form_fields(page, verbose=True):
     """
     Analysiert alle Formularfelder auf der aktuellen Seite
@@ -540,14 +808,22 @@ def close_browser_safely(browser):
     """
     Schließt Browser sicher
     
+    Die Kontexte werden zuerst einzeln geschlossen, damit eine laufende
+    HAR-Aufzeichnung (--record-har) geschrieben wird. Danach wird die
+    Playwright-Instanz des Browsers beendet.
+    
     Args:
         browser: Playwright browser object
     """
     try:
+        for context in list(browser.contexts):
+            context.close()
         browser.close()
         print("🔚 Browser geschlossen")
     except:
         print(">> Browser bereits geschlossen")
+    finally:
+        stop_playwright(browser)
 
 # Beispiel-Daten für Tests
 EXAMPLE_FORM_DATA = {
@@ -568,6 +844,7 @@ if __name__ == "__main__":
     print("Diese Datei ist zum Importieren gedacht, nicht zur direkten Ausführung.")
     print("\nVerfügbare Funktionen:")
     print("- get_credentials(): Anmeldedaten verwalten")
+    print("- sap_login(): Am SAP-Portal anmelden")
     print("- navigate_to_artikel_page(): Zur Artikel-Seite navigieren")
     print("- analyze_form_fields(): Formularfelder analysieren")
     print("- fill_field_by_criteria(): Einzelnes Feld ausfüllen")
@@ -0,0 +1,260 @@
+"""
+browser_daemon.py - Vorgewärmter Browser für schnelle Starts
+============================================================
+
+Jeder Aufruf von autoBANF.py startet sonst einen neuen Chromium, meldet
+sich an und klickt sich bis zur Artikel-Eingabe-Seite durch. Der Daemon
+hält stattdessen einen angemeldeten Browser auf der Artikel-Seite bereit:
+
+    python autoBANF.py --daemon          (eigenes Konsolenfenster, Strg+C beendet)
+
+Solange er läuft, verbindet sich autoBANF.py über CDP
+(connect_over_cdp) mit diesem Browser, führt den Import aus und gibt ihn
+danach wieder frei. Der Zustand steht in .temp/browser_daemon.json; eine
+Sperrdatei verhindert, dass zwei Importe gleichzeitig dieselbe Seite nutzen.
+
+Verwendung:
+    from lib.browser_daemon import open_artikel_page, hand_back_browser
+"""
+
+import json
+import os
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from playwright.sync_api import sync_playwright
+from .network_filter import get_network_filter
+from .browser_metrics import process_alive
+from .launch_profiles import get_launch_profile
+from .autobanf_base import (
+    SecureCredentials,
+    load_saved_session,
+    save_session,
+    navigate_to_artikel_page,
+    ensure_artikel_page,
+    close_browser_safely,
+    register_playwright,
+    stop_playwright
+)
+
+DAEMON_STATE_FILE = Path(".temp") / "browser_daemon.json"
+DAEMON_LOCK_FILE = Path(".temp") / "browser_daemon.lock"
+
+# Port für das Chrome DevTools Protocol (nur lokal erreichbar)
+DAEMON_PORT = 9222
+
+# Prüfintervall des Daemons in Sekunden
+DAEMON_POLL_SECONDS = 5
+
+def _cdp_reachable(cdp_url):
+    """Prüft, ob der Browser unter der CDP-Adresse antwortet"""
+    try:
+        with urllib.request.urlopen(f"{cdp_url}/json/version", timeout=2) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+def read_daemon_state():
+    """
+    Liest den Zustand eines laufenden Daemons
+
+    Returns:
+        dict: pid, port, cdp_url, started - oder None, wenn kein Daemon erreichbar ist
+    """
+    try:
+        with open(DAEMON_STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if not process_alive(state.get("pid", -1)) or not _cdp_reachable(state.get("cdp_url", "")):
+        return None
+    return state
+
+def _acquire_lock():
+    """Belegt den Daemon für diesen Prozess (False, wenn ein anderer Import ihn nutzt)"""
+    DAEMON_LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(DAEMON_LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            with os.fdopen(fd, 'w') as f:
+                f.write(str(os.getpid()))
+            return True
+        except FileExistsError:
+            try:
+                owner = int(DAEMON_LOCK_FILE.read_text().strip() or -1)
+            except (OSError, ValueError):
+                owner = -1
+            if owner != -1 and process_alive(owner):
+                return False
+            # Verwaiste Sperre eines abgebrochenen Imports
+            try:
+                DAEMON_LOCK_FILE.unlink()
+            except OSError:
+                return False
+    return False
+
+def _release_lock():
+    """Gibt die Sperre frei"""
+    try:
+        DAEMON_LOCK_FILE.unlink()
+    except OSError:
+        pass
+
+def attach_to_daemon():
+    """
+    Verbindet sich über CDP mit dem laufenden Daemon-Browser
+
+    Returns:
+        tuple: (browser, page) oder (None, None), wenn kein freier Daemon läuft
+    """
+    state = read_daemon_state()
+    if state is None:
+        return None, None
+    if not _acquire_lock():
+        print(">> Browser-Daemon wird gerade von einem anderen Import genutzt - starte eigenen Browser")
+        return None, None
+
+    playwright = None
+    browser = None
+    try:
+        playwright = sync_playwright().start()
+        browser = playwright.chromium.connect_over_cdp(state["cdp_url"])
+        context = browser.contexts[0] if browser.contexts else browser.new_context()
+        # Routen laufen im verbundenen Prozess - der Daemon selbst wartet nur
+        get_network_filter().attach(context)
+        page = context.pages[0] if context.pages else context.new_page()
+        register_playwright(browser, playwright)
+        print(f">> Mit Browser-Daemon verbunden ({state['cdp_url']})")
+        return browser, page
+    except Exception as e:
+        print(f">> Verbindung zum Browser-Daemon fehlgeschlagen: {e}")
+        # Playwright beenden, sonst scheitert der eigene Browserstart danach
+        if browser is not None:
+            try:
+                browser.close()
+            except Exception:
+                pass
+        if playwright is not None:
+            playwright.stop()
+        _release_lock()
+        return None, None
+
+def release_daemon(browser):
+    """
+    Gibt den Daemon-Browser nach dem Import zurück
+
+    Trennt nur die CDP-Verbindung; der Browser und seine Seite bleiben offen.
+    """
+    try:
+        browser.close()
+        print(">> Browser-Daemon freigegeben")
+    except Exception:
+        pass
+    finally:
+        stop_playwright(browser)
+        _release_lock()
+
+def open_artikel_page(username, password, reuse_session=True, use_daemon=True):
+    """
+    Liefert eine Seite auf der Artikel-Eingabe - bevorzugt aus dem Daemon
+
+    Läuft ein freier Daemon, werden nur die noch fehlenden Schritte
+    ausgeführt (ensure_artikel_page). Sonst wird wie bisher ein eigener
+    Browser gestartet.
+
+    Returns:
+        tuple: (success, browser, page, attached)
+    """
+    if use_daemon:
+        browser, page = attach_to_daemon()
+        if browser is not None:
+            if ensure_artikel_page(username, password, page):
+                return True, browser, page, True
+            release_daemon(browser)
+            return False, None, None, False
+
+    success, browser, page = navigate_to_artikel_page(
+        username, password, create_screenshots=False, reuse_session=reuse_session
+    )
+    if not success:
+        # Eigenen Browser samt Playwright schließen, damit ein späterer Versuch starten kann
+        if browser is not None:
+            close_browser_safely(browser)
+        return False, None, None, False
+    return success, browser, page, False
+
+def hand_back_browser(browser, attached):
+    """Gibt den Daemon-Browser frei bzw. schließt den eigenen Browser"""
+    if attached:
+        release_daemon(browser)
+    else:
+        close_browser_safely(browser)
+
+def run_daemon(port=DAEMON_PORT, headless=None, reuse_session=True):
+    """
+    Startet den Browser, navigiert zur Artikel-Seite und hält ihn offen
+
+    Läuft, bis der Browser geschlossen oder Strg+C gedrückt wird.
+
+    Args:
+        port (int): Port für das Chrome DevTools Protocol
+        headless (bool): Browser im Hintergrund ausführen (Standard: aus dem Startprofil)
+        reuse_session (bool): Gespeicherte Sitzung aus .credentials/ wiederverwenden
+    """
+    if read_daemon_state() is not None:
+        print(f">> Browser-Daemon läuft bereits (siehe {DAEMON_STATE_FILE})")
+        return
+
+    username, password = SecureCredentials().get_credentials_interactive()
+    if not username or not password:
+        print("ABBRUCH: Keine gültigen Anmeldedaten erhalten")
+        return
+
+    # Argumente und Fenstergröße aus dem Startprofil; kein Cache-Verzeichnis,
+    # der Daemon bleibt ohnehin geladen
+    profile = get_launch_profile()
+    if headless is None:
+        headless = profile.headless
+    playwright = sync_playwright().start()
+    browser = playwright.chromium.launch(
+        headless=headless,
+        args=profile.args + [f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"]
+    )
+    context = browser.new_context(
+        viewport=profile.viewport,
+        storage_state=load_saved_session(reuse_session)
+    )
+    page = context.new_page()
+
+    try:
+        success, browser, page = navigate_to_artikel_page(
+            username, password, browser, page, create_screenshots=False
+        )
+        if not success:
+            print(">> Browser-Daemon: Artikel-Seite nicht erreicht")
+            return
+        if reuse_session:
+            save_session(page)
+
+        state = {
+            "pid": os.getpid(),
+            "port": port,
+            "cdp_url": f"http://127.0.0.1:{port}",
+            "started": datetime.now().isoformat(timespec="seconds")
+        }
+        DAEMON_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        DAEMON_STATE_FILE.write_text(json.dumps(state, indent=2), encoding='utf-8')
+        print(f"\n>> Browser-Daemon bereit auf {state['cdp_url']} - Strg+C zum Beenden")
+
+        while browser.is_connected():
+            time.sleep(DAEMON_POLL_SECONDS)
+    except KeyboardInterrupt:
+        print("\n>> Browser-Daemon wird beendet")
+    finally:
+        try:
+            DAEMON_STATE_FILE.unlink()
+        except OSError:
+            pass
+        close_browser_safely(browser)
+        playwright.stop()
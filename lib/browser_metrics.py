@@ -0,0 +1,250 @@
+"""
+browser_metrics.py - Speicherverbrauch der Chromium-Prozesse
+============================================================
+
+Playwright startet Chromium als Kindprozesse (Browser, Renderer, GPU, ...)
+des eigenen Python-Prozesses. chromium_memory_bytes() summiert den
+Arbeitsspeicher (RSS bzw. Working Set) aller dieser Prozesse; der
+MemorySampler fragt ihn im Hintergrund regelmäßig ab und merkt sich den
+Höchstwert. Gemeinsam genutzter Speicher wird dabei mehrfach gezählt - der
+Wert ist eine obere Schranke, für Vergleiche zwischen Läufen aber stabil.
+
+Ohne zusätzliche Pakete: unter Windows über die Toolhelp-/PSAPI-Funktionen
+(ctypes), unter Linux über /proc. Auf anderen Systemen liefern die
+Funktionen None.
+
+Verwendung:
+    from lib.browser_metrics import MemorySampler
+    with MemorySampler() as sampler:
+        ...
+    print(sampler.peak_bytes)
+"""
+
+import os
+import threading
+
+# Prozessnamen, die als Chromium gezählt werden
+CHROMIUM_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+# Abfrageintervall des MemorySamplers in Sekunden
+SAMPLE_INTERVAL_SECONDS = 0.5
+
+def _windows_processes():
+    """Liefert (pid, ppid, name) aller Prozesse über CreateToolhelp32Snapshot"""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ProcessID", wintypes.DWORD),
+            ("th32DefaultHeapID", ctypes.c_void_p),
+            ("th32ModuleID", wintypes.DWORD),
+            ("cntThreads", wintypes.DWORD),
+            ("th32ParentProcessID", wintypes.DWORD),
+            ("pcPriClassBase", ctypes.c_long),
+            ("dwFlags", wintypes.DWORD),
+            ("szExeFile", ctypes.c_wchar * 260),
+        ]
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    snapshot = kernel32.CreateToolhelp32Snapshot(0x00000002, 0)  # TH32CS_SNAPPROCESS
+    if snapshot in (None, wintypes.HANDLE(-1).value):
+        return []
+    processes = []
+    entry = PROCESSENTRY32W()
+    entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+    try:
+        success = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while success:
+            processes.append((entry.th32ProcessID, entry.th32ParentProcessID, entry.szExeFile.lower()))
+            success = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snapshot)
+    return processes
+
+def _windows_memory(pid):
+    """Working Set eines Prozesses in Bytes (Windows)"""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    # PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_VM_READ
+    handle = kernel32.OpenProcess(0x1000 | 0x0010, False, pid)
+    if not handle:
+        return 0
+    try:
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+        if kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return 0
+    finally:
+        kernel32.CloseHandle(handle)
+
+def _linux_processes():
+    """Liefert (pid, ppid, name) aller Prozesse aus /proc"""
+    processes = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Format: pid (name) state ppid ... - der Name kann Leerzeichen enthalten
+        name = stat[stat.find("(") + 1:stat.rfind(")")]
+        fields = stat[stat.rfind(")") + 2:].split()
+        processes.append((int(entry), int(fields[1]), name.lower()))
+    return processes
+
+def _linux_memory(pid):
+    """Resident Set Size eines Prozesses in Bytes (Linux)"""
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def _platform_functions():
+    """Prozessliste und Speicherabfrage für das laufende System (oder None)"""
+    if os.name == "nt":
+        return _windows_processes, _windows_memory
+    if os.path.isdir("/proc"):
+        return _linux_processes, _linux_memory
+    return None
+
+def process_alive(pid):
+    """Prüft, ob ein Prozess mit dieser PID noch läuft"""
+    if os.name == "nt":
+        import ctypes
+        # PROCESS_QUERY_LIMITED_INFORMATION
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def chromium_processes(root_pid=None):
+    """
+    PIDs aller Chromium-Prozesse unterhalb eines Prozesses
+
+    Args:
+        root_pid (int): Wurzel des Prozessbaums (Standard: dieser Python-Prozess)
+
+    Returns:
+        list: PIDs oder None, wenn das System nicht unterstützt wird
+    """
+    functions = _platform_functions()
+    if functions is None:
+        return None
+    list_processes, _ = functions
+    root_pid = root_pid or os.getpid()
+
+    children = {}
+    names = {}
+    for pid, ppid, name in list_processes():
+        children.setdefault(ppid, []).append(pid)
+        names[pid] = name
+
+    found = []
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        if any(marker in names.get(pid, "") for marker in CHROMIUM_PROCESS_NAMES):
+            found.append(pid)
+        stack.extend(children.get(pid, []))
+    return found
+
+def chromium_memory_bytes(root_pid=None):
+    """
+    Summe des Arbeitsspeichers aller Chromium-Prozesse
+
+    Returns:
+        int: Bytes oder None, wenn das System nicht unterstützt wird
+    """
+    functions = _platform_functions()
+    pids = chromium_processes(root_pid)
+    if functions is None or pids is None:
+        return None
+    _, memory = functions
+    return sum(memory(pid) for pid in pids)
+
+class MemorySampler:
+    """Misst den Chromium-Speicher im Hintergrund und merkt sich den Höchstwert"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL_SECONDS, root_pid=None):
+        self.interval = interval
+        self.root_pid = root_pid
+        self.peak_bytes = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        """Einmal messen und den Höchstwert aktualisieren"""
+        try:
+            current = chromium_memory_bytes(self.root_pid)
+        except Exception:
+            current = None
+        if current is not None and (self.peak_bytes is None or current > self.peak_bytes):
+            self.peak_bytes = current
+        return current
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        """Startet die Messung im Hintergrund-Thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Beendet die Messung (mit einer letzten Messung)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sample()
+        return self.peak_bytes
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+def format_megabytes(value):
+    """Bytes als "123 MB" (bzw. "n/a")"""
+    return "n/a" if value is None else f"{value / (1024 * 1024):.0f} MB"
@@ -0,0 +1,220 @@
+"""
+category_catalog.py - Lokaler Katalog der easyBANF-Kategorien
+=============================================================
+
+Der Kategorie-Baum ändert sich selten. Mit "python autoBANF.py
+--crawl-categories" wird er einmal vollständig aufgeklappt und mit allen
+Paaren Hauptkategorie->Unterkategorie samt Position im Baum in
+category_catalog.json gespeichert (versioniertes JSON).
+
+Mit dem Katalog wird die Spalte "Kategorie" schon vor dem Browserstart
+geprüft. Abweichungen bei Leerzeichen, Groß-/Kleinschreibung oder Umlauten
+werden auf den Katalogeintrag korrigiert, alle anderen Kategorien - auch
+Tippfehler mit genau einem ähnlichen Eintrag - mit Vorschlägen gemeldet.
+Die Kategorieauswahl nutzt die gespeicherten Positionen direkt, ohne den
+Baum zur Laufzeit zu durchsuchen.
+
+Verwendung:
+    from lib.category_catalog import get_category_catalog, apply_category_catalog
+"""
+
+import difflib
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+
+CATALOG_FILE = Path("category_catalog.json")
+CATALOG_VERSION = 1
+
+# Trenner zwischen Haupt- und Unterkategorie in der Excel-Spalte
+CATEGORY_SEPARATOR = "->"
+
+UMLAUT_MAP = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+def normalize_category(text):
+    """
+    Vergleichsschlüssel für Kategorienamen
+
+    Groß-/Kleinschreibung, mehrfache Leerzeichen und Umlaut-Schreibweisen
+    (ä/ae, ö/oe, ü/ue, ß/ss) spielen keine Rolle.
+    """
+    text = str(text).casefold().translate(UMLAUT_MAP)
+    return re.sub(r"\s+", " ", text).strip()
+
+def split_category(value):
+    """
+    Teilt einen Wert der Spalte "Kategorie" in Haupt- und Unterkategorie
+
+    Returns:
+        tuple: (Hauptkategorie, Unterkategorie oder None)
+    """
+    main, _, sub = str(value).partition(CATEGORY_SEPARATOR)
+    return main.strip(), (sub.strip() or None)
+
+class CategoryCatalog:
+    """Alle bekannten Kategorien mit ihrer Position im Baum"""
+
+    def __init__(self, entries, created=None):
+        self.entries = entries
+        self.created = created
+        self._by_key = {}
+        for entry in entries:
+            key = (normalize_category(entry["main"]),
+                   normalize_category(entry["sub"]) if entry.get("sub") else None)
+            self._by_key.setdefault(key, entry)
+
+    @classmethod
+    def from_index(cls, index):
+        """Erstellt den Katalog aus einem Kategorie-Verzeichnis (build_category_index)"""
+        entries = [
+            {"main": main, "sub": sub, "path": list(entry["path"])}
+            for (main, sub), entry in index.items()
+        ]
+        return cls(entries, created=datetime.now().isoformat(timespec="seconds"))
+
+    @classmethod
+    def load(cls, path=CATALOG_FILE):
+        """Lädt den Katalog oder gibt None zurück (fehlt, unlesbar oder andere Version)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if data.get("version") != CATALOG_VERSION:
+            print(f">> WARNUNG: {path} hat Version {data.get('version')}, erwartet {CATALOG_VERSION} "
+                  f"- bitte neu erstellen")
+            return None
+        return cls(data.get("categories", []), created=data.get("created"))
+
+    def save(self, path=CATALOG_FILE):
+        """Schreibt den Katalog als versioniertes JSON"""
+        path = Path(path)
+        data = {
+            "version": CATALOG_VERSION,
+            "created": self.created,
+            "categories": self.entries
+        }
+        tmp_file = path.with_name(path.name + ".tmp")
+        tmp_file.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+        tmp_file.replace(path)
+
+    def lookup(self, main, sub):
+        """Katalogeintrag zu Haupt-/Unterkategorie (tolerant) oder None"""
+        key = (normalize_category(main), normalize_category(sub) if sub else None)
+        return self._by_key.get(key)
+
+    def path_for(self, main, sub):
+        """Position [Haupt, Unter] im Kategorie-Baum oder None"""
+        entry = self.lookup(main, sub)
+        return entry["path"] if entry else None
+
+    def suggestions(self, main, sub, limit=3):
+        """Ähnlich geschriebene Katalogeinträge als "Haupt->Unter"-Texte"""
+        labels = {}
+        for entry in self.entries:
+            label = entry["main"] + (f"{CATEGORY_SEPARATOR}{entry['sub']}" if entry.get("sub") else "")
+            labels.setdefault(normalize_category(label), label)
+        wanted = normalize_category(main + (f"{CATEGORY_SEPARATOR}{sub}" if sub else ""))
+        matches = difflib.get_close_matches(wanted, list(labels), n=limit, cutoff=0.8)
+        return [labels[match] for match in matches]
+
+    def resolve(self, value):
+        """
+        Prüft einen Wert der Spalte "Kategorie" gegen den Katalog
+
+        Übernommen wird nur ein Eintrag, der nach normalize_category exakt
+        passt. Ähnliche Einträge sind nur Vorschläge - ein automatisch
+        "korrigierter" Tippfehler könnte eine falsche Kategorie bestellen.
+
+        Returns:
+            tuple: (korrigierter Wert oder None, Vorschläge)
+        """
+        main, sub = split_category(value)
+        entry = self.lookup(main, sub)
+        if entry is None:
+            return None, self.suggestions(main, sub)
+        if entry.get("sub"):
+            return f"{entry['main']}{CATEGORY_SEPARATOR}{entry['sub']}", []
+        return entry["main"], []
+
+_catalog = None
+_catalog_loaded = False
+_catalog_lock = threading.Lock()
+
+def get_category_catalog():
+    """Liefert den Katalog des Prozesses (None, wenn keiner vorhanden ist)"""
+    global _catalog, _catalog_loaded
+    with _catalog_lock:
+        if not _catalog_loaded:
+            _catalog = CategoryCatalog.load()
+            _catalog_loaded = True
+        return _catalog
+
+def set_category_catalog(catalog):
+    """Ersetzt den Katalog des Prozesses (z.B. nach einem neuen Crawl)"""
+    global _catalog, _catalog_loaded
+    with _catalog_lock:
+        _catalog = catalog
+        _catalog_loaded = True
+
+def apply_category_catalog(df, column='Kategorie'):
+    """
+    Prüft und korrigiert die Kategorie-Spalte vor dem Browserstart
+
+    Ohne Katalog bleibt die Tabelle unverändert. Korrigierte Schreibweisen
+    werden direkt in df übernommen.
+
+    Args:
+        df (DataFrame): Artikel-Zeilen
+        column (str): Name der Kategorie-Spalte
+
+    Returns:
+        bool: False, wenn Kategorien nicht im Katalog gefunden wurden
+    """
+    catalog = get_category_catalog()
+    if catalog is None or column not in df.columns:
+        return True
+
+    print(f">> Kategorien gegen {CATALOG_FILE} prüfen ({len(catalog.entries)} Einträge)")
+    unknown = []
+    for index, value in df[column].items():
+        if value is None or value != value or not str(value).strip():
+            continue
+        resolved, suggestions = catalog.resolve(value)
+        if resolved is None:
+            unknown.append((index, value, suggestions))
+        elif resolved != str(value).strip():
+            print(f"   Zeile {index + 2}: '{value}' -> '{resolved}'")
+            df.at[index, column] = resolved
+
+    for index, value, suggestions in unknown:
+        hint = f" (meinten Sie: {', '.join(suggestions)})" if suggestions else ""
+        print(f"   FEHLER Zeile {index + 2}: Kategorie '{value}' nicht im Katalog{hint}")
+    if unknown:
+        print(">> Katalog veraltet? Neu erstellen mit: python autoBANF.py --crawl-categories")
+    return not unknown
+
+def catalog_checked_rows(rows, column='Kategorie'):
+    """
+    Prüft die Kategorie zeilenweise gegen den Katalog (für gestreamte Zeilen)
+
+    Korrigierte Schreibweisen werden übernommen, unbekannte Kategorien nur
+    gemeldet - die Auswahl versucht es dann über die Oberfläche.
+
+    Yields:
+        tuple: (index, row) wie übergeben
+    """
+    catalog = get_category_catalog()
+    for index, row in rows:
+        value = row.get(column)
+        if catalog is not None and value is not None and value == value and str(value).strip():
+            resolved, suggestions = catalog.resolve(value)
+            if resolved is None:
+                hint = f" (meinten Sie: {', '.join(suggestions)})" if suggestions else ""
+                print(f"   WARNUNG Zeile {index + 2}: Kategorie '{value}' nicht im Katalog{hint}")
+            elif resolved != str(value).strip():
+                print(f"   Zeile {index + 2}: '{value}' -> '{resolved}'")
+                row[column] = resolved
+        yield index, row
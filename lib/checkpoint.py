@@ -0,0 +1,137 @@
+"""
+checkpoint.py - Journal für unterbrochene Importe
+=================================================
+
+Bricht ein Import mittendrin ab (VPN getrennt, SAP-Timeout, neue Position
+nicht anlegbar), musste bisher wieder bei Zeile 1 begonnen werden. Das
+Journal hält je Excel-Datei in .temp/journal/ fest, welche Artikel bereits
+eingetragen ("entered") und mit "Bearbeitung abschließen" in den Warenkorb
+übernommen ("transferred") wurden:
+
+    {"event": "start", "workbook": "...", "resume": false, "time": "..."}
+    {"event": "transferred", "row": 12, "hash": "3f2a...", "time": "..."}
+
+Die Datei wird nur ergänzt. Ein Lauf ohne --resume beginnt einen neuen
+Warenkorb; mit --resume zählen alle Einträge seit dem letzten solchen
+Start. Schlüssel ist ein Hash über die aufbereiteten Feldwerte - in der
+Excel-Datei geänderte Zeilen werden dadurch erkannt und neu eingetragen;
+mehrfach vorkommende gleiche Zeilen werden mitgezählt.
+
+Verwendung:
+    from lib.checkpoint import ImportJournal
+    journal = ImportJournal(excel_filename, resume=True)
+    for record in journal.pending(records): ...
+"""
+
+import hashlib
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+JOURNAL_DIR = Path(".temp") / "journal"
+
+STATE_ENTERED = "entered"
+STATE_TRANSFERRED = "transferred"
+
+def record_hash(record):
+    """Inhalts-Hash eines ArticleRecords (unabhängig von der Zeilennummer)"""
+    payload = json.dumps(record.as_dict(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def journal_path(workbook):
+    """Journal-Datei zu einer Excel-Datei (ein Journal je absolutem Pfad)"""
+    workbook = Path(workbook).resolve()
+    digest = hashlib.sha1(str(workbook).lower().encode("utf-8")).hexdigest()[:8]
+    return JOURNAL_DIR / f"{workbook.stem}_{digest}.jsonl"
+
+class ImportJournal:
+    """Zustand der Artikel eines Warenkorbs, fortgeschrieben als JSONL"""
+
+    def __init__(self, workbook, resume=False):
+        self.path = journal_path(workbook)
+        self.transferred = Counter()   # hash -> Anzahl übernommener Artikel
+        self.entered = set()           # eingetragen, aber (noch) nicht übernommen
+        self.row_hashes = {}           # Zeile -> Hash des zuletzt eingetragenen Inhalts
+        self.skipped = 0
+
+        if resume:
+            if self._load():
+                done = sum(self.transferred.values())
+                print(f">> Fortsetzen: {done} Artikel laut Journal bereits im Warenkorb ({self.path})")
+            else:
+                print(">> Fortsetzen: kein Journal gefunden - Import beginnt bei der ersten Zeile")
+
+        # Beim Fortsetzen zu überspringende Artikel
+        self._remaining = Counter(self.transferred)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._append({"event": "start", "workbook": str(Path(workbook).resolve()), "resume": resume})
+
+    def _load(self):
+        """Liest die Einträge seit dem letzten neuen Warenkorb"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return False
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # unvollständige letzte Zeile nach Absturz
+            event = entry.get("event")
+            if event == "start" and not entry.get("resume"):
+                self.transferred.clear()
+                self.entered.clear()
+                self.row_hashes.clear()
+            elif event in (STATE_ENTERED, STATE_TRANSFERRED):
+                self._apply(event, entry["row"], entry["hash"])
+        return True
+
+    def _apply(self, state, row, digest):
+        """Übernimmt einen Zustandswechsel in den Speicher"""
+        if state == STATE_TRANSFERRED:
+            self.transferred[digest] += 1
+            self.entered.discard(digest)
+        else:
+            self.entered.add(digest)
+        self.row_hashes[row] = digest
+
+    def _append(self, entry):
+        """Hängt einen Eintrag an und schreibt ihn sofort auf die Platte"""
+        entry["time"] = datetime.now().isoformat(timespec="seconds")
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(self, record, state):
+        """Hält den Zustand eines Artikels fest (STATE_ENTERED / STATE_TRANSFERRED)"""
+        digest = record_hash(record)
+        self._apply(state, record.index, digest)
+        self._append({"event": state, "row": record.index, "hash": digest})
+
+    def pending(self, records):
+        """
+        Überspringt bereits übernommene Artikel
+
+        Yields:
+            ArticleRecord: noch einzutragende Artikel
+        """
+        for record in records:
+            digest = record_hash(record)
+            if self._remaining[digest] > 0:
+                self._remaining[digest] -= 1
+                self.skipped += 1
+                continue
+
+            excel_row = record.index + 2
+            previous = self.row_hashes.get(record.index)
+            if previous is not None and previous != digest:
+                print(f">> Zeile {excel_row} wurde seit dem letzten Lauf geändert - wird neu eingetragen "
+                      f"(alte Position im Warenkorb prüfen)")
+            elif digest in self.entered:
+                print(f">> Zeile {excel_row} war eingetragen, aber nicht abgeschlossen - wird neu eingetragen")
+            yield record
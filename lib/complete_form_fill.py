@@ -3,8 +3,10 @@
 complete_form_fill.py - Vollständiges Ausfüllen aller gewünschten Felder
 """
 
-import time
 import json
+from .ui5_wait import wait_for_ui5_idle, settle_after_miss
+from .session import click_item_view_element, get_session, FIELD_LOOKUP_TIMEOUT_MS
+from .category_catalog import CategoryCatalog, get_category_catalog
 from .autobanf_base import (
     navigate_to_artikel_page, 
     close_browser_safely,
@@ -18,7 +20,10 @@ DROPDOWN_CONFIG = {
         "options": {
             "Keine Steuer": "text=Keine Steuer",
             "Drittland (ohne VSt-Abz)": "text=Drittland (ohne VSt-Abz)",
-            "kein separater Steuerabzug": "text=kein separater Steuerabzug"
+            "kein separater Steuerabzug": "text=kein separater Steuerabzug",
+            "EU-Ausland (19% ohne VST-abzug)": "text=EU-Ausland (19% ohne VST-abzug)",
+            "Voller Steuersatz (19 %)": "text=Voller Steuersatz (19 %)",
+            "Gemäßigter Steuersatz (7%)": "text=Gemäßigter Steuersatz (7%)"
         }
     },
     "Preisart": {
@@ -52,23 +57,358 @@ DROPDOWN_CONFIG = {
     }
 }
 
+# Textfelder: Suffix der Element-ID hinter "__componentNN---idCatItemView--"
+TEXT_FIELD_SELECTORS = {
+    "Artikelbeschreibung": "MaterialText-inner",
+    "Laufzeit": "idDRGeneralTerms-inner",
+    "Lange Artikelbeschreibung": "idCFControl-GENERAL-ARTIKELLANG-generated-inner",
+    "Angebotsreferenz": "idCFControl-GENERAL-ANGEBOTSREFERENZ-generated-inner", 
+    "Angebotsdatum": "idCFControl-GENERAL-ANGEBOTSDATUM-generated-inner",
+    "Kontierungsobjekt": "[id*='input'][id*='clone'][id$='-inner']"
+}
+
+# Numerische Felder: Suffix der Element-ID
+NUMERIC_FIELD_SELECTORS = {
+    "Preis je Mengeneinheit": "Price-inner",
+    "Rabattwert": "DiscountValue-inner",
+    "Bestellmenge": "idQuantityStepInput-input-inner"
+}
+
+# Artikel-Formular: Excel-Spalte -> Formularfeld, in der Reihenfolge der Eingabe
+ARTICLE_FIELDS = [
+    {"nr": 1, "column": "Artikelbeschreibung", "field": "Artikelbeschreibung",
+     "type": "text", "title": "ARTIKELBESCHREIBUNG ausfüllen"},
+    {"nr": 2, "column": "Steuerkennzeichen", "field": "Steuerkennzeichen",
+     "type": "dropdown", "title": "STEUERKENNZEICHEN auswählen"},
+    {"nr": 3, "column": "Preisart", "field": "Preisart",
+     "type": "dropdown", "title": "PREISART auswählen"},
+    {"nr": 4, "column": "Preis_je_Mengeneinheit", "field": "Preis je Mengeneinheit",
+     "type": "numeric", "title": "PREIS JE MENGENEINHEIT eingeben"},
+    {"nr": 5, "column": "Waehrung", "field": "Waehrung",
+     "type": "dropdown", "title": "WÄHRUNG auswählen"},
+    {"nr": 6, "column": "Rabatttyp", "field": "Rabatttyp",
+     "type": "dropdown", "title": "RABATTTYP auswählen"},
+    {"nr": 7, "column": "Rabattwert", "field": "Rabattwert",
+     "type": "numeric", "title": "RABATTWERT eingeben"},
+    {"nr": 8, "column": "Laufzeit", "field": "Laufzeit",
+     "type": "text", "title": "LAUFZEIT eingeben"},
+    {"nr": 9, "column": "Bestellmenge", "field": "Bestellmenge",
+     "type": "numeric", "title": "BESTELLMENGE eingeben"},
+    {"nr": 10, "column": "Einheit", "field": "Einheit",
+     "type": "combobox", "title": "EINHEIT auswählen"},
+    {"nr": 11, "column": "Lange_Artikelbeschreibung", "field": "Lange Artikelbeschreibung",
+     "type": "text", "title": "LANGE ARTIKELBESCHREIBUNG eingeben"},
+    {"nr": 12, "column": "Angebotsreferenz", "field": "Angebotsreferenz",
+     "type": "text", "title": "ANGEBOTSREFERENZ eingeben"},
+    {"nr": 13, "column": "Angebotsdatum", "field": "Angebotsdatum",
+     "type": "text", "title": "ANGEBOTSDATUM eingeben"},
+    {"nr": 14, "column": "Kontierungsobjekttyp", "field": "Kontierungsobjekttyp",
+     "type": "dropdown", "title": "KONTIERUNGSOBJEKTTYP auswählen"},
+    {"nr": 15, "column": "Kontierungsobjekt", "field": "Kontierungsobjekt",
+     "type": "text", "title": "KONTIERUNGSOBJEKT eingeben"},
+]
+
+# Kategorie + 15 Felder + "Bearbeitung abschließen"
+TOTAL_ARTICLE_FIELDS = 16
+
+# Selektoren für "Bearbeitung abschließen" in der Reihenfolge der Versuche
+TRANSFER_SELECTORS = [
+    "[id*='idButtonTransfer']",
+    "[id$='--idButtonTransfer']",
+    "button:has-text('Bearbeitung abschließen')",
+    "text=Bearbeitung abschließen",
+    "[id*='BDI-content']:has-text('Bearbeitung abschließen')"
+]
+
+# Prüft ob ein Dialog (z.B. Kategorie-Auswahl) sichtbar ist
+DIALOG_OPEN_JS = '''() => {
+    const dialogs = document.querySelectorAll('[role="dialog"], .sapMDialog');
+    return Array.from(dialogs).some(d => d.offsetHeight > 0);
+}'''
+
+# Kategorie-Baum im CategorySelPopover
+CATEGORY_TREE_MARKER = "CategorySelPopover--idCategoryTree"
+
+# Klappt eine Hauptkategorie im Kategorie-Baum auf (Argument: Hauptkategorie).
+# Durchsucht nur die Baumeinträge des Kategorie-Popovers, nicht das ganze DOM.
+EXPAND_MAIN_CATEGORY_JS = '''(mainCategory) => {
+    const items = document.querySelectorAll(
+        '[id*="CategorySelPopover"] [role="treeitem"], [id*="CategorySelPopover"][role="treeitem"]'
+    );
+    const expandSelectors = [
+        'button:first-child',
+        'span:first-child',
+        '[class*="expand"]:first-child',
+        '[class*="arrow"]:first-child',
+        '[class*="toggle"]:first-child'
+    ];
+    
+    for (const item of items) {
+        const content = item.querySelector('.sapMLIBContent') || item;
+        const text = content.textContent?.trim();
+        if (!(text === mainCategory || (text && text.includes(mainCategory) && text.length < 100))) {
+            continue;
+        }
+        if (item.getAttribute('aria-expanded') === 'true') {
+            return false;
+        }
+        for (const selector of expandSelectors) {
+            const expandBtn = item.querySelector(selector);
+            if (expandBtn && expandBtn !== content) {
+                try {
+                    expandBtn.click();
+                    return true;
+                } catch (e) {}
+            }
+        }
+    }
+    return false;
+}'''
+
+# Wählt eine Unterkategorie im SAP CategorySelPopover aus (Argument: Unterkategorie)
+CLICK_SUBCATEGORY_JS = '''(subcategory) => {
+    const categoryTreeItems = document.querySelectorAll('[id*="CategorySelPopover--idCategoryTree"][role="treeitem"]');
+    
+    for (let item of categoryTreeItems) {
+        const contentDiv = item.querySelector('.sapMLIBContent');
+        const itemText = contentDiv ? contentDiv.textContent?.trim() : '';
+        if (itemText !== subcategory) continue;
+        
+        const rect = item.getBoundingClientRect();
+        const isVisible = rect.width > 0 && rect.height > 0;
+        const isInPopover = item.closest('[id*="CategorySelPopover"]');
+        if (!isVisible || !isInPopover) continue;
+        
+        // Klick-Strategien in optimierter Reihenfolge
+        
+        // 1. Focus + Enter (SAP-typisch)
+        try {
+            item.focus();
+            item.dispatchEvent(new KeyboardEvent('keydown', {
+                key: 'Enter',
+                code: 'Enter',
+                which: 13,
+                keyCode: 13,
+                bubbles: true
+            }));
+            return true;
+        } catch (e1) {}
+        
+        // 2. Auf Content Div klicken
+        try {
+            contentDiv.click();
+            return true;
+        } catch (e2) {}
+        
+        // 3. MouseEvent auf Tree Item
+        try {
+            item.dispatchEvent(new MouseEvent('click', {
+                bubbles: true,
+                cancelable: true,
+                view: window,
+                clientX: rect.left + rect.width/2,
+                clientY: rect.top + rect.height/2
+            }));
+            return true;
+        } catch (e3) {}
+        
+        // 4. Direkter Tree Item Klick
+        try {
+            item.click();
+            return true;
+        } catch (e4) {}
+    }
+    return false;
+}'''
+
+# Klappt den Kategorie-Baum bis zur angegebenen Ebene auf (Argument: [Marker, Ebene])
+EXPAND_CATEGORY_TREE_JS = '''([marker, level]) => {
+    const treeEl = document.querySelector("[id$='" + marker + "']");
+    const core = (window.sap && sap.ui && sap.ui.getCore) ? sap.ui.getCore() : null;
+    const tree = treeEl && core ? core.byId(treeEl.id) : null;
+    if (!tree || !tree.expandToLevel) return false;
+    tree.expandToLevel(level);
+    return true;
+}'''
+
+# Liest alle Einträge des Kategorie-Baums in Anzeigereihenfolge (Argument: Marker).
+# Rückgabe: Liste von {id, title, level} mit level 0 = Hauptkategorie
+READ_CATEGORY_TREE_JS = '''(marker) => {
+    const treeEl = document.querySelector("[id$='" + marker + "']");
+    if (!treeEl) return [];
+    const core = (window.sap && sap.ui && sap.ui.getCore) ? sap.ui.getCore() : null;
+    const tree = core ? core.byId(treeEl.id) : null;
+    
+    if (tree && tree.getItems) {
+        return tree.getItems().map(item => ({
+            id: item.getId(),
+            title: (item.getTitle ? item.getTitle() : '') ||
+                   (item.getDomRef() ? item.getDomRef().textContent.trim() : ''),
+            level: item.getLevel ? item.getLevel() : 0
+        }));
+    }
+    
+    // Ohne UI5-API: gerenderte Baumeinträge auswerten
+    return Array.from(treeEl.querySelectorAll('[role="treeitem"]')).map(item => {
+        const content = item.querySelector('.sapMLIBContent');
+        return {
+            id: item.id,
+            title: (content || item).textContent.trim(),
+            level: Math.max(0, parseInt(item.getAttribute('aria-level') || '1', 10) - 1)
+        };
+    });
+}'''
+
+# Wählt einen Baumeintrag über seine Position aus dem Kategorie-Katalog aus
+# (Argument: [Marker, [Position Haupt, Position Unter], Titel])
+CLICK_CATEGORY_PATH_JS = '''([marker, path, title]) => {
+    const treeEl = document.querySelector("[id$='" + marker + "']");
+    const core = (window.sap && sap.ui && sap.ui.getCore) ? sap.ui.getCore() : null;
+    const tree = treeEl && core ? core.byId(treeEl.id) : null;
+    if (!tree || !tree.getItems) return false;
+    
+    let mainPos = -1, subPos = -1, target = null;
+    for (const item of tree.getItems()) {
+        const level = item.getLevel ? item.getLevel() : 0;
+        if (level === 0) {
+            mainPos++;
+            subPos = -1;
+            if (path.length === 1 && mainPos === path[0]) { target = item; break; }
+        } else if (level === 1 && mainPos === path[0]) {
+            subPos++;
+            if (subPos === path[1]) { target = item; break; }
+        }
+    }
+    const dom = target ? target.getDomRef() : null;
+    if (!dom) return false;
+    const content = dom.querySelector('.sapMLIBContent') || dom;
+    if (content.textContent.trim() !== title) return false;
+    
+    dom.focus();
+    dom.dispatchEvent(new KeyboardEvent('keydown', {
+        key: 'Enter',
+        code: 'Enter',
+        which: 13,
+        keyCode: 13,
+        bubbles: true
+    }));
+    return true;
+}'''
+
+# Wählt einen Baumeintrag direkt über seine ID aus (Argument: {id, title})
+CLICK_CATEGORY_ITEM_JS = '''({id, title}) => {
+    const item = document.getElementById(id);
+    if (!item) return false;
+    const content = item.querySelector('.sapMLIBContent') || item;
+    if (content.textContent.trim() !== title) return false;
+    const rect = item.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) return false;
+    
+    item.focus();
+    item.dispatchEvent(new KeyboardEvent('keydown', {
+        key: 'Enter',
+        code: 'Enter',
+        which: 13,
+        keyCode: 13,
+        bubbles: true
+    }));
+    return true;
+}'''
+
+# ComboBox der Einheit (Eingabefeld und Dropdown-Pfeil)
+UNIT_COMBOBOX_SUFFIX = "idCBPOUnit-inner"
+UNIT_ARROW_SUFFIX = "idCBPOUnit-arrow"
+
+# Einheiten der ComboBox (wie im Blatt "Dropdown_Werte" der Vorlage)
+KNOWN_UNITS = [
+    "G g",
+    "H Stunde",
+    "KG kg",
+    "L l",
+    "LE LeistEinh.",
+    "ST Stück",
+    "PAU Pauschal"
+]
+
+# Setzt mehrere Feldwerte über die UI5-Control-API in einem Aufruf.
+# Argument: Liste von {field, type, selector, value}
+# Rückgabe: {field: true/false}
+BATCH_FILL_JS = '''(items) => {
+    const result = {};
+    const core = (window.sap && sap.ui && sap.ui.getCore) ? sap.ui.getCore() : null;
+
+    const controlFor = (el) => {
+        // Von der DOM-ID (ggf. ohne "-inner") zum Control, sonst DOM aufwärts
+        for (let node = el; node; node = node.parentElement) {
+            if (!node.id) continue;
+            const control = core.byId(node.id) || core.byId(node.id.replace(/-inner$/, ''));
+            if (control) return control;
+        }
+        return null;
+    };
+
+    const findItem = (control, value) => control.getItems().find(item => {
+        const text = item.getText ? item.getText() : '';
+        const key = item.getKey ? item.getKey() : '';
+        return text === value || key === value || (key + ' ' + text) === value;
+    });
+
+    const setValue = (control, value) => {
+        if (control.isA('sap.m.Select')) {
+            const item = findItem(control, value);
+            if (!item) return false;
+            control.setSelectedItem(item);
+            control.fireChange({ selectedItem: item });
+            return control.getSelectedItem() === item;
+        }
+        if (control.isA('sap.m.ComboBoxBase')) {
+            const item = findItem(control, value);
+            if (!item) return false;
+            control.setSelectedItem(item);
+            if (control.fireSelectionChange) control.fireSelectionChange({ selectedItem: item });
+            control.fireChange({ value: control.getValue() });
+            return control.getSelectedItem() === item;
+        }
+        if (control.setValue) {
+            control.setValue(value);
+            control.fireChange({ value: value, newValue: value, valid: true });
+            return true;
+        }
+        return false;
+    };
+
+    for (const item of items) {
+        try {
+            const el = core && document.querySelector(item.selector);
+            const control = el && controlFor(el);
+            let ok = !!control && setValue(control, item.value);
+            if (ok && control.getValueState && control.getValueState() === 'Error') ok = false;
+            result[item.field] = ok;
+        } catch (e) {
+            result[item.field] = false;
+        }
+    }
+    return result;
+}'''
+
+def required_steps(row_data):
+    """
+    Anzahl der Schritte, die für eine Zeile gelingen müssen
+    (Kategorie, alle belegten Felder, "Bearbeitung abschließen")
+    """
+    kategorie = row_data.get('Kategorie')
+    steps = 1 if kategorie and '->' in kategorie else 0
+    steps += sum(1 for field_spec in ARTICLE_FIELDS if row_data.get(field_spec["column"]) is not None)
+    return steps + 1
+
 def fill_text_field(page, field_name, value):
     """Füllt ein Textfeld aus"""
     try:
-        field_selectors = {
-            "Artikelbeschreibung": "MaterialText-inner",
-            "Laufzeit": "idDRGeneralTerms-inner",
-            "Lange Artikelbeschreibung": "idCFControl-GENERAL-ARTIKELLANG-generated-inner",
-            "Angebotsreferenz": "idCFControl-GENERAL-ANGEBOTSREFERENZ-generated-inner", 
-            "Angebotsdatum": "idCFControl-GENERAL-ANGEBOTSDATUM-generated-inner",
-            "Kontierungsobjekt": "[id*='input'][id*='clone'][id$='-inner']"
-        }
-        
-        if field_name not in field_selectors:
+        if field_name not in TEXT_FIELD_SELECTORS:
             print(f"   FEHLER: Unbekanntes Textfeld '{field_name}'")
             return False
         
-        field_suffix = field_selectors[field_name]
+        field_suffix = TEXT_FIELD_SELECTORS[field_name]
         
         # Spezielle Behandlung für Kontierungsobjekt
         if field_name == "Kontierungsobjekt":
@@ -77,7 +417,7 @@ def fill_text_field(page, field_name, value):
                 if element.count() > 0:
                     element.click()
                     element.fill('')
-                    time.sleep(0.1)
+                    wait_for_ui5_idle(page, "field")
                     element.fill(str(value))
                     element.press('Tab')
                     print(f"   OK {field_name} '{value}' erfolgreich")
@@ -85,21 +425,15 @@ def fill_text_field(page, field_name, value):
             except:
                 pass
         else:
-            # Verschiedene Component-IDs probieren
-            for component_id in ["11", "12", "13"]:
-                try:
-                    field_id = f"__component{component_id}---idCatItemView--{field_suffix}"
-                    element = page.locator(f"#{field_id}")
-                    if element.count() > 0:
-                        element.click()
-                        element.fill('')
-                        time.sleep(0.1)
-                        element.fill(str(value))
-                        element.press('Tab')
-                        print(f"   OK {field_name} '{value}' erfolgreich")
-                        return True
-                except:
-                    continue
+            # Feld über das gecachte Komponenten-Präfix ansprechen
+            element = click_item_view_element(page, field_suffix)
+            if element is not None:
+                element.fill('')
+                wait_for_ui5_idle(page, "field")
+                element.fill(str(value))
+                element.press('Tab')
+                print(f"   OK {field_name} '{value}' erfolgreich")
+                return True
         
         print(f"   FEHLER: {field_name}-Feld nicht gefunden")
         return False
@@ -111,33 +445,21 @@ def fill_text_field(page, field_name, value):
 def fill_numeric_field(page, field_name, value):
     """Füllt ein numerisches Feld aus"""
     try:
-        field_selectors = {
-            "Preis je Mengeneinheit": "Price-inner",
-            "Rabattwert": "DiscountValue-inner",
-            "Bestellmenge": "idQuantityStepInput-input-inner"
-        }
-        
-        if field_name not in field_selectors:
+        if field_name not in NUMERIC_FIELD_SELECTORS:
             print(f"   FEHLER: Unbekanntes numerisches Feld '{field_name}'")
             return False
         
-        field_suffix = field_selectors[field_name]
+        field_suffix = NUMERIC_FIELD_SELECTORS[field_name]
         
-        # Verschiedene Component-IDs probieren
-        for component_id in ["11", "12", "13"]:
-            try:
-                field_id = f"__component{component_id}---idCatItemView--{field_suffix}"
-                element = page.locator(f"#{field_id}")
-                if element.count() > 0:
-                    element.click()
-                    element.fill('')
-                    time.sleep(0.1)
-                    element.fill(str(value))
-                    element.press('Tab')
-                    print(f"   OK {field_name} '{value}' erfolgreich")
-                    return True
-            except:
-                continue
+        # Feld über das gecachte Komponenten-Präfix ansprechen
+        element = click_item_view_element(page, field_suffix)
+        if element is not None:
+            element.fill('')
+            wait_for_ui5_idle(page, "field")
+            element.fill(str(value))
+            element.press('Tab')
+            print(f"   OK {field_name} '{value}' erfolgreich")
+            return True
         
         print(f"   FEHLER: {field_name}-Feld nicht gefunden")
         return False
@@ -150,35 +472,32 @@ def select_combobox_option(page, option_text):
     """Spezielle Behandlung für Einheit-ComboBox"""
     try:
         # ComboBox-Eingabefeld anklicken
-        for component_id in ["11", "12", "13"]:
-            try:
-                combobox_id = f"__component{component_id}---idCatItemView--idCBPOUnit-inner"
-                combobox = page.locator(f"#{combobox_id}")
-                if combobox.count() > 0:
-                    combobox.click()
-                    time.sleep(0.5)
-                    
-                    # Dropdown-Pfeil klicken
-                    arrow_id = f"__component{component_id}---idCatItemView--idCBPOUnit-arrow"
-                    arrow = page.locator(f"#{arrow_id}")
-                    if arrow.count() > 0:
-                        arrow.click()
-                        time.sleep(1.5)
-                        
-                        # Option auswählen
-                        option = page.locator(f"text={option_text}")
-                        if option.count() > 0:
-                            option.first.click()
-                            print(f"   OK Einheit '{option_text}' erfolgreich")
-                            return True
-                        else:
-                            print(f"   FEHLER: Einheit-Option '{option_text}' nicht gefunden")
-                            return False
-            except:
-                continue
+        combobox = click_item_view_element(page, UNIT_COMBOBOX_SUFFIX)
+        if combobox is None:
+            print("   FEHLER: Einheit-ComboBox nicht gefunden")
+            return False
+        wait_for_ui5_idle(page, "dropdown")
         
-        print("   FEHLER: Einheit-ComboBox nicht gefunden")
-        return False
+        # Dropdown-Pfeil klicken
+        arrow_id = get_session(page).item_view_id(UNIT_ARROW_SUFFIX)
+        arrow = page.locator(f"[id='{arrow_id}']")
+        if arrow.count() == 0:
+            print("   FEHLER: Dropdown-Pfeil der Einheit nicht gefunden")
+            return False
+        arrow.click(timeout=FIELD_LOOKUP_TIMEOUT_MS)
+        wait_for_ui5_idle(page, "dropdown")
+        
+        # Option auswählen
+        option = page.locator(f"text={option_text}")
+        if option.count() == 0:
+            settle_after_miss("dropdown")
+        if option.count() > 0:
+            option.first.click()
+            print(f"   OK Einheit '{option_text}' erfolgreich")
+            return True
+        else:
+            print(f"   FEHLER: Einheit-Option '{option_text}' nicht gefunden")
+            return False
         
     except Exception as e:
         print(f"   FEHLER bei Einheit: {e}")
@@ -200,12 +519,14 @@ def select_dropdown_option(page, field_name, option_text):
             return False
         
         dropdown.first.click()
-        time.sleep(1.5)
+        wait_for_ui5_idle(page, "dropdown")
         
         # Option auswählen
         if option_text in config["options"]:
             option_selector = config["options"][option_text]
             option = page.locator(option_selector)
+            if option.count() == 0:
+                settle_after_miss("dropdown")
             
             if option.count() > 0:
                 option.first.click()
@@ -222,6 +543,223 @@ def select_dropdown_option(page, field_name, option_text):
         print(f"   FEHLER bei {field_name}: {e}")
         return False
 
+def fill_form_field(page, field_spec, value):
+    """
+    Füllt ein Feld des Artikel-Formulars passend zu seinem Typ aus
+    
+    Args:
+        page: Playwright page object
+        field_spec (dict): Eintrag aus ARTICLE_FIELDS
+        value (str): Einzutragender Wert (numerische Werte bereits in deutscher Notation)
+    
+    Returns:
+        bool: Erfolg der Operation
+    """
+    field_type = field_spec["type"]
+    if field_type == "text":
+        return fill_text_field(page, field_spec["field"], value)
+    if field_type == "numeric":
+        return fill_numeric_field(page, field_spec["field"], value)
+    if field_type == "dropdown":
+        return select_dropdown_option(page, field_spec["field"], value)
+    if field_type == "combobox":
+        return select_combobox_option(page, value)
+    print(f"   FEHLER: Unbekannter Feldtyp '{field_type}'")
+    return False
+
+def control_selector(field_spec):
+    """Liefert den CSS-Selektor, über den ein Formularfeld im DOM gefunden wird"""
+    field_type = field_spec["type"]
+    field_name = field_spec["field"]
+    if field_type == "dropdown":
+        return DROPDOWN_CONFIG[field_name]["selector"]
+    if field_type == "combobox":
+        suffix = UNIT_COMBOBOX_SUFFIX
+    elif field_type == "numeric":
+        suffix = NUMERIC_FIELD_SELECTORS[field_name]
+    else:
+        suffix = TEXT_FIELD_SELECTORS[field_name]
+    if suffix.startswith("["):
+        return suffix
+    return f"[id$='---idCatItemView--{suffix}']"
+
+def build_batch_items(field_values):
+    """
+    Bereitet die Feldwerte eines Artikels für BATCH_FILL_JS vor
+    
+    Dropdown-Werte, die nicht in DROPDOWN_CONFIG stehen, werden nicht
+    übergeben - sie laufen über den Einzelfeld-Pfad und dessen Fehlermeldung.
+    
+    Args:
+        field_values (list): Paare (field_spec, value)
+    
+    Returns:
+        list: Einträge {field, type, selector, value}
+    """
+    items = []
+    for field_spec, value in field_values:
+        if field_spec["type"] == "dropdown" and value not in DROPDOWN_CONFIG[field_spec["field"]]["options"]:
+            continue
+        items.append({
+            "field": field_spec["field"],
+            "type": field_spec["type"],
+            "selector": control_selector(field_spec),
+            "value": value
+        })
+    return items
+
+def batch_fill_article_fields(page, field_values):
+    """
+    Füllt alle Felder eines Artikels in einem einzigen page.evaluate aus
+    
+    Die Werte werden über sap.ui.getCore().byId(...) gesetzt
+    (setValue/setSelectedItem + change-Event).
+    
+    Args:
+        page: Playwright page object
+        field_values (list): Paare (field_spec, value)
+    
+    Returns:
+        dict: Feldname -> Erfolg (fehlende Felder gelten als nicht gesetzt)
+    """
+    items = build_batch_items(field_values)
+    if not items:
+        return {}
+    try:
+        result = page.evaluate(BATCH_FILL_JS, items)
+    except Exception as e:
+        print(f"   WARNUNG: Batch-Ausfüllen fehlgeschlagen: {e}")
+        return {}
+    wait_for_ui5_idle(page, "field")
+    return result
+
+def build_category_index(items):
+    """
+    Baut aus den Baumeinträgen ein Nachschlage-Verzeichnis der Kategorien
+    
+    Args:
+        items (list): Einträge {id, title, level} in Anzeigereihenfolge
+    
+    Returns:
+        dict: (Hauptkategorie, Unterkategorie oder None) ->
+              {"id": Element-ID, "path": [Position Haupt, Position Unter]}
+    """
+    index = {}
+    main_title = None
+    main_pos = -1
+    sub_pos = -1
+    for item in items:
+        title = (item.get("title") or "").strip()
+        if not title:
+            continue
+        if item.get("level", 0) == 0:
+            main_pos += 1
+            sub_pos = -1
+            main_title = title
+            index.setdefault((title, None), {"id": item["id"], "path": [main_pos]})
+        elif main_title is not None:
+            sub_pos += 1
+            index.setdefault((main_title, title), {"id": item["id"], "path": [main_pos, sub_pos]})
+    return index
+
+def index_category_tree(page):
+    """
+    Klappt den geöffneten Kategorie-Baum auf und speichert sein Verzeichnis in der Sitzung
+    
+    Returns:
+        dict: Kategorie-Verzeichnis (leer, wenn der Baum nicht lesbar ist)
+    """
+    session = get_session(page)
+    try:
+        if page.evaluate(EXPAND_CATEGORY_TREE_JS, [CATEGORY_TREE_MARKER, 1]):
+            wait_for_ui5_idle(page, "category")
+        items = page.evaluate(READ_CATEGORY_TREE_JS, CATEGORY_TREE_MARKER)
+    except Exception:
+        items = []
+    session.category_index = build_category_index(items)
+    return session.category_index
+
+def crawl_category_catalog(page):
+    """
+    Öffnet den Kategorie-Dialog, liest den ganzen Baum und erstellt daraus den Katalog
+    
+    Args:
+        page: Playwright page object auf der Artikel-Seite
+    
+    Returns:
+        CategoryCatalog oder None, wenn der Baum nicht gelesen werden konnte
+    """
+    if not page.evaluate(DIALOG_OPEN_JS):
+        kategorie_button = page.locator("text=Kategorie auswählen")
+        if kategorie_button.count() == 0:
+            print(">> FEHLER: Kategorie-Button nicht gefunden")
+            return None
+        kategorie_button.first.click()
+        wait_for_ui5_idle(page, "dialog")
+    
+    index = index_category_tree(page)
+    page.keyboard.press("Escape")
+    wait_for_ui5_idle(page, "dialog")
+    if not index:
+        print(">> FEHLER: Kategorie-Baum konnte nicht gelesen werden")
+        return None
+    return CategoryCatalog.from_index(index)
+
+def select_category_from_catalog(page, main_category, subcategory):
+    """
+    Wählt eine Kategorie über ihre Position aus dem lokalen Katalog aus
+    
+    Returns:
+        bool: True wenn der Baumeintrag angeklickt wurde
+    """
+    catalog = get_category_catalog()
+    path = catalog.path_for(main_category, subcategory) if catalog else None
+    if path is None:
+        return False
+    try:
+        page.evaluate(EXPAND_CATEGORY_TREE_JS, [CATEGORY_TREE_MARKER, 1])
+        title = subcategory or main_category
+        if page.evaluate(CLICK_CATEGORY_PATH_JS, [CATEGORY_TREE_MARKER, path, title]):
+            wait_for_ui5_idle(page, "category")
+            return True
+    except Exception:
+        pass
+    return False
+
+def select_category_from_index(page, main_category, subcategory):
+    """
+    Wählt eine Kategorie im geöffneten Dialog ohne Textsuche aus
+    
+    Zuerst über die Position aus dem lokalen Katalog, sonst über das
+    Sitzungs-Verzeichnis. Das Verzeichnis wird beim ersten Bedarf einer
+    Sitzung aufgebaut. Fehlt der Eintrag oder passt die gespeicherte ID nicht
+    mehr, wird es einmal neu erstellt.
+    
+    Returns:
+        bool: True wenn der Baumeintrag angeklickt wurde
+    """
+    if select_category_from_catalog(page, main_category, subcategory):
+        return True
+    
+    session = get_session(page)
+    key = (main_category, subcategory or None)
+    for rebuilt in (False, True):
+        if rebuilt or session.category_index is None:
+            index_category_tree(page)
+        entry = session.category_index.get(key)
+        if entry is None:
+            continue
+        try:
+            # Einträge sind nur nach dem Aufklappen gerendert
+            page.evaluate(EXPAND_CATEGORY_TREE_JS, [CATEGORY_TREE_MARKER, 1])
+            title = subcategory or main_category
+            if page.evaluate(CLICK_CATEGORY_ITEM_JS, {"id": entry["id"], "title": title}):
+                wait_for_ui5_idle(page, "category")
+                return True
+        except Exception:
+            pass
+    return False
+
 def select_category_and_subcategory(page, main_category, subcategory):
     """
     Behandelt die komplexe Kategorie-Auswahl mit funktionierendem Playwright-Locator
@@ -237,50 +775,20 @@ def select_category_and_subcategory(page, main_category, subcategory):
             return False
         
         kategorie_button.click()
-        time.sleep(1.5)
+        wait_for_ui5_idle(page, "dialog")
         print("   Kategorie-Dialog geöffnet")
         
+        if select_category_from_index(page, main_category, subcategory):
+            print("   Kategorie über Sitzungs-Verzeichnis ausgewählt")
+            return True
+        
         # Hauptkategorie aufklappen (falls vorhanden)
         if subcategory:
-            expand_success = page.evaluate(f'''() => {{
-                const allElements = Array.from(document.querySelectorAll('*'));
-                const categoryElements = allElements.filter(el => {{
-                    const text = el.textContent?.trim();
-                    return text === '{main_category}' || 
-                           (text && text.includes('{main_category}') && text.length < 100);
-                }});
-                
-                for (let categoryEl of categoryElements) {{
-                    const parent = categoryEl.closest('[role="treeitem"], li, .sapMLIB');
-                    if (parent) {{
-                        const expandSelectors = [
-                            'button:first-child',
-                            'span:first-child',
-                            '[class*="expand"]:first-child',
-                            '[class*="arrow"]:first-child',
-                            '[class*="toggle"]:first-child'
-                        ];
-                        
-                        for (let selector of expandSelectors) {{
-                            const expandBtn = parent.querySelector(selector);
-                            if (expandBtn && expandBtn !== categoryEl) {{
-                                try {{
-                                    expandBtn.click();
-                                    console.log("Hauptkategorie aufgeklappt:", '{main_category}');
-                                    return true;
-                                }} catch (e) {{
-                                    console.log("Expand-Klick fehlgeschlagen:", e);
-                                }}
-                            }}
-                        }}
-                    }}
-                }}
-                return false;
-            }}''')
+            expand_success = page.evaluate(EXPAND_MAIN_CATEGORY_JS, main_category)
             
             if expand_success:
                 print(f"   Hauptkategorie '{main_category}' erfolgreich aufgeklappt")
-                time.sleep(1)
+                wait_for_ui5_idle(page, "category")
             else:
                 print(f"   WARNUNG: Hauptkategorie '{main_category}' konnte nicht aufgeklappt werden")
             
@@ -291,9 +799,8 @@ def select_category_and_subcategory(page, main_category, subcategory):
                     subcategory_locator.first.click()  # first() verwenden bei mehreren Elementen
                     print(f"   Unterkategorie '{subcategory}' mit Playwright-Locator ausgewählt")
                     
-                    # 3 Sekunden warten, damit die Auswahl effektiv wird
-                    time.sleep(1.5)
-                    print("   3 Sekunden Wartezeit für Kategorie-Auswahl abgeschlossen")
+                    # Warten bis die Auswahl effektiv wird
+                    wait_for_ui5_idle(page, "category")
                     
                     # Prüfen ob Dialog geschlossen wurde
                     dialog_open = page.evaluate('''() => {
@@ -320,7 +827,7 @@ def select_category_and_subcategory(page, main_category, subcategory):
             if main_locator.count() > 0:
                 main_locator.first.click()
                 print(f"   Hauptkategorie '{main_category}' ausgewählt")
-                time.sleep(1.5)
+                wait_for_ui5_idle(page, "category")
                 return True
             else:
                 print(f"   FEHLER: Hauptkategorie '{main_category}' nicht gefunden")
@@ -373,12 +880,12 @@ def complete_form_test():
         return
     
     try:
-        time.sleep(1)
+        wait_for_ui5_idle(page, "navigation")
         
         # 0. KATEGORIE AUSWÄHLEN
         print("\n0. KATEGORIE auswählen...")
         select_category_and_subcategory(page, "Bedarf Labore und Werkstätten", "Laborutensilien, Werkzeuge und Kleinteile")
-        time.sleep(1.5)  # 3 Sekunden warten, damit Kategorieauswahl effektiv wird
+        wait_for_ui5_idle(page, "category")
         
         # 1. ARTIKELBESCHREIBUNG
         print("\n1. ARTIKELBESCHREIBUNG ausfüllen...")
@@ -444,22 +951,14 @@ def complete_form_test():
         print("\n16. BEARBEITUNG ABSCHLIESSEN...")
         try:
             # Verschiedene Ansätze probieren
-            selectors_to_try = [
-                "[id*='idButtonTransfer']",
-                "[id$='--idButtonTransfer']",
-                "button:has-text('Bearbeitung abschließen')",
-                "text=Bearbeitung abschließen",
-                "[id*='BDI-content']:has-text('Bearbeitung abschließen')"
-            ]
-            
             button_found = False
-            for selector in selectors_to_try:
+            for selector in TRANSFER_SELECTORS:
                 try:
                     bearbeitung_button = page.locator(selector)
                     if bearbeitung_button.count() > 0:
                         bearbeitung_button.first.click()
                         print(f"   OK 'Bearbeitung abschließen' geklickt (Selector: {selector})")
-                        time.sleep(1.5)
+                        wait_for_ui5_idle(page, "transfer")
                         button_found = True
                         break
                 except:
@@ -489,7 +988,7 @@ def complete_form_test():
                 
                 if js_success:
                     print("   OK 'Bearbeitung abschließen' geklickt (JavaScript)")
-                    time.sleep(1.5)
+                    wait_for_ui5_idle(page, "transfer")
                 else:
                     print("   FEHLER: 'Bearbeitung abschließen' Button nicht gefunden")
                     
@@ -501,7 +1000,7 @@ def complete_form_test():
         print("\nScreenshot Artikel 1: complete_form_artikel1.png")
         
         print("\nARTIKEL 1 VOLLSTÄNDIG AUSGEFÜLLT UND ABGESCHLOSSEN!")
-        time.sleep(1.5)
+        wait_for_ui5_idle(page, "transfer")
         
         # =================================================================
         # ZWEITER ARTIKEL HINZUFÜGEN
@@ -516,7 +1015,7 @@ def complete_form_test():
             neue_position_button = page.locator("text=Neue Position anlegen")
             if neue_position_button.count() > 0:
                 neue_position_button.click()
-                time.sleep(1)
+                wait_for_ui5_idle(page, "position")
                 print("   OK 'Neue Position anlegen' geklickt")
             else:
                 print("   FEHLER: 'Neue Position anlegen' Button nicht gefunden")
@@ -530,14 +1029,14 @@ def complete_form_test():
         try:
             freitext_button = page.locator("text=Freitext").first
             freitext_button.click()
-            time.sleep(1.5)
+            wait_for_ui5_idle(page, "position")
             print("   OK 'Freitext' ausgewählt")
         except Exception as e:
             print(f"   FEHLER beim Auswählen von 'Freitext': {e}")
             return
         
         print("\n>> Artikel-Eingabe-Seite für zweiten Artikel erreicht!")
-        time.sleep(1)
+        wait_for_ui5_idle(page, "position")
         
         # =================================================================
         # ZWEITER ARTIKEL - FORMULAR AUSFÜLLEN
@@ -549,7 +1048,7 @@ def complete_form_test():
         # 0. KATEGORIE AUSWÄHLEN (gleiche wie beim ersten Artikel)
         print("\n0. KATEGORIE auswählen (Artikel 2)...")
         select_category_and_subcategory(page, "Bedarf Labore und Werkstätten", "Laborutensilien, Werkzeuge und Kleinteile")
-        time.sleep(1.5)
+        wait_for_ui5_idle(page, "category")
         
         # 1. ARTIKELBESCHREIBUNG (anderer Artikel zum Test)
         print("\n1. ARTIKELBESCHREIBUNG ausfüllen (Artikel 2)...")
@@ -601,22 +1100,14 @@ def complete_form_test():
         # 16. BEARBEITUNG ABSCHLIESSEN für zweiten Artikel
         print("\n16. BEARBEITUNG ABSCHLIESSEN (Artikel 2)...")
         try:
-            selectors_to_try = [
-                "[id*='idButtonTransfer']",
-                "[id$='--idButtonTransfer']",
-                "button:has-text('Bearbeitung abschließen')",
-                "text=Bearbeitung abschließen",
-                "[id*='BDI-content']:has-text('Bearbeitung abschließen')"
-            ]
-            
             button_found = False
-            for selector in selectors_to_try:
+            for selector in TRANSFER_SELECTORS:
                 try:
                     bearbeitung_button = page.locator(selector)
                     if bearbeitung_button.count() > 0:
                         bearbeitung_button.first.click()
                         print(f"   OK 'Bearbeitung abschließen' geklickt (Selector: {selector})")
-                        time.sleep(1.5)
+                        wait_for_ui5_idle(page, "transfer")
                         button_found = True
                         break
                 except:
@@ -645,7 +1136,7 @@ def complete_form_test():
                 
                 if js_success:
                     print("   OK 'Bearbeitung abschließen' geklickt (JavaScript)")
-                    time.sleep(1.5)
+                    wait_for_ui5_idle(page, "transfer")
                 else:
                     print("   FEHLER: 'Bearbeitung abschließen' Button nicht gefunden")
                     
@@ -661,7 +1152,7 @@ def complete_form_test():
         print("ARTIKEL 1: Diode 1N4007")
         print("ARTIKEL 2: Widerstand 220 Ohm")
         print("="*60)
-        time.sleep(2.5)
+        wait_for_ui5_idle(page, "default")
         
     except Exception as e:
         print(f"FEHLER: {e}")
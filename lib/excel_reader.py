@@ -0,0 +1,215 @@
+"""
+excel_reader.py - Einlesen und Aufbereiten der Excel-Artikellisten
+==================================================================
+
+Gemeinsam genutzt vom synchronen Import (autoBANF.py) und der
+asyncio-Engine (async_engine.py).
+
+Für sehr große Listen liest stream_article_rows() das Blatt zeilenweise
+(openpyxl read-only) in einem Hintergrund-Thread, sodass der erste Artikel
+schon eingetragen wird, während der Rest der Datei noch gelesen wird.
+
+Leere Zeilen (alle Artikel-Spalten leer) lassen beide Wege aus; der Index
+bleibt an die Blattzeile gebunden (Index 0 = Zeile 2 unter der Kopfzeile).
+
+expand_workbook_paths() löst Platzhalter wie "bestellungen\\*.xlsx" selbst
+auf, da die Windows-Eingabeaufforderung das nicht übernimmt.
+"""
+
+import glob
+import os
+import queue
+import threading
+import pandas as pd
+
+# Name des Tabellenblatts mit den Artikeln
+SHEET_NAME = 'Artikel_Import'
+
+# Spalten, die der Import verwendet (Kategorie + 15 Formularfelder)
+ARTICLE_COLUMNS = [
+    'Kategorie',
+    'Artikelbeschreibung',
+    'Steuerkennzeichen',
+    'Preisart',
+    'Preis_je_Mengeneinheit',
+    'Waehrung',
+    'Rabatttyp',
+    'Rabattwert',
+    'Laufzeit',
+    'Bestellmenge',
+    'Einheit',
+    'Lange_Artikelbeschreibung',
+    'Angebotsreferenz',
+    'Angebotsdatum',
+    'Kontierungsobjekttyp',
+    'Kontierungsobjekt'
+]
+
+# Spalten mit besonderer Formatierung (siehe article_records)
+NUMERIC_COLUMNS = ['Preis_je_Mengeneinheit', 'Rabattwert', 'Bestellmenge']
+DATE_COLUMNS = ['Angebotsdatum']
+RANGE_COLUMNS = ['Laufzeit']
+
+# Anzahl Zeilen, die der Lese-Thread im Voraus puffert
+PREFETCH_ROWS = 50
+
+_END_OF_SHEET = object()
+
+def _is_blank(value):
+    """Leere Zelle: None/NaN oder nur Leerzeichen"""
+    if isinstance(value, str):
+        return not value.strip()
+    return value is None or bool(pd.isna(value))
+
+def convert_to_german_number(value):
+    """
+    Konvertiert einen numerischen Wert zur deutschen Notation (Komma als Dezimaltrenner)
+    """
+    if pd.isna(value):
+        return ""
+
+    # Konvertiere zu String falls es ein numerischer Wert ist
+    str_value = str(value).strip()
+
+    # Wenn bereits ein Komma enthalten ist, lasse es so
+    if ',' in str_value:
+        return str_value
+
+    # Wenn es ein Punkt als Dezimaltrenner gibt, ersetze durch Komma
+    if '.' in str_value:
+        return str_value.replace('.', ',')
+
+    # Für ganze Zahlen: prüfe ob es als Dezimalzahl behandelt werden sollte
+    try:
+        num_value = float(str_value)
+        # Wenn es eine ganze Zahl ist, gebe sie ohne Dezimalstellen zurück
+        if num_value == int(num_value):
+            return str(int(num_value))
+        else:
+            # Konvertiere zu deutscher Notation mit Komma
+            return str(num_value).replace('.', ',')
+    except ValueError:
+        # Falls keine Zahl, gebe ursprünglichen Wert zurück
+        return str_value
+
+def expand_workbook_paths(patterns):
+    """
+    Löst Dateinamen und Platzhalter (*, ?, [..]) zu einer Liste von Excel-Dateien auf
+
+    Reihenfolge wie angegeben, je Platzhalter alphabetisch; doppelte Dateien
+    und Excel-Sperrdateien (~$...) werden ausgelassen. Nicht existierende
+    Dateien ohne Platzhalter bleiben erhalten, damit read_excel_file() sie meldet.
+
+    Returns:
+        list: Dateipfade
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                print(f">> WARNUNG: Keine Dateien zu '{pattern}' gefunden")
+        else:
+            matches = [pattern]
+        for path in matches:
+            key = os.path.normcase(os.path.abspath(path))
+            if os.path.basename(path).startswith("~$") or key in seen:
+                continue
+            seen.add(key)
+            paths.append(path)
+    return paths
+
+def read_excel_file(filename):
+    """
+    Liest Excel-Datei und gibt DataFrame zurück
+
+    Leere Zeilen werden entfernt, der Index der übrigen bleibt erhalten.
+    """
+    try:
+        print(f">> Excel-Datei einlesen: {filename}")
+        df = pd.read_excel(filename, sheet_name=SHEET_NAME)
+        columns = [column for column in ARTICLE_COLUMNS if column in df.columns]
+        blank = df[columns].apply(lambda column: column.map(_is_blank)).all(axis=1)
+        if blank.any():
+            print(f">> {int(blank.sum())} leere Zeile(n) übersprungen")
+            df = df[~blank]
+        print(f">> {len(df)} Artikel gefunden")
+        print(f">> Spalten: {list(df.columns)}")
+        return df
+    except FileNotFoundError:
+        print(f"FEHLER: Datei '{filename}' nicht gefunden!")
+        return None
+    except Exception as e:
+        print(f"FEHLER beim Lesen der Excel-Datei: {e}")
+        return None
+
+def _read_rows_into_queue(filename, row_queue):
+    """Lese-Thread: parst das Blatt zeilenweise und legt (index, row) in die Queue"""
+    from openpyxl import load_workbook
+
+    workbook = None
+    try:
+        workbook = load_workbook(filename, read_only=True, data_only=True)
+        sheet = workbook[SHEET_NAME]
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else None for cell in next(rows, ())]
+
+        positions = {column: header.index(column) for column in ARTICLE_COLUMNS if column in header}
+        missing = [column for column in ARTICLE_COLUMNS if column not in positions]
+        if missing:
+            print(f">> WARNUNG: Spalten fehlen im Blatt: {missing}")
+        last_position = max(positions.values(), default=-1)
+
+        # Index wie bei read_excel_file: auch leere Zeilen zählen mit
+        for index, values in enumerate(rows):
+            values = values[:last_position + 1]
+            row = {
+                column: values[position] if position < len(values) else None
+                for column, position in positions.items()
+            }
+            if all(_is_blank(value) for value in row.values()):
+                continue
+            row_queue.put((index, row))
+    except Exception as e:
+        row_queue.put(e)
+    finally:
+        if workbook is not None:
+            workbook.close()
+        row_queue.put(_END_OF_SHEET)
+
+def stream_article_rows(filename, prefetch=PREFETCH_ROWS):
+    """
+    Liest die Artikel-Zeilen als Generator, während die Datei noch geparst wird
+
+    Es werden nur die Spalten aus ARTICLE_COLUMNS übernommen. Leere Zellen
+    sind None, leere Zeilen werden übersprungen (der Index zählt sie mit).
+
+    Args:
+        filename (str): Pfad zur Excel-Datei
+        prefetch (int): Anzahl im Voraus gelesener Zeilen
+
+    Yields:
+        tuple: (index, row) mit row als dict Spalte -> Wert, wie df.iterrows()
+    """
+    print(f">> Excel-Datei streamen: {filename}")
+    row_queue = queue.Queue(maxsize=prefetch)
+    reader = threading.Thread(
+        target=_read_rows_into_queue,
+        args=(filename, row_queue),
+        name="autobanf-excel-reader",
+        daemon=True
+    )
+    reader.start()
+
+    while True:
+        item = row_queue.get()
+        if item is _END_OF_SHEET:
+            return
+        if isinstance(item, FileNotFoundError):
+            print(f"FEHLER: Datei '{filename}' nicht gefunden!")
+            continue
+        if isinstance(item, Exception):
+            print(f"FEHLER beim Lesen der Excel-Datei: {item}")
+            continue
+        yield item
@@ -0,0 +1,89 @@
+"""
+har_replay.py - Netzwerkverkehr aufzeichnen und offline wiedergeben
+===================================================================
+
+Zeitmessungen gegen das Produktivsystem schwanken mit der Last der
+SAP-Server und der VPN-Verbindung. Mit --record-har wird der gesamte
+Netzwerkverkehr eines echten Laufs als HAR-Datei gespeichert; --replay-har
+beantwortet alle Anfragen eines späteren Laufs aus dieser Datei (Playwright
+route_from_har) - ohne Netzwerk. Anfragen, die nicht in der Aufzeichnung
+stehen, werden abgebrochen statt ins Netz zu gehen. Unterschiede in den
+Zeiten stammen dann nur noch aus dem eigenen Code.
+
+Die Wiedergabe passt nur zum aufgezeichneten Ablauf: gleiche Excel-Datei,
+gleiche Anmeldedaten und ohne gespeicherte Sitzung bzw. Browser-Daemon
+(beides wird bei Aufzeichnung und Wiedergabe abgeschaltet).
+
+Endet der Pfad auf .zip, legt Playwright die Antwortinhalte als eigene
+Dateien im Archiv ab, sonst stehen sie eingebettet in der HAR-Datei.
+
+Verwendung:
+    python autoBANF.py artikel.xlsx --record-har
+    python autoBANF.py artikel.xlsx --replay-har .temp/har/session_20260101_120000.har.zip
+"""
+
+import threading
+from datetime import datetime
+from pathlib import Path
+
+HAR_DIR = Path(".temp") / "har"
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+# Nicht aufgezeichnete Anfragen bei der Wiedergabe: "abort" (offline) oder "fallback" (Netz)
+REPLAY_NOT_FOUND = "abort"
+
+_har_mode = None
+_har_path = None
+_har_lock = threading.Lock()
+
+def default_har_path():
+    """Pfad für eine neue Aufzeichnung: .temp/har/session_<Zeitstempel>.har.zip"""
+    return HAR_DIR / f"session_{datetime.now():%Y%m%d_%H%M%S}.har.zip"
+
+def set_har_mode(mode, path=None):
+    """
+    Schaltet Aufzeichnung oder Wiedergabe für alle neuen Browser-Kontexte ein
+
+    Args:
+        mode (str): MODE_RECORD, MODE_REPLAY oder None (aus)
+        path (str): HAR-Datei (bei Aufzeichnung optional)
+
+    Returns:
+        Path: verwendete HAR-Datei oder None
+    """
+    global _har_mode, _har_path
+    if mode not in (None, MODE_RECORD, MODE_REPLAY):
+        raise ValueError(f"Unbekannter HAR-Modus '{mode}'")
+    if mode == MODE_REPLAY and (path is None or not Path(path).exists()):
+        raise FileNotFoundError(f"HAR-Datei '{path}' nicht gefunden")
+    with _har_lock:
+        _har_mode = mode
+        if mode == MODE_RECORD:
+            _har_path = Path(path) if path else default_har_path()
+            _har_path.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            _har_path = Path(path) if path else None
+        return _har_path
+
+def get_har_mode():
+    """Aktueller Modus und Datei als (mode, path)"""
+    with _har_lock:
+        return _har_mode, _har_path
+
+def har_context_options():
+    """Zusätzliche Argumente für browser.new_context() (nur bei Aufzeichnung)"""
+    mode, path = get_har_mode()
+    if mode != MODE_RECORD:
+        return {}
+    return {"record_har_path": str(path), "record_har_mode": "full"}
+
+def apply_har_replay(context):
+    """Beantwortet alle Anfragen des Kontexts aus der HAR-Datei (nur bei Wiedergabe)"""
+    mode, path = get_har_mode()
+    if mode != MODE_REPLAY:
+        return False
+    context.route_from_har(str(path), not_found=REPLAY_NOT_FOUND)
+    print(f">> Wiedergabe aus {path} - kein Netzwerkzugriff")
+    return True
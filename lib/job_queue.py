@@ -0,0 +1,362 @@
+"""
+job_queue.py - Import-Aufträge in einer SQLite-Warteschlange
+============================================================
+
+Statt einzelner Läufe von autoBANF.py werden Excel-Dateien als Aufträge
+(Pfad + Optionen) in eine lokale SQLite-Datenbank eingestellt:
+
+    python autoBANF.py --submit bestellungen\\*.xlsx
+    python autoBANF.py --workers 4
+    python autoBANF.py --jobs
+
+Jeder Worker ist ein eigener Prozess mit eigenem Browser. Er holt sich
+einen Auftrag mit einer Frist (Lease) und verlängert sie, solange er daran
+arbeitet. Stürzt ein Worker ab, läuft die Frist ab und ein anderer Worker
+übernimmt den Auftrag - mit Fortsetzen über das Journal (checkpoint), bis
+MAX_ATTEMPTS erreicht ist.
+
+Tabellen:
+    jobs         Auftrag, Zustand (queued/running/done/failed), Worker,
+                 Lease, Zeiten, Fehler und Ergebnis (JSON)
+    row_results  Ergebnis und Dauer je Artikel-Zeile eines Auftrags
+
+Verwendung:
+    from lib.job_queue import JobQueue
+    queue = JobQueue()
+    queue.submit("templates/mouser.xlsx", {"batch_fill": True})
+    job = queue.claim("worker-1")
+"""
+
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+JOB_DB_FILE = Path(".temp") / "jobs.sqlite3"
+
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+# Frist eines Auftrags; der Worker verlängert sie alle LEASE_SECONDS / 3
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+
+# Wartezeit bei gesperrter Datenbank (andere Worker schreiben gerade)
+BUSY_TIMEOUT_SECONDS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    workbook    TEXT NOT NULL,
+    options     TEXT NOT NULL DEFAULT '{}',
+    state       TEXT NOT NULL DEFAULT 'queued',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    worker      TEXT,
+    lease_until REAL,
+    submitted   REAL NOT NULL,
+    started     REAL,
+    finished    REAL,
+    error       TEXT,
+    result      TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+CREATE TABLE IF NOT EXISTS row_results (
+    job_id      INTEGER NOT NULL REFERENCES jobs (id),
+    row         INTEGER NOT NULL,
+    article     TEXT,
+    success     INTEGER NOT NULL,
+    fields      INTEGER NOT NULL,
+    ok          INTEGER NOT NULL,
+    seconds     REAL NOT NULL,
+    finished    REAL NOT NULL,
+    PRIMARY KEY (job_id, row)
+);
+"""
+
+def worker_name(worker_nr=None):
+    """Eindeutiger Name eines Worker-Prozesses (Rechner, PID, Nummer)"""
+    suffix = f"-w{worker_nr}" if worker_nr is not None else ""
+    return f"{socket.gethostname()}-{os.getpid()}{suffix}"
+
+class JobQueue:
+    """Zugriff auf die Auftrags-Datenbank (eine Verbindung je Prozess bzw. Thread)"""
+
+    def __init__(self, path=JOB_DB_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: Transaktionen werden explizit mit BEGIN IMMEDIATE geführt
+        self._db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def _transaction(self):
+        """Schreibsperre sofort holen, damit zwei Worker nicht denselben Auftrag bekommen"""
+        return _Transaction(self._db)
+
+    def submit(self, workbook, options=None):
+        """
+        Stellt eine Excel-Datei als Auftrag ein
+
+        Returns:
+            int: Auftragsnummer
+        """
+        workbook = str(Path(workbook).resolve())
+        with self._transaction():
+            cursor = self._db.execute(
+                "INSERT INTO jobs (workbook, options, submitted) VALUES (?, ?, ?)",
+                (workbook, json.dumps(options or {}), time.time())
+            )
+        return cursor.lastrowid
+
+    def reclaim_expired(self, now=None):
+        """
+        Gibt Aufträge abgestürzter Worker (Lease abgelaufen) wieder frei
+
+        Returns:
+            int: Anzahl wieder eingestellter bzw. endgültig fehlgeschlagener Aufträge
+        """
+        now = time.time() if now is None else now
+        with self._transaction():
+            return self._reclaim(now)
+
+    def _reclaim(self, now):
+        requeued = self._db.execute(
+            "UPDATE jobs SET state = ?, worker = NULL, lease_until = NULL "
+            "WHERE state = ? AND lease_until < ? AND attempts < ?",
+            (STATE_QUEUED, STATE_RUNNING, now, MAX_ATTEMPTS)
+        ).rowcount
+        failed = self._db.execute(
+            "UPDATE jobs SET state = ?, finished = ?, lease_until = NULL, "
+            "error = 'Worker nicht mehr erreichbar (Lease abgelaufen)' "
+            "WHERE state = ? AND lease_until < ?",
+            (STATE_FAILED, now, STATE_RUNNING, now)
+        ).rowcount
+        return requeued + failed
+
+    def claim(self, worker, lease_seconds=LEASE_SECONDS):
+        """
+        Übernimmt den ältesten wartenden Auftrag
+
+        Returns:
+            dict: Auftrag (id, workbook, options, attempts, ...) oder None
+        """
+        now = time.time()
+        with self._transaction():
+            self._reclaim(now)
+            row = self._db.execute(
+                "SELECT id FROM jobs WHERE state = ? ORDER BY id LIMIT 1", (STATE_QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE jobs SET state = ?, worker = ?, lease_until = ?, attempts = attempts + 1, "
+                "started = ?, error = NULL WHERE id = ?",
+                (STATE_RUNNING, worker, now + lease_seconds, now, row["id"])
+            )
+        return self.job(row["id"])
+
+    def renew(self, job_id, worker, lease_seconds=LEASE_SECONDS):
+        """Verlängert die Frist; False, wenn der Auftrag inzwischen einem anderen Worker gehört"""
+        with self._transaction():
+            return self._db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND state = ?",
+                (time.time() + lease_seconds, job_id, worker, STATE_RUNNING)
+            ).rowcount == 1
+
+    def record_row(self, job_id, row, article, success, fields, ok, seconds):
+        """Speichert das Ergebnis einer Artikel-Zeile (überschreibt einen früheren Versuch)"""
+        with self._transaction():
+            self._db.execute(
+                "INSERT OR REPLACE INTO row_results "
+                "(job_id, row, article, success, fields, ok, seconds, finished) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, row, article, success, fields, int(ok), seconds, time.time())
+            )
+
+    def finish(self, job_id, worker, result=None, error=None):
+        """Schließt einen Auftrag ab (done bzw. failed bei error)"""
+        with self._transaction():
+            self._db.execute(
+                "UPDATE jobs SET state = ?, finished = ?, lease_until = NULL, error = ?, result = ? "
+                "WHERE id = ? AND worker = ?",
+                (STATE_FAILED if error else STATE_DONE, time.time(), error,
+                 json.dumps(result) if result is not None else None, job_id, worker)
+            )
+
+    def job(self, job_id):
+        """Ein Auftrag als dict (options/result bereits aus JSON gelesen)"""
+        row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job_dict(row) if row is not None else None
+
+    def jobs(self, state=None):
+        """Alle Aufträge (optional nur in einem Zustand), älteste zuerst"""
+        if state is None:
+            rows = self._db.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+        else:
+            rows = self._db.execute("SELECT * FROM jobs WHERE state = ? ORDER BY id", (state,)).fetchall()
+        return [_job_dict(row) for row in rows]
+
+    def row_results(self, job_id):
+        """Ergebnisse je Zeile eines Auftrags"""
+        return [dict(row) for row in self._db.execute(
+            "SELECT * FROM row_results WHERE job_id = ? ORDER BY row", (job_id,)
+        )]
+
+    def pending_count(self):
+        """Wartende und laufende Aufträge"""
+        return self._db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN (?, ?)", (STATE_QUEUED, STATE_RUNNING)
+        ).fetchone()[0]
+
+    def print_status(self):
+        """Gibt alle Aufträge mit Zustand, Artikeln und Dauer aus"""
+        jobs = self.jobs()
+        print(f"\n{'='*78}")
+        print(f"AUFTRÄGE ({self.path})")
+        print(f"{'='*78}")
+        if not jobs:
+            print("Keine Aufträge")
+            return
+        print(f"{'Nr':>4}  {'Datei':<28}  {'Zustand':<8}  {'Vers.':>5}  {'Artikel':>9}  {'Dauer':>8}  Hinweis")
+        for job in jobs:
+            rows = self.row_results(job["id"])
+            total = (job["result"] or {}).get("rows", "?")
+            duration = f"{job['finished'] - job['started']:>7.1f}s" if job["finished"] and job["started"] else f"{'-':>8}"
+            name = Path(job["workbook"]).name
+            if len(name) > 28:
+                name = name[:25] + "..."
+            note = job["error"] or (job["worker"] if job["state"] == STATE_RUNNING else "")
+            print(f"{job['id']:>4}  {name:<28}  {job['state']:<8}  {job['attempts']:>5}  "
+                  f"{len(rows):>4}/{total:<4}  {duration}  {note}")
+        print(f"{'='*78}")
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT bzw. ROLLBACK bei Fehler"""
+
+    def __init__(self, db):
+        self._db = db
+
+    def __enter__(self):
+        self._db.execute("BEGIN IMMEDIATE")
+        return self._db
+
+    def __exit__(self, exc_type, exc, tb):
+        self._db.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+def _job_dict(row):
+    job = dict(row)
+    job["options"] = json.loads(job["options"] or "{}")
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+class LeaseKeeper:
+    """
+    Verlängert die Frist eines Auftrags in einem Hintergrund-Thread
+
+    lost (threading.Event) wird gesetzt, sobald der Auftrag einem anderen
+    Worker gehört; der Import muss dann zwischen zwei Zeilen aufhören.
+    """
+
+    def __init__(self, db_path, job_id, worker, lease_seconds=LEASE_SECONDS):
+        self.db_path = db_path
+        self.job_id = job_id
+        self.worker = worker
+        self.lease_seconds = lease_seconds
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{job_id}", daemon=True)
+
+    def _run(self):
+        # Eigene Verbindung: sqlite3-Verbindungen gehören zu ihrem Thread
+        queue = JobQueue(self.db_path)
+        try:
+            while not self._stop.wait(self.lease_seconds / 3):
+                try:
+                    renewed = queue.renew(self.job_id, self.worker, self.lease_seconds)
+                except sqlite3.Error as e:
+                    # z.B. "database is locked" - beim nächsten Takt erneut versuchen
+                    print(f">> WARNUNG: Frist für Auftrag {self.job_id} nicht verlängert: {e}")
+                    continue
+                if not renewed:
+                    self.lost.set()
+                    print(f">> WARNUNG: Auftrag {self.job_id} gehört nicht mehr zu {self.worker}")
+                    return
+        finally:
+            queue.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+def work_jobs(queue, worker, process_job, lease_seconds=LEASE_SECONDS):
+    """
+    Arbeitet Aufträge ab, bis die Warteschlange leer ist
+
+    Args:
+        queue (JobQueue): Verbindung dieses Prozesses
+        worker (str): Name des Workers (worker_name)
+        process_job (callable): process_job(job, lost) -> dict mit Ergebnis, "error" bei
+            Fehlschlag; lost (threading.Event) ist gesetzt, wenn die Frist verloren ging
+
+    Returns:
+        int: Anzahl bearbeiteter Aufträge
+    """
+    done = 0
+    while True:
+        job = queue.claim(worker, lease_seconds)
+        if job is None:
+            return done
+        print(f"\n>> {worker}: Auftrag {job['id']} ({Path(job['workbook']).name}, Versuch {job['attempts']})")
+        with LeaseKeeper(queue.path, job["id"], worker, lease_seconds) as lease:
+            try:
+                result = process_job(job, lease.lost)
+                error = result.get("error")
+            except Exception as e:
+                result, error = None, str(e)
+        queue.finish(job["id"], worker, result, error)
+        done += 1
+
+def run_worker_pool(count, target, args=()):
+    """
+    Startet count Worker-Prozesse und wartet auf ihr Ende
+
+    Verwendet "spawn" (wie unter Windows immer): jeder Worker startet mit
+    frischem Interpreter, eigenem Playwright und eigenen Einstellungen.
+
+    Args:
+        count (int): Anzahl Worker
+        target (callable): target(worker_nr, *args) - auf Modulebene definiert
+        args (tuple): weitere Argumente (müssen sich pickeln lassen)
+    """
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=target, args=(worker_nr, *args), name=f"autobanf-worker-{worker_nr}")
+        for worker_nr in range(1, count + 1)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        print("\n>> Worker werden beendet - laufende Aufträge übernimmt später ein anderer Worker")
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+    return [process.exitcode for process in processes]
@@ -0,0 +1,219 @@
+"""
+launch_profiles.py - Startprofile für Chromium
+==============================================
+
+Bisher startete create_browser_page() immer ein sichtbares Chromium mit
+1600x1000 Pixeln, ohne Einstellmöglichkeit. Ein Startprofil (--launch)
+legt fest: Headless-Modus, Chromium-Argumente, Fenstergröße und ob ein
+Cache-Verzeichnis verwendet wird.
+
+Profile:
+    interactive          - sichtbarer Browser wie bisher (Standard)
+    headless-production  - ohne Fenster, ohne GPU, keine Drosselung im
+                           Hintergrund; HTTP-Cache in .temp/browser_cache,
+                           damit die UI5-Bibliotheken nicht bei jedem Start
+                           neu geladen werden
+    low-memory           - ohne Fenster, ein Renderer-Prozess, kleiner
+                           JavaScript-Heap, kleineres Fenster, kein Disk-Cache
+
+Ein Cache-Verzeichnis erfordert einen persistenten Browser-Kontext
+(launch_persistent_context). Jeder gleichzeitig laufende Browser (z.B. je
+Shard) bekommt einen eigenen Unterordner slot-N; Cookies werden beim Start
+verworfen bzw. aus dem storage_state übernommen, es bleibt nur der Cache.
+
+Jeder Start wird mit Dauer und Speicherbedarf (browser_metrics) verbucht;
+print_summary() gibt am Ende die Werte des Profils aus.
+python autoBANF.py --compare-launch-profiles vergleicht alle Profile.
+
+Verwendung:
+    from lib.launch_profiles import set_launch_profile, get_launch_profile
+    set_launch_profile("headless-production")
+"""
+
+import os
+import threading
+from pathlib import Path
+from .browser_metrics import chromium_memory_bytes, format_megabytes, process_alive
+
+# Keine Drosselung von Timern/Renderern, wenn das Fenster im Hintergrund liegt
+NO_THROTTLING_ARGS = [
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding"
+]
+
+# Dienste, die für den Import nicht gebraucht werden
+LEAN_ARGS = [
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--mute-audio",
+    "--no-first-run"
+]
+
+LAUNCH_PROFILES = {
+    "interactive": {
+        "headless": False,
+        "viewport": (1600, 1000),
+        "args": [],
+        "cache_dir": None
+    },
+    "headless-production": {
+        "headless": True,
+        "viewport": (1600, 1000),
+        "args": LEAN_ARGS + NO_THROTTLING_ARGS,
+        "cache_dir": Path(".temp") / "browser_cache"
+    },
+    "low-memory": {
+        "headless": True,
+        "viewport": (1280, 800),
+        "args": LEAN_ARGS + NO_THROTTLING_ARGS + [
+            "--renderer-process-limit=1",
+            "--disable-site-isolation-trials",
+            "--js-flags=--max-old-space-size=512",
+            "--disk-cache-size=1"
+        ],
+        "cache_dir": None
+    }
+}
+
+DEFAULT_LAUNCH_PROFILE = "interactive"
+
+class PersistentBrowser:
+    """
+    Hülle um einen persistenten Kontext, die sich wie ein Browser verhält
+
+    launch_persistent_context() liefert keinen Browser; close_browser_safely()
+    und die übrigen Aufrufer erwarten aber contexts/close()/is_connected().
+    """
+
+    def __init__(self, context, release):
+        self._context = context
+        self._release = release
+
+    @property
+    def contexts(self):
+        return [self._context]
+
+    def is_connected(self):
+        return self._release is not None
+
+    def close(self):
+        try:
+            self._context.close()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+class LaunchProfile:
+    """Einstellungen eines Startprofils und Messwerte der Starts"""
+
+    def __init__(self, name=DEFAULT_LAUNCH_PROFILE):
+        if name not in LAUNCH_PROFILES:
+            raise ValueError(f"Unbekanntes Startprofil '{name}' (verfügbar: {', '.join(LAUNCH_PROFILES)})")
+        self.name = name
+        self.settings = LAUNCH_PROFILES[name]
+        self.launches = []      # je Start: {"seconds", "memory_bytes"}
+        self._slots = set()
+        self._lock = threading.Lock()
+
+    @property
+    def headless(self):
+        return self.settings["headless"]
+
+    @property
+    def viewport(self):
+        width, height = self.settings["viewport"]
+        return {"width": width, "height": height}
+
+    @property
+    def args(self):
+        return list(self.settings["args"])
+
+    @property
+    def cache_dir(self):
+        return self.settings["cache_dir"]
+
+    def acquire_cache_slot(self):
+        """
+        Reserviert einen freien Cache-Unterordner für einen Browser
+
+        Returns:
+            tuple: (Pfad, Freigabe-Funktion)
+        """
+        with self._lock:
+            nr = 1
+            while True:
+                slot = Path(self.cache_dir) / f"slot-{nr}"
+                lock_file = slot / "autobanf.lock"
+                if nr not in self._slots:
+                    slot.mkdir(parents=True, exist_ok=True)
+                    try:
+                        fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                        os.write(fd, str(os.getpid()).encode())
+                        os.close(fd)
+                        break
+                    except FileExistsError:
+                        if not _stale_lock(lock_file):
+                            nr += 1
+                            continue
+                        lock_file.unlink(missing_ok=True)
+                        continue
+                nr += 1
+            self._slots.add(nr)
+
+        def release():
+            with self._lock:
+                self._slots.discard(nr)
+            lock_file.unlink(missing_ok=True)
+
+        return slot, release
+
+    def record_launch(self, seconds):
+        """Verbucht einen Browserstart mit dem aktuellen Chromium-Speicher"""
+        memory = chromium_memory_bytes()
+        with self._lock:
+            self.launches.append({"seconds": seconds, "memory_bytes": memory})
+        return memory
+
+    def print_summary(self):
+        """Gibt Startdauer und Speicher der Starts dieses Laufs aus"""
+        with self._lock:
+            launches = list(self.launches)
+        if not launches:
+            return
+        average = sum(entry["seconds"] for entry in launches) / len(launches)
+        memory = max((entry["memory_bytes"] for entry in launches if entry["memory_bytes"] is not None),
+                     default=None)
+        print(f">> Startprofil '{self.name}': {len(launches)} Start(s), Ø {average:.1f} s, "
+              f"Chromium-Speicher nach dem Start {format_megabytes(memory)}")
+
+def _stale_lock(lock_file):
+    """True, wenn die Sperre von einem nicht mehr laufenden Prozess stammt"""
+    try:
+        pid = int(lock_file.read_text())
+    except (OSError, ValueError):
+        return True
+    if pid == os.getpid():
+        return False
+    return not process_alive(pid)
+
+_profile = None
+_profile_lock = threading.Lock()
+
+def get_launch_profile():
+    """Liefert das Startprofil des Prozesses"""
+    global _profile
+    with _profile_lock:
+        if _profile is None:
+            _profile = LaunchProfile()
+        return _profile
+
+def set_launch_profile(name):
+    """Wählt das Startprofil für alle folgenden Browserstarts"""
+    global _profile
+    with _profile_lock:
+        _profile = LaunchProfile(name)
+        return _profile
@@ -0,0 +1,190 @@
+"""
+network_filter.py - Nicht benötigte Netzwerk-Ressourcen blockieren
+==================================================================
+
+Launchpad und easyBANF laden Bilder, Kachel-Grafiken, Videos und
+Analyse-Skripte, die die Automatisierung nie ansieht. wait_for_ui5_idle
+wartet trotzdem darauf (document.readyState ist erst "complete", wenn alle
+Bilder geladen sind). Der NetworkFilter bricht solche Anfragen über
+context.route() ab, bevor sie das Netz erreichen - nach Ressourcentyp und
+URL-Muster.
+
+Profile (--block):
+    off     - nichts blockieren
+    safe    - Bilder, Medien und bekannte Analyse-/Tracking-Dienste (Standard)
+    strict  - zusätzlich Webfonts. Die SAP-Icons sind ein Font: Symbole wie
+              Dropdown-Pfeile erscheinen dann als Ersatzzeichen, die Elemente
+              bleiben aber anklickbar.
+
+Mit --block-measure wird nichts blockiert, sondern gezählt, wie viele
+Anfragen und Bytes das gewählte Profil eingespart hätte.
+
+Nicht blockierte Anfragen werden mit route.fallback() weitergereicht, damit
+andere Routen (z.B. die HAR-Wiedergabe) greifen.
+
+Verwendung:
+    from lib.network_filter import set_network_filter, get_network_filter
+    set_network_filter("strict")
+    get_network_filter().attach(context)
+"""
+
+import fnmatch
+import threading
+
+# Analyse-/Tracking-Dienste und sonstige Anfragen ohne Nutzen für den Import
+TRACKING_PATTERNS = (
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*doubleclick.net/*",
+    "*/piwik.php*",
+    "*/matomo.php*",
+    "*/favicon.ico"
+)
+
+BLOCK_PROFILES = {
+    "off": {
+        "resource_types": (),
+        "url_patterns": ()
+    },
+    "safe": {
+        "resource_types": ("image", "media"),
+        "url_patterns": TRACKING_PATTERNS
+    },
+    "strict": {
+        "resource_types": ("image", "media", "font"),
+        "url_patterns": TRACKING_PATTERNS
+    }
+}
+
+DEFAULT_BLOCK_PROFILE = "safe"
+
+class NetworkFilter:
+    """Blockiert Anfragen nach Profil bzw. misst, was blockiert würde"""
+
+    def __init__(self, profile=DEFAULT_BLOCK_PROFILE, measure=False):
+        if profile not in BLOCK_PROFILES:
+            raise ValueError(f"Unbekanntes Block-Profil '{profile}' (verfügbar: {', '.join(BLOCK_PROFILES)})")
+        self.profile = profile
+        self.measure = measure
+        self.settings = BLOCK_PROFILES[profile]
+        self.blocked = {}       # Ressourcentyp -> Anzahl (im Messmodus: wäre blockiert)
+        self.blocked_bytes = 0  # nur im Messmodus bekannt
+        self.passed = 0
+        self.passed_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        """True, wenn das Profil überhaupt etwas blockiert"""
+        return bool(self.settings["resource_types"] or self.settings["url_patterns"])
+
+    def should_block(self, resource_type, url):
+        """Prüft eine Anfrage gegen Ressourcentypen und URL-Muster des Profils"""
+        if resource_type in self.settings["resource_types"]:
+            return True
+        return any(fnmatch.fnmatchcase(url, pattern) for pattern in self.settings["url_patterns"])
+
+    def _count_blocked(self, resource_type, size=0):
+        with self._lock:
+            self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+            self.blocked_bytes += size
+
+    def _count_passed(self, size=0):
+        with self._lock:
+            self.passed += 1
+            self.passed_bytes += size
+
+    def _route(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self._count_blocked(request.resource_type)
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    async def _route_async(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self._count_blocked(request.resource_type)
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    def _on_finished(self, request):
+        """Messmodus: Größe jeder abgeschlossenen Anfrage verbuchen"""
+        try:
+            sizes = request.sizes()
+            size = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        except Exception:
+            size = 0
+        self._record_finished(request, size)
+
+    async def _on_finished_async(self, request):
+        try:
+            sizes = await request.sizes()
+            size = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        except Exception:
+            size = 0
+        self._record_finished(request, size)
+
+    def _record_finished(self, request, size):
+        if self.should_block(request.resource_type, request.url):
+            self._count_blocked(request.resource_type, size)
+        else:
+            self._count_passed(size)
+
+    def attach(self, context):
+        """Richtet Blockieren bzw. Messen für einen Browser-Kontext ein"""
+        if not self.active:
+            return
+        if self.measure:
+            context.on("requestfinished", self._on_finished)
+        else:
+            context.route("**/*", self._route)
+
+    async def attach_async(self, context):
+        """Asynchrone Variante von attach() für die asyncio-Engine"""
+        if not self.active:
+            return
+        if self.measure:
+            context.on("requestfinished", self._on_finished_async)
+        else:
+            await context.route("**/*", self._route_async)
+
+    def print_summary(self):
+        """Gibt die blockierten (bzw. blockierbaren) Anfragen aus"""
+        with self._lock:
+            blocked = dict(self.blocked)
+            blocked_bytes = self.blocked_bytes
+            passed = self.passed
+            passed_bytes = self.passed_bytes
+        if not self.active:
+            return
+        total = sum(blocked.values())
+        by_type = ", ".join(f"{resource_type} {count}" for resource_type, count in sorted(blocked.items()))
+        if self.measure:
+            print(f"\n>> Netzwerk-Messung (Profil '{self.profile}'): {total} von {total + passed} Anfragen "
+                  f"wären blockiert worden ({by_type or '-'})")
+            all_bytes = blocked_bytes + passed_bytes
+            share = f" = {blocked_bytes / all_bytes * 100:.0f}%" if all_bytes else ""
+            print(f"   Einsparung: {blocked_bytes / 1024:.0f} KB von {all_bytes / 1024:.0f} KB{share}")
+        elif total:
+            print(f"\n>> Netzwerk (Profil '{self.profile}'): {total} Anfragen blockiert ({by_type})")
+
+_filter = None
+_filter_lock = threading.Lock()
+
+def get_network_filter():
+    """Liefert den NetworkFilter des Prozesses"""
+    global _filter
+    with _filter_lock:
+        if _filter is None:
+            _filter = NetworkFilter()
+        return _filter
+
+def set_network_filter(profile=DEFAULT_BLOCK_PROFILE, measure=False):
+    """Ersetzt den NetworkFilter des Prozesses"""
+    global _filter
+    with _filter_lock:
+        _filter = NetworkFilter(profile, measure)
+        return _filter
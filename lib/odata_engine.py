@@ -0,0 +1,507 @@
+"""
+odata_engine.py - Positionen direkt über OData anlegen (experimentell)
+=====================================================================
+
+Über die Oberfläche kostet jeder Artikel 16 Schritte mit Dropdowns, Dialog
+und Feldprüfungen. easyBANF selbst legt die Position beim Klick auf
+"Bearbeitung abschließen" aber mit wenigen OData-Aufrufen an. Die
+OData-Engine (--engine odata):
+
+1. trägt die ersten ODATA_SAMPLE_ROWS Artikel wie bisher über die
+   Oberfläche ein und zeichnet dabei alle ändernden OData-Aufrufe auf
+   (auch innerhalb von $batch-Anfragen),
+2. leitet daraus eine Vorlage ab: eine Eigenschaft wird nur dann zum
+   Platzhalter für eine Excel-Spalte, wenn sich ihr Wert zwischen den
+   Muster-Artikeln ändert und in jedem Muster-Artikel zur Spalte passt
+   (Text, Dezimalzahl, Datum); über alle Muster gleiche Eigenschaften
+   bleiben fest - auch wenn sie zufällig einer Spalte gleichen,
+3. sendet die Artikel, die die Vorlage abbildet, als $batch (je Artikel ein
+   Changeset) mit den Cookies der angemeldeten Sitzung und einem
+   CSRF-Token über context.request.
+
+Ein Artikel wird nur dann über die Vorlage angelegt, wenn jede Spalte, die
+keinem Platzhalter zugeordnet ist, denselben Wert hat wie im ersten
+Muster-Artikel. Alle übrigen und vom Server abgelehnte Artikel werden
+über die Oberfläche eingetragen - der Oberflächen-Pfad bleibt die geprüfte
+Rückfallebene. Jeder dieser Artikel wird wieder aufgezeichnet und
+verfeinert die Vorlage, sodass weitere Spalten zugeordnet werden.
+Aufzeichnungen mit Aufrufen auf bestehende Einträge (MERGE/PATCH/PUT/DELETE
+oder URLs mit Schlüssel) werden nicht nachgespielt.
+
+Entwickelt und geprüft gegen den OData-Nachbau in benchmarks/mock_easybanf.py.
+Die Oberfläche zeigt direkt angelegte Positionen erst nach dem Neuladen des
+Warenkorbs.
+
+Verwendung:
+    from lib.odata_engine import ODataRecorder, learn_template, ODataSubmitter
+"""
+
+import copy
+import json
+import re
+import secrets
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urljoin
+from .excel_reader import NUMERIC_COLUMNS
+
+# URL-Bestandteil der SAP-Gateway-Dienste
+ODATA_URL_MARKER = "/sap/opu/odata/"
+
+# Über die Oberfläche eingetragene Muster-Artikel
+ODATA_SAMPLE_ROWS = 2
+
+# Artikel je $batch-Anfrage
+DEFAULT_BATCH_SIZE = 20
+
+TEMPLATE_FILE = Path(".temp") / "odata" / "template.json"
+
+MODIFYING_METHODS = ("POST", "PUT", "MERGE", "PATCH", "DELETE")
+
+# Marker für Platzhalter in der Vorlage
+FIELD_KEY = "__autobanf_field__"
+FORMAT_KEY = "__autobanf_format__"
+EMPTY_KEY = "__autobanf_empty__"
+
+_UNSET = object()
+
+_DATE_MS = re.compile(r"^/Date\((-?\d+)\)/$")
+_DATE_ISO = re.compile(r"^(\d{4}-\d{2}-\d{2})(T.*)?$")
+
+# ========================================
+# $batch (multipart/mixed, OData V2)
+# ========================================
+
+def _boundary(content_type):
+    match = re.search(r'boundary="?([^";]+)"?', content_type or "")
+    if not match:
+        raise ValueError(f"Keine boundary in Content-Type '{content_type}'")
+    return match.group(1)
+
+def _split_head(text):
+    """Trennt Kopfzeilen und Rumpf an der ersten Leerzeile"""
+    match = re.search(r"\r?\n\r?\n", text)
+    if not match:
+        return text, ""
+    return text[:match.start()], text[match.end():]
+
+def _headers(lines):
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        if value:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+def _parse_http(text):
+    """Eine eingebettete HTTP-Anfrage bzw. -Antwort (application/http)"""
+    head, body = _split_head(text.lstrip("\r\n"))
+    lines = head.splitlines()
+    start = lines[0].split(" ", 2) if lines else [""]
+    part = {"headers": _headers(lines[1:]), "body": body.rstrip("\r\n")}
+    if start[0].startswith("HTTP/"):
+        part["status"] = int(start[1])
+    else:
+        part["method"] = start[0].upper()
+        part["url"] = start[1] if len(start) > 1 else ""
+    return part
+
+def parse_batch(body, content_type):
+    """
+    Zerlegt eine $batch-Anfrage oder -Antwort
+
+    Returns:
+        list: je Teil eine Liste von HTTP-Teilen (dict mit method/url bzw.
+              status, headers, body); ein Changeset ergibt eine Liste mit
+              mehreren Einträgen
+    """
+    groups = []
+    for chunk in body.split("--" + _boundary(content_type))[1:]:
+        if chunk.startswith("--"):
+            break
+        head, payload = _split_head(chunk.lstrip("\r\n"))
+        part_type = _headers(head.splitlines()).get("content-type", "")
+        if part_type.startswith("multipart/mixed"):
+            groups.append([part for group in parse_batch(payload, part_type) for part in group])
+        else:
+            groups.append([_parse_http(payload)])
+    return groups
+
+def _multipart(parts, boundary):
+    lines = []
+    for headers, payload in parts:
+        lines.append(f"--{boundary}")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        lines.append("")
+        lines.append(payload)
+    lines.append(f"--{boundary}--")
+    lines.append("")
+    return "\r\n".join(lines)
+
+def _http_part(start_line, headers, body):
+    lines = [start_line]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return "\r\n".join(lines + ["", body or ""])
+
+def _changesets(changesets, render):
+    parts = []
+    for changeset in changesets:
+        boundary = f"changeset_{secrets.token_hex(8)}"
+        inner = [({"Content-Type": "application/http", "Content-Transfer-Encoding": "binary"}, render(part))
+                 for part in changeset]
+        parts.append(({"Content-Type": f"multipart/mixed; boundary={boundary}"}, _multipart(inner, boundary)))
+    boundary = f"batch_{secrets.token_hex(8)}"
+    return _multipart(parts, boundary), f"multipart/mixed; boundary={boundary}"
+
+def build_batch(changesets):
+    """
+    Baut eine $batch-Anfrage mit einem Changeset je Eintrag
+
+    Args:
+        changesets (list): je Changeset eine Liste von Aufrufen {"method", "url", "body"}
+
+    Returns:
+        tuple: (Rumpf, Content-Type)
+    """
+    def render(call):
+        body = call["body"] if isinstance(call["body"], str) else json.dumps(call["body"], ensure_ascii=False)
+        return _http_part(f"{call['method']} {call['url']} HTTP/1.1",
+                          {"Content-Type": "application/json", "Accept": "application/json"}, body)
+    return _changesets(changesets, render)
+
+def build_batch_response(changesets):
+    """
+    Baut eine $batch-Antwort (für den Nachbau)
+
+    Args:
+        changesets (list): je Changeset eine Liste von Antworten {"status", "body"}
+    """
+    def render(response):
+        return _http_part(f"HTTP/1.1 {response['status']} {'OK' if response['status'] < 400 else 'Error'}",
+                          {"Content-Type": "application/json"}, response.get("body", ""))
+    return _changesets(changesets, render)
+
+# ========================================
+# Aufzeichnen
+# ========================================
+
+def _modifying_calls(url, method, headers, post_data):
+    """Ändernde OData-Aufrufe einer Anfrage (bei $batch die eingebetteten)"""
+    if ODATA_URL_MARKER not in url or method not in MODIFYING_METHODS:
+        return []
+    path = url.split("?", 1)[0]
+    if path.endswith("/$batch"):
+        root = path[:-len("$batch")]
+        parts = [part for group in parse_batch(post_data or "", headers.get("content-type", "")) for part in group]
+        return [{"root": root, "method": part["method"], "url": part["url"], "body": part["body"]}
+                for part in parts if part.get("method") in MODIFYING_METHODS]
+    root, _, entity = path.rpartition("/")
+    return [{"root": root + "/", "method": method, "url": entity, "body": post_data or ""}]
+
+class ODataRecorder:
+    """Zeichnet die ändernden OData-Aufrufe einer Seite je Artikel auf"""
+
+    def __init__(self):
+        self.samples = []       # (record, calls)
+        self._calls = []
+        self._page = None
+
+    def _on_request(self, request):
+        try:
+            self._calls.extend(_modifying_calls(request.url, request.method, request.headers, request.post_data))
+        except ValueError as e:
+            print(f">> WARNUNG: OData-Anfrage nicht lesbar ({e})")
+
+    def attach(self, page):
+        """Beginnt die Aufzeichnung auf einer Seite"""
+        self._page = page
+        page.on("request", self._on_request)
+
+    def detach(self):
+        """Beendet die Aufzeichnung"""
+        if self._page is not None:
+            self._page.remove_listener("request", self._on_request)
+            self._page = None
+
+    def row_done(self, record, row_result):
+        """on_row_done für import_rows: ordnet die seit dem letzten Artikel gesehenen Aufrufe zu"""
+        calls, self._calls = self._calls, []
+        if row_result["ok"] and calls:
+            self.samples.append((record, calls))
+
+# ========================================
+# Vorlage ableiten
+# ========================================
+
+def _german_number(value):
+    try:
+        return float(str(value).replace(",", "."))
+    except ValueError:
+        return None
+
+def _german_date(value):
+    try:
+        return datetime.strptime(str(value), "%d.%m.%Y").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+def _value_formats(prop, value):
+    """Formate, in denen der Excel-Wert value als prop übertragen worden sein kann"""
+    if isinstance(prop, bool) or prop is None or value is None or value == "":
+        return set()
+    number = _german_number(value)
+    if isinstance(prop, (int, float)):
+        return {"number"} if number is not None and number == prop else set()
+    formats = {"text"} if prop == value else set()
+    date = _german_date(value)
+    if date is not None:
+        match = _DATE_MS.match(prop)
+        if match and int(match.group(1)) == int(date.timestamp() * 1000):
+            formats.add("date_ms")
+        match = _DATE_ISO.match(prop)
+        if match and match.group(1) == date.strftime("%Y-%m-%d"):
+            formats.add("date_iso" + (match.group(2) or ""))
+    if number is not None and re.fullmatch(r"-?\d+(\.\d+)?", prop) and float(prop) == number:
+        formats.add("decimal")
+    return formats
+
+def _preferred_format(field, formats):
+    """Bei ganzen Zahlen passen "text" und "decimal" - Zahlenspalten als Dezimalzahl"""
+    if "decimal" in formats and field in NUMERIC_COLUMNS:
+        return "decimal"
+    if "text" in formats:
+        return "text"
+    return sorted(formats)[0]
+
+def _render(value, value_format):
+    """Excel-Wert im aufgezeichneten Format"""
+    if value_format == "text":
+        return value
+    if value_format in ("number", "decimal"):
+        number = _german_number(value)
+        if number is None:
+            raise ValueError(f"'{value}' ist keine Zahl")
+        if value_format == "decimal":
+            return str(value).replace(",", ".")
+        return int(number) if number == int(number) else number
+    date = _german_date(value)
+    if date is None:
+        raise ValueError(f"'{value}' ist kein Datum")
+    if value_format == "date_ms":
+        return f"/Date({int(date.timestamp() * 1000)})/"
+    return date.strftime("%Y-%m-%d") + value_format[len("date_iso"):]
+
+def _leaves(value, path=()):
+    """Alle Blattwerte eines JSON-Objekts mit ihrem Pfad"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _leaves(item, path + (key,))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _leaves(item, path + (index,))
+    else:
+        yield path, value
+
+def _set(document, path, value):
+    for key in path[:-1]:
+        document = document[key]
+    document[path[-1]] = value
+
+class ODataTemplate:
+    """Aus Muster-Artikeln abgeleitete OData-Aufrufe mit Platzhaltern"""
+
+    def __init__(self, root, calls, mapping, sample):
+        self.root = root
+        self.calls = calls          # Aufrufe mit Platzhaltern {FIELD_KEY, FORMAT_KEY, EMPTY_KEY}
+        self.mapping = mapping      # (Aufruf, Pfad) -> [Excel-Spalten]
+        self.sample = sample        # Werte des ersten Muster-Artikels
+
+    @property
+    def fields(self):
+        """Excel-Spalten, die die Vorlage überträgt"""
+        return sorted({field for fields in self.mapping.values() for field in fields})
+
+    def accepts(self, record):
+        """
+        Kann der Artikel über die Vorlage angelegt werden?
+
+        Nicht zugeordnete Spalten müssen denselben Wert haben wie der
+        Muster-Artikel; passen mehrere Spalten auf eine Eigenschaft, müssen
+        sie im Artikel gleich sein.
+        """
+        mapped = set(self.fields)
+        for field, value in record.as_dict().items():
+            if field not in mapped and value != self.sample.get(field):
+                return False
+        if not all(len({record.get(field) for field in fields}) == 1 for fields in self.mapping.values()):
+            return False
+        try:
+            self.calls_for(record)
+        except (TypeError, ValueError):
+            # Wert passt nicht zum aufgezeichneten Format (z.B. Text statt Datum)
+            return False
+        return True
+
+    def calls_for(self, record):
+        """Die Aufrufe für einen Artikel"""
+        return [{"method": call["method"], "url": call["url"], "body": _fill(call["body"], record)}
+                for call in self.calls]
+
+    def save(self, path=TEMPLATE_FILE):
+        """Speichert die Vorlage zur Kontrolle"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"root": self.root, "fields": self.fields, "calls": self.calls}, f,
+                      indent=2, ensure_ascii=False)
+        return path
+
+def _fill(value, record):
+    """Ersetzt alle Platzhalter eines Aufrufs durch die Werte des Artikels"""
+    if isinstance(value, dict):
+        if FIELD_KEY in value:
+            cell = record.get(value[FIELD_KEY])
+            return value[EMPTY_KEY] if cell in (None, "") else _render(cell, value[FORMAT_KEY])
+        return {key: _fill(item, record) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, record) for item in value]
+    return value
+
+def _match_property(values, records):
+    """
+    Excel-Spalten, aus denen eine Eigenschaft in allen Muster-Artikeln stammen kann
+
+    Eine leere Eigenschaft passt zu jeder leeren Spalte.
+
+    Returns:
+        tuple: (Spalten, Format, Leerwert) oder None
+    """
+    candidates = None
+    empty = _UNSET
+    for value, record in zip(values, records):
+        row = record.as_dict()
+        if value in ("", None):
+            # Leere Eigenschaft: jede leere Spalte passt, das Format bleibt offen
+            empty = value
+            matches = {field: None for field, cell in row.items() if cell in ("", None)}
+        else:
+            matches = {field: formats for field, cell in row.items()
+                       if (formats := _value_formats(value, cell))}
+        if candidates is None:
+            candidates = matches
+            continue
+        merged = {}
+        for field, formats in matches.items():
+            if field not in candidates:
+                continue
+            if formats is None or candidates[field] is None:
+                merged[field] = formats or candidates[field]
+            elif formats & candidates[field]:
+                merged[field] = formats & candidates[field]
+        candidates = merged
+    candidates = {field: formats for field, formats in (candidates or {}).items() if formats}
+    if not candidates:
+        return None
+    fields = sorted(candidates)
+    value_format = _preferred_format(fields[0], candidates[fields[0]])
+    if empty is _UNSET:
+        empty = None if value_format == "number" else ""
+    return fields, value_format, empty
+
+def learn_template(samples):
+    """
+    Leitet die Vorlage aus den aufgezeichneten Muster-Artikeln ab
+
+    Args:
+        samples (list): (record, calls) aus ODataRecorder
+
+    Returns:
+        tuple: (ODataTemplate oder None, Grund falls None)
+    """
+    if not samples:
+        return None, "keine OData-Aufrufe beim Übernehmen aufgezeichnet"
+    first_record, first_calls = samples[0]
+    shape = [(call["root"], call["method"], call["url"]) for call in first_calls]
+    for _, calls in samples[1:]:
+        if [(call["root"], call["method"], call["url"]) for call in calls] != shape:
+            return None, "Muster-Artikel erzeugen unterschiedliche Aufrufe"
+    for root, method, url in shape:
+        if method != "POST" or "(" in url:
+            return None, f"Aufruf {method} {url} ändert einen bestehenden Eintrag (nicht unterstützt)"
+    if len({root for root, _, _ in shape}) > 1:
+        return None, "Aufrufe an mehrere OData-Dienste"
+
+    try:
+        bodies = [[json.loads(call["body"]) for call in calls] for _, calls in samples]
+    except ValueError:
+        return None, "Aufruf ohne JSON-Rumpf"
+
+    template_calls = []
+    mapping = {}
+    for nr, (root, method, url) in enumerate(shape):
+        body = copy.deepcopy(bodies[0][nr])
+        leaves = [dict(_leaves(sample[nr])) for sample in bodies]
+        for path, prop in _leaves(bodies[0][nr]):
+            values = [sample_leaves.get(path) for sample_leaves in leaves]
+            varies = any(value != prop for value in values)
+            # Über alle Muster gleiche Werte bleiben fest - dass sie einer Spalte
+            # gleichen, kann Zufall sein (z.B. Menge 1 und eine feste "1")
+            match = _match_property(values, [record for record, _ in samples]) if varies else None
+            if match:
+                fields, value_format, empty = match
+                _set(body, path, {FIELD_KEY: fields[0], FORMAT_KEY: value_format, EMPTY_KEY: empty})
+                mapping[(nr, path)] = fields
+            elif varies:
+                return None, f"Eigenschaft {'/'.join(map(str, path))} ändert sich je Artikel, Herkunft unbekannt"
+        template_calls.append({"method": method, "url": url, "body": body})
+
+    return ODataTemplate(shape[0][0], template_calls, mapping, first_record.as_dict()), None
+
+# ========================================
+# Senden
+# ========================================
+
+class ODataSubmitter:
+    """Sendet Artikel als $batch mit den Cookies eines Browser-Kontexts"""
+
+    def __init__(self, request, template):
+        self.request = request      # context.request (teilt die Cookies der Seite)
+        self.template = template
+        self.token = None
+
+    def _fetch_token(self):
+        response = self.request.get(self.template.root, headers={"X-CSRF-Token": "Fetch"})
+        self.token = response.headers.get("x-csrf-token")
+        if not self.token:
+            raise RuntimeError(f"Kein CSRF-Token erhalten (HTTP {response.status})")
+
+    def submit(self, records):
+        """
+        Legt die Artikel an (je Artikel ein Changeset)
+
+        Returns:
+            list: True/False je Artikel (False: vom Server abgelehnt)
+        """
+        body, content_type = build_batch([self.template.calls_for(record) for record in records])
+        for attempt in range(2):
+            if self.token is None:
+                self._fetch_token()
+            response = self.request.post(urljoin(self.template.root, "$batch"), data=body, headers={
+                "Content-Type": content_type,
+                "Accept": "multipart/mixed",
+                "X-CSRF-Token": self.token
+            })
+            if response.status == 403 and response.headers.get("x-csrf-token", "").lower() == "required":
+                # Token abgelaufen: einmal neu holen
+                self.token = None
+                continue
+            break
+        if response.status != 202 and response.status != 200:
+            raise RuntimeError(f"$batch abgelehnt (HTTP {response.status})")
+
+        groups = parse_batch(response.text(), response.headers.get("content-type", ""))
+        expected = len(self.template.calls)
+        results = []
+        for nr in range(len(records)):
+            parts = groups[nr] if nr < len(groups) else []
+            results.append(len(parts) == expected and all(200 <= part["status"] < 300 for part in parts))
+        return results
@@ -0,0 +1,191 @@
+"""
+pacing.py - Angepasste Wartezeiten statt festem slow_mo
+=======================================================
+
+Bisher hat Playwright jede Aktion um slow_mo=800 ms verzögert - auch reine
+Abfragen wie count() oder is_visible(). Auf schnellen Verbindungen ist das
+verschenkte Zeit, an langsamen VPN-Tagen trotzdem zu wenig.
+
+Nach jedem Schritt wartet wait_for_ui5_idle, bis die App ruhig ist - samt
+Ruhephase. Eine zusätzliche Nachlaufzeit ist danach nur nötig, wenn die
+Oberfläche trotzdem noch nicht so weit ist. Das sieht der Idle-Check
+selbst nicht, wohl aber der folgende Schritt: fehlt nach einem Dropdown,
+Dialog oder dem Übernehmen einer Position (SETTLE_STEPS) das erwartete
+Element, meldet der Aufrufer einen Fehlgriff (record_miss). Jeder
+Fehlgriff verdoppelt die Nachlaufzeit des Schritts (mindestens miss_ms,
+höchstens max_ms), jeder ruhige Durchlauf lässt sie wieder abklingen.
+Ohne Fehlgriffe bleibt sie bei 0. Je Schritt werden nur Summen geführt
+und am Ende als eine Zeile je Schritt in .temp/pacing_log.jsonl angehängt.
+
+Profile (--pacing):
+    fast    - kleine Schritte und niedrige Obergrenze, z.B. im Hochschulnetz
+    normal  - Standard
+    vpn     - größere Schritte und hohe Obergrenze für langsame Verbindungen
+    legacy  - altes Verhalten: slow_mo=800, keine Nachlaufzeiten
+
+Verwendung:
+    from lib.pacing import set_pacing_profile, get_pacing_controller
+    set_pacing_profile("vpn")
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+PACING_PROFILES = {
+    "fast":   {"slow_mo": 0,   "miss_ms": 100, "max_ms": 600},
+    "normal": {"slow_mo": 0,   "miss_ms": 200, "max_ms": 1500},
+    "vpn":    {"slow_mo": 0,   "miss_ms": 400, "max_ms": 4000},
+    "legacy": {"slow_mo": 800, "miss_ms": 0,   "max_ms": 0},
+}
+
+DEFAULT_PROFILE = "normal"
+
+# Schritte (Schlüssel aus WAIT_LIMITS), nach denen die Oberfläche nachlaufen darf
+SETTLE_STEPS = ("dropdown", "dialog", "transfer")
+
+# Abklingen der Nachlaufzeit je ruhigem Durchlauf ohne Fehlgriff
+DECAY = 0.8
+
+# Unterhalb dieser Nachlaufzeit (ms) wird nicht mehr gewartet
+MIN_SETTLE_MS = 20
+
+PACING_LOG_FILE = Path(".temp") / "pacing_log.jsonl"
+
+class PacingController:
+    """Führt die Nachlaufzeit je Schritt anhand der Fehlgriffe im Folgeschritt"""
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        if profile not in PACING_PROFILES:
+            raise ValueError(f"Unbekanntes Pacing-Profil '{profile}' (verfügbar: {', '.join(PACING_PROFILES)})")
+        self.profile = profile
+        self.settings = PACING_PROFILES[profile]
+        self.delay_ms = {}      # Schritt -> aktuelle Nachlaufzeit
+        self.stats = {}         # Schritt -> Summen (count, response_ms, delay_ms, timeouts, misses)
+        self._lock = threading.Lock()
+
+    @property
+    def slow_mo(self):
+        """slow_mo für den Browserstart (nur Profil "legacy")"""
+        return self.settings["slow_mo"]
+
+    def settle_ms(self, step):
+        """Aktuelle Nachlaufzeit eines Schritts in Millisekunden"""
+        if step not in SETTLE_STEPS:
+            return 0
+        delay = self.delay_ms.get(step, 0)
+        return int(delay) if delay >= MIN_SETTLE_MS else 0
+
+    def _step_stats(self, step):
+        return self.stats.setdefault(step, {"count": 0, "response_ms": 0.0, "delay_ms": 0,
+                                            "timeouts": 0, "misses": 0, "last_delay_ms": 0})
+
+    def observe(self, step, response_seconds, idle=True):
+        """
+        Verbucht die gemessene Antwortzeit eines Schritts
+
+        Nach bestätigter Ruhe gilt die aktuelle Nachlaufzeit, die dabei weiter
+        abklingt. Nach Erreichen der Obergrenze wird nicht zusätzlich gewartet.
+
+        Args:
+            step (str): Schlüssel aus WAIT_LIMITS
+            response_seconds (float): Dauer bis die App ruhig war
+            idle (bool): False, wenn die Obergrenze erreicht wurde
+
+        Returns:
+            float: Nachlaufzeit in Sekunden (0 für Schritte ohne Nachlauf)
+        """
+        with self._lock:
+            delay_ms = self.settle_ms(step) if idle else 0
+            if step in self.delay_ms:
+                self.delay_ms[step] *= DECAY
+            stats = self._step_stats(step)
+            stats["count"] += 1
+            stats["response_ms"] += response_seconds * 1000
+            stats["delay_ms"] += delay_ms
+            stats["timeouts"] += not idle
+            stats["last_delay_ms"] = delay_ms
+        return delay_ms / 1000
+
+    def record_miss(self, step):
+        """
+        Meldet, dass nach step das erwartete Element noch fehlte
+
+        Verdoppelt die Nachlaufzeit des Schritts (mindestens miss_ms, höchstens max_ms).
+
+        Returns:
+            float: Neue Nachlaufzeit in Sekunden, die jetzt abgewartet werden sollte
+        """
+        if step not in SETTLE_STEPS:
+            return 0
+        with self._lock:
+            delay = max(self.delay_ms.get(step, 0) * 2, self.settings["miss_ms"])
+            self.delay_ms[step] = min(delay, self.settings["max_ms"])
+            stats = self._step_stats(step)
+            stats["misses"] += 1
+            delay_ms = self.settle_ms(step)
+            stats["delay_ms"] += delay_ms
+        return delay_ms / 1000
+
+    def summary(self):
+        """
+        Auswertung je Schritt
+
+        Returns:
+            dict: Schritt -> count, avg_response_ms, avg_delay_ms, last_delay_ms, timeouts, misses
+        """
+        with self._lock:
+            stats = {step: dict(values) for step, values in self.stats.items()}
+        return {
+            step: {
+                "count": values["count"],
+                "avg_response_ms": round(values["response_ms"] / values["count"]) if values["count"] else 0,
+                "avg_delay_ms": round(values["delay_ms"] / values["count"]) if values["count"] else 0,
+                "last_delay_ms": values["last_delay_ms"],
+                "timeouts": values["timeouts"],
+                "misses": values["misses"]
+            }
+            for step, values in stats.items()
+        }
+
+    def print_summary(self):
+        """Gibt Antwort- und Nachlaufzeiten je Schritt aus"""
+        summary = self.summary()
+        if not summary:
+            return
+        print(f"\n>> Pacing '{self.profile}':")
+        for step, values in sorted(summary.items()):
+            delay = (f", Nachlauf Ø {values['avg_delay_ms']} ms, {values['misses']} Fehlgriff(e)"
+                     if step in SETTLE_STEPS else "")
+            print(f"   {step:<10} {values['count']:>4}x  Antwort Ø {values['avg_response_ms']} ms{delay}")
+
+    def save(self, path=PACING_LOG_FILE):
+        """Hängt die Auswertung dieses Laufs (eine Zeile je Schritt) an das Pacing-Protokoll an"""
+        summary = self.summary()
+        if not summary:
+            return
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        run = datetime.now().isoformat(timespec="seconds")
+        with open(path, 'a', encoding='utf-8') as f:
+            for step, values in sorted(summary.items()):
+                f.write(json.dumps({"run": run, "profile": self.profile, "step": step, **values}) + "\n")
+
+_controller = None
+_controller_lock = threading.Lock()
+
+def get_pacing_controller():
+    """Liefert den PacingController des Prozesses"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = PacingController()
+        return _controller
+
+def set_pacing_profile(profile):
+    """Startet einen neuen PacingController mit dem gewählten Profil"""
+    global _controller
+    with _controller_lock:
+        _controller = PacingController(profile)
+        return _controller
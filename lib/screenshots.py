@@ -0,0 +1,221 @@
+"""
+screenshots.py - Screenshot-Regeln und Schreiben im Hintergrund
+===============================================================
+
+Bisher entstand nach jedem Artikel ein ganzseitiges PNG. Mit wachsendem
+Warenkorb wird die Seite länger, und Aufnahme, PNG-Kodierung und Schreiben
+gehören zu den teuersten Schritten je Artikel. Die ScreenshotPolicy legt
+fest, wann und was aufgenommen wird:
+
+Modus (--screenshots):
+    all         - nach jedem Artikel (bisheriges Verhalten)
+    every-n     - jeden N-ten Artikel (--screenshot-every) und fehlerhafte Artikel
+    on-failure  - nur Artikel, bei denen ein Schritt fehlgeschlagen ist
+    none        - keine Screenshots, auch nicht am Ende oder bei Fehlern
+
+Ausschnitt (--screenshot-scope):
+    page        - ganze Seite (bisheriges Verhalten)
+    viewport    - nur der sichtbare Bereich, unabhängig von der Warenkorb-Länge
+    element     - nur die Artikel-Ansicht, aufgenommen direkt vor dem Übernehmen
+
+Format (--screenshot-format): png oder jpeg (--screenshot-quality). Die
+Kodierung übernimmt Chromium; Playwright liefert nur die Bytes. Das Schreiben
+auf die Platte erledigt ein Hintergrund-Thread, sodass der Import nicht auf
+die Festplatte wartet.
+
+Verwendung:
+    from lib.screenshots import set_screenshot_policy, get_screenshot_policy
+    set_screenshot_policy("every-n", scope="viewport", every=10, image_format="jpeg")
+    screenshots = get_screenshot_policy()
+    if screenshots.wants_article(artikel_nr, ok):
+        screenshots.capture(page, f"excel_import_artikel_{artikel_nr}", temp_dir)
+"""
+
+import os
+import queue
+import threading
+from .session import get_session, ITEM_VIEW_MARKER
+
+MODE_ALL = "all"
+MODE_EVERY_N = "every-n"
+MODE_ON_FAILURE = "on-failure"
+MODE_NONE = "none"
+SCREENSHOT_MODES = (MODE_ALL, MODE_EVERY_N, MODE_ON_FAILURE, MODE_NONE)
+
+SCOPE_PAGE = "page"
+SCOPE_VIEWPORT = "viewport"
+SCOPE_ELEMENT = "element"
+SCREENSHOT_SCOPES = (SCOPE_PAGE, SCOPE_VIEWPORT, SCOPE_ELEMENT)
+
+SCREENSHOT_FORMATS = ("png", "jpeg")
+
+DEFAULT_MODE = MODE_ALL
+DEFAULT_SCOPE = SCOPE_PAGE
+DEFAULT_EVERY = 10
+DEFAULT_JPEG_QUALITY = 70
+
+# Artikel-Ansicht ohne bekanntes Komponenten-Präfix (ID endet auf "---idCatItemView")
+ITEM_VIEW_ROOT_SELECTOR = "[id$='" + ITEM_VIEW_MARKER.rstrip("-") + "']:visible"
+
+class ScreenshotWriter:
+    """Schreibt Screenshot-Bytes in einem Hintergrund-Thread auf die Platte"""
+
+    def __init__(self):
+        self.written = 0
+        self.bytes_written = 0
+        self.errors = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, path, data):
+        """Reiht eine Datei zum Schreiben ein"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((path, data))
+
+    def _run(self):
+        while True:
+            path, data = self._queue.get()
+            try:
+                with open(path, 'wb') as f:
+                    f.write(data)
+                self.written += 1
+                self.bytes_written += len(data)
+            except OSError as e:
+                self.errors += 1
+                print(f">> WARNUNG: Screenshot {path} nicht gespeichert: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Wartet, bis alle eingereihten Screenshots geschrieben sind"""
+        self._queue.join()
+
+class ScreenshotPolicy:
+    """Entscheidet, wann und in welchem Ausschnitt/Format aufgenommen wird"""
+
+    def __init__(self, mode=DEFAULT_MODE, scope=DEFAULT_SCOPE, every=DEFAULT_EVERY,
+                 image_format="png", quality=DEFAULT_JPEG_QUALITY):
+        if mode not in SCREENSHOT_MODES:
+            raise ValueError(f"Unbekannter Screenshot-Modus '{mode}' (verfügbar: {', '.join(SCREENSHOT_MODES)})")
+        if scope not in SCREENSHOT_SCOPES:
+            raise ValueError(f"Unbekannter Screenshot-Ausschnitt '{scope}' (verfügbar: {', '.join(SCREENSHOT_SCOPES)})")
+        if image_format not in SCREENSHOT_FORMATS:
+            raise ValueError(f"Unbekanntes Screenshot-Format '{image_format}'")
+        self.mode = mode
+        self.scope = scope
+        self.every = max(1, int(every))
+        self.image_format = image_format
+        self.quality = quality
+        self.writer = ScreenshotWriter()
+
+    @property
+    def enabled(self):
+        """False im Modus "none" - dann auch keine Abschluss- und Fehler-Screenshots"""
+        return self.mode != MODE_NONE
+
+    @property
+    def before_transfer(self):
+        """True, wenn Artikel-Screenshots vor dem Übernehmen entstehen (Ausschnitt "element")"""
+        return self.scope == SCOPE_ELEMENT
+
+    def wants_article(self, artikel_nr, ok=True):
+        """Soll nach (bzw. bei "element" vor dem Übernehmen von) Artikel artikel_nr aufgenommen werden?"""
+        if self.mode == MODE_ALL:
+            return True
+        if self.mode == MODE_EVERY_N:
+            return not ok or artikel_nr % self.every == 0
+        if self.mode == MODE_ON_FAILURE:
+            return not ok
+        return False
+
+    def _path(self, name, directory):
+        extension = "jpg" if self.image_format == "jpeg" else "png"
+        return os.path.join(directory, f"{name}.{extension}")
+
+    def _options(self, full_page):
+        options = {"type": self.image_format}
+        if self.image_format == "jpeg":
+            options["quality"] = self.quality
+        if full_page is not None:
+            options["full_page"] = full_page
+        return options
+
+    def _item_view(self, page):
+        """Locator der sichtbaren Artikel-Ansicht (oder None)"""
+        prefix = get_session(page).component_prefix
+        if prefix:
+            return page.locator(f"[id='{prefix}{ITEM_VIEW_MARKER.rstrip('-')}']")
+        return page.locator(ITEM_VIEW_ROOT_SELECTOR).first
+
+    def capture(self, page, name, directory, element=False):
+        """
+        Nimmt einen Screenshot auf und übergibt ihn dem Hintergrund-Thread
+
+        Args:
+            page: Playwright page object
+            name (str): Dateiname ohne Endung
+            directory (str): Zielordner
+            element (bool): Nur die Artikel-Ansicht aufnehmen (bei Ausschnitt "element")
+
+        Returns:
+            str: Pfad der Datei (wird ggf. noch geschrieben)
+        """
+        path = self._path(name, directory)
+        if element and self.scope == SCOPE_ELEMENT:
+            view = self._item_view(page)
+            if view.count() > 0:
+                self.writer.submit(path, view.screenshot(**self._options(None)))
+                return path
+        data = page.screenshot(**self._options(self.scope == SCOPE_PAGE))
+        self.writer.submit(path, data)
+        return path
+
+    async def capture_async(self, page, name, directory, element=False):
+        """Asynchrone Variante von capture() für die asyncio-Engine"""
+        path = self._path(name, directory)
+        if element and self.scope == SCOPE_ELEMENT:
+            view = self._item_view(page)
+            if await view.count() > 0:
+                self.writer.submit(path, await view.screenshot(**self._options(None)))
+                return path
+        data = await page.screenshot(**self._options(self.scope == SCOPE_PAGE))
+        self.writer.submit(path, data)
+        return path
+
+    def flush(self):
+        """Wartet auf alle ausstehenden Dateien"""
+        self.writer.flush()
+
+    def print_summary(self):
+        """Gibt Anzahl und Größe der geschriebenen Screenshots aus"""
+        self.flush()
+        if not self.writer.written:
+            return
+        megabytes = self.writer.bytes_written / (1024 * 1024)
+        print(f">> Screenshots ({self.mode}, {self.scope}, {self.image_format}): "
+              f"{self.writer.written} Dateien, {megabytes:.1f} MB")
+
+_policy = None
+_policy_lock = threading.Lock()
+
+def get_screenshot_policy():
+    """Liefert die ScreenshotPolicy des Prozesses"""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = ScreenshotPolicy()
+        return _policy
+
+def set_screenshot_policy(mode=DEFAULT_MODE, scope=DEFAULT_SCOPE, every=DEFAULT_EVERY,
+                          image_format="png", quality=DEFAULT_JPEG_QUALITY):
+    """Ersetzt die ScreenshotPolicy des Prozesses (ausstehende Dateien werden noch geschrieben)"""
+    global _policy
+    with _policy_lock:
+        if _policy is not None:
+            _policy.flush()
+        _policy = ScreenshotPolicy(mode, scope, every, image_format, quality)
+        return _policy
@@ -0,0 +1,163 @@
+"""
+selector_registry.py - Selektor-Listen nach bisheriger Trefferquote
+===================================================================
+
+Für manche Elemente (z.B. "Bearbeitung abschließen", "Neue Position
+anlegen", "Freitext") gibt es mehrere Selektoren, die nacheinander
+probiert werden. Jeder Fehlgriff kostet einen locator.count()-Aufruf.
+Die Registry merkt sich pro logischem Ziel, welcher Selektor getroffen
+hat, und zählt im Speicher mit. Am Ende des Laufs addiert save() die neuen
+Treffer auf die Zähler in .temp/selector_stats.json - so gehen auch bei
+mehreren Workern keine Treffer verloren. Spätere Läufe probieren zuerst die
+erfolgreichsten Selektoren. Trifft der bevorzugte Selektor nicht, wird wie
+bisher die restliche Liste probiert.
+
+Verwendung:
+    from lib.selector_registry import get_selector_registry
+    element, selector = get_selector_registry().find_first(page, "transfer_button", TRANSFER_SELECTORS)
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+SELECTOR_STATS_FILE = Path(".temp") / "selector_stats.json"
+
+# Längste Wartezeit auf die Sperre eines anderen Prozesses beim Speichern
+STATS_LOCK_SECONDS = 5
+
+class SelectorRegistry:
+    """Trefferzähler je Ziel und Selektor, persistent auf der Festplatte"""
+
+    def __init__(self, stats_file=SELECTOR_STATS_FILE):
+        self.stats_file = Path(stats_file)
+        self._lock = threading.Lock()
+        self.hits = self._load()
+        self._new_hits = {}     # Treffer seit dem letzten save()
+
+    def _load(self):
+        """Lädt die gespeicherten Trefferzähler"""
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {
+                target: {selector: int(count) for selector, count in selectors.items()}
+                for target, selectors in data.items()
+            }
+        except (FileNotFoundError, ValueError, AttributeError):
+            return {}
+
+    @contextmanager
+    def _file_lock(self):
+        """Sperrt die Statistik kurz gegen gleichzeitiges Zusammenführen anderer Prozesse"""
+        lock_file = self.stats_file.with_name(self.stats_file.name + ".lock")
+        deadline = time.monotonic() + STATS_LOCK_SECONDS
+        while True:
+            try:
+                os.close(os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                if time.monotonic() < deadline:
+                    time.sleep(0.05)
+                    continue
+                # Verwaiste Sperre eines abgebrochenen Prozesses
+                try:
+                    lock_file.unlink()
+                except FileNotFoundError:
+                    pass
+                deadline = time.monotonic() + STATS_LOCK_SECONDS
+        try:
+            yield
+        finally:
+            try:
+                lock_file.unlink()
+            except OSError:
+                pass
+
+    def save(self):
+        """
+        Addiert die Treffer seit dem letzten save() auf die gespeicherten Zähler
+
+        Andere Prozesse (--workers, Shards) können die Datei inzwischen
+        fortgeschrieben haben; sie wird deshalb unter einer Sperre neu gelesen.
+        """
+        with self._lock:
+            new_hits, self._new_hits = self._new_hits, {}
+        if not new_hits:
+            return
+        try:
+            self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._file_lock():
+                hits = self._load()
+                _add_hits(hits, new_hits)
+                tmp_file = self.stats_file.with_name(f"{self.stats_file.name}.{os.getpid()}.tmp")
+                tmp_file.write_text(json.dumps(hits, indent=2, ensure_ascii=False), encoding='utf-8')
+                tmp_file.replace(self.stats_file)
+        except OSError as e:
+            print(f">> WARNUNG: Selektor-Statistik nicht gespeichert: {e}")
+            with self._lock:
+                _add_hits(self._new_hits, new_hits)
+            return
+        with self._lock:
+            # Zwischenzeitliche Treffer dieses Prozesses bleiben erhalten
+            _add_hits(hits, self._new_hits)
+            self.hits = hits
+
+    def ordered(self, target, selectors):
+        """
+        Sortiert die Selektoren eines Ziels nach bisherigen Treffern
+
+        Bei gleicher Trefferzahl bleibt die ursprüngliche Reihenfolge erhalten.
+        """
+        with self._lock:
+            counts = dict(self.hits.get(target, {}))
+        return sorted(selectors, key=lambda selector: -counts.get(selector, 0))
+
+    def record_hit(self, target, selector):
+        """Zählt einen Treffer (gespeichert wird erst mit save() am Ende des Laufs)"""
+        with self._lock:
+            _add_hits(self.hits, {target: {selector: 1}})
+            _add_hits(self._new_hits, {target: {selector: 1}})
+
+    def find_first(self, page, target, selectors):
+        """
+        Sucht das erste vorhandene Element in der Reihenfolge der Trefferquote
+
+        Args:
+            page: Playwright page object
+            target (str): Logischer Name des Ziels, z.B. "transfer_button"
+            selectors (list): Alle bekannten Selektoren für das Ziel
+
+        Returns:
+            tuple: (locator.first, selector) oder (None, None)
+        """
+        for selector in self.ordered(target, selectors):
+            try:
+                elements = page.locator(selector)
+                if elements.count() > 0:
+                    self.record_hit(target, selector)
+                    return elements.first, selector
+            except Exception:
+                continue
+        return None, None
+
+def _add_hits(hits, new_hits):
+    """Addiert Trefferzähler (Ziel -> Selektor -> Anzahl) auf hits"""
+    for target, selectors in new_hits.items():
+        target_hits = hits.setdefault(target, {})
+        for selector, count in selectors.items():
+            target_hits[selector] = target_hits.get(selector, 0) + count
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_selector_registry():
+    """Liefert die gemeinsame Registry des Prozesses"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SelectorRegistry()
+        return _registry
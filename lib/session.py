@@ -0,0 +1,107 @@
+"""
+session.py - Sitzungsdaten je Browser-Seite
+===========================================
+
+Werte, die innerhalb einer easyBANF-Sitzung gleich bleiben, werden einmal
+ermittelt und pro Playwright-Seite zwischengespeichert - allen voran das
+Präfix der Artikel-Ansicht ("__componentNN---idCatItemView--"). Statt für
+jedes Feld __component11, 12 und 13 durchzuprobieren, wird das aktive
+Präfix nach der Navigation einmal gesucht, geprüft und direkt verwendet.
+Nur wenn ein Feld darüber nicht gefunden wird, wird es neu ermittelt.
+Ebenso wird das Verzeichnis des Kategorie-Baums einmal je Sitzung erstellt.
+
+Verwendung:
+    from lib.session import get_session, click_item_view_element
+"""
+
+import weakref
+
+# Trenner zwischen Komponenten-Präfix und Feld-Suffix
+ITEM_VIEW_MARKER = "---idCatItemView--"
+
+# Feld, an dem ein Präfix als gültig erkannt wird (Artikelbeschreibung)
+ITEM_VIEW_PROBE_SUFFIX = "MaterialText-inner"
+
+# Wartezeit (ms), bis ein Feld über das gecachte Präfix als "nicht gefunden" gilt
+FIELD_LOOKUP_TIMEOUT_MS = 2000
+
+# Sucht das Präfix der sichtbaren Artikel-Ansicht - unabhängig von der Komponentennummer
+DISCOVER_ITEM_VIEW_JS = '''([marker, probeSuffix]) => {
+    const candidates = document.querySelectorAll("[id$='" + marker + probeSuffix + "']");
+    let hidden = null;
+    for (const el of candidates) {
+        const prefix = el.id.slice(0, el.id.length - (marker + probeSuffix).length);
+        if (!prefix) continue;
+        if (el.offsetParent !== null) return prefix;
+        hidden = hidden || prefix;
+    }
+    return hidden;
+}'''
+
+class BanfSession:
+    """Zwischenspeicher für sitzungsweit gültige Werte einer Seite"""
+
+    def __init__(self):
+        self.component_prefix = None
+        # (Hauptkategorie, Unterkategorie) -> Baumeintrag, siehe complete_form_fill
+        self.category_index = None
+
+    def item_view_id(self, suffix):
+        """Vollständige Element-ID eines Felds der Artikel-Ansicht"""
+        return f"{self.component_prefix}{ITEM_VIEW_MARKER}{suffix}"
+
+    def invalidate_item_view(self):
+        """Verwirft das gecachte Präfix (nächster Zugriff ermittelt es neu)"""
+        self.component_prefix = None
+
+_sessions = weakref.WeakKeyDictionary()
+
+def get_session(page):
+    """Liefert das Sitzungsobjekt einer Seite (wird bei Bedarf angelegt)"""
+    session = _sessions.get(page)
+    if session is None:
+        session = BanfSession()
+        _sessions[page] = session
+    return session
+
+def discover_item_view(page):
+    """
+    Ermittelt das aktive Präfix der Artikel-Ansicht und speichert es in der Sitzung
+
+    Returns:
+        str: Präfix wie "__component12" oder None wenn keine Artikel-Ansicht offen ist
+    """
+    session = get_session(page)
+    try:
+        session.component_prefix = page.evaluate(
+            DISCOVER_ITEM_VIEW_JS, [ITEM_VIEW_MARKER, ITEM_VIEW_PROBE_SUFFIX]
+        )
+    except Exception:
+        session.component_prefix = None
+    return session.component_prefix
+
+def click_item_view_element(page, suffix):
+    """
+    Klickt ein Feld der Artikel-Ansicht über das gecachte Präfix an
+
+    Schlägt der Klick fehl, wird das Präfix einmal neu ermittelt und der
+    Klick wiederholt.
+
+    Args:
+        page: Playwright page object
+        suffix (str): Feld-Suffix, z.B. "MaterialText-inner"
+
+    Returns:
+        Locator des angeklickten Felds oder None
+    """
+    session = get_session(page)
+    for _ in range(2):
+        if session.component_prefix is None and discover_item_view(page) is None:
+            return None
+        element = page.locator(f"[id='{session.item_view_id(suffix)}']")
+        try:
+            element.click(timeout=FIELD_LOOKUP_TIMEOUT_MS)
+            return element
+        except Exception:
+            session.invalidate_item_view()
+    return None
@@ -0,0 +1,196 @@
+"""
+sharding.py - Paralleler Import in mehreren Browser-Kontexten
+=============================================================
+
+Große Bestellungen sind durch die SAP-Antwortzeiten begrenzt, nicht durch
+die CPU. Deshalb werden die Zeilen des Artikel_Import-Blatts in N Shards
+aufgeteilt - nach Zeilenzahl oder nach einer Gruppierungsspalte wie
+"Kontierungsobjekt" - und jeder Shard in einem eigenen Browser-Kontext mit
+eigenem easyBANF-Warenkorb verarbeitet. Angemeldet wird nur einmal; alle
+Shards übernehmen die Sitzung über den storage_state.
+
+Die Sync-API von Playwright ist an ihren Thread gebunden, daher läuft jeder
+Shard in einem eigenen Thread mit eigener Playwright-Instanz.
+
+Verwendung:
+    from lib.sharding import split_into_shards, run_sharded_import
+"""
+
+import threading
+import time
+from .autobanf_base import (
+    create_browser_page,
+    load_saved_session,
+    login_with_saved_session,
+    navigate_to_artikel_page,
+    close_browser_safely
+)
+
+def split_into_shards(df, shard_count, group_column=None):
+    """
+    Teilt die Artikel-Zeilen in Shards auf
+
+    Ohne Gruppierungsspalte werden die Zeilen in zusammenhängende Blöcke
+    gleicher Größe geteilt. Mit Gruppierungsspalte bleibt jede Gruppe in
+    einem Shard; die Gruppen werden nach Größe auf die Shards verteilt.
+
+    Args:
+        df (DataFrame): Artikel-Zeilen (Index bleibt erhalten)
+        shard_count (int): Gewünschte Anzahl Shards
+        group_column (str): Spalte, deren Gruppen nicht geteilt werden (optional)
+
+    Returns:
+        list: Liste nicht-leerer DataFrames (leer, wenn df keine Zeilen hat)
+    """
+    if df.empty:
+        return []
+    shard_count = max(1, min(shard_count, len(df)))
+
+    if group_column is None:
+        shard_size = -(-len(df) // shard_count)
+        return [df.iloc[i:i + shard_size] for i in range(0, len(df), shard_size)]
+
+    if group_column not in df.columns:
+        raise ValueError(f"Spalte '{group_column}' nicht im Excel-Blatt vorhanden")
+
+    # Größte Gruppen zuerst in den jeweils kleinsten Shard
+    groups = sorted(
+        (group for _, group in df.groupby(group_column, sort=False, dropna=False)),
+        key=len,
+        reverse=True
+    )
+    buckets = [[] for _ in range(shard_count)]
+    sizes = [0] * shard_count
+    for group in groups:
+        target = sizes.index(min(sizes))
+        buckets[target].append(group)
+        sizes[target] += len(group)
+
+    return [
+        df.loc[sorted(index for group in bucket for index in group.index)]
+        for bucket in buckets if bucket
+    ]
+
+def export_login_state(username, password, reuse_session=True):
+    """
+    Meldet sich einmal an und gibt den storage_state der Sitzung zurück
+
+    Args:
+        username (str): HSA-Benutzername
+        password (str): HSA-Passwort
+        reuse_session (bool): Gespeicherte Sitzung aus .credentials/ wiederverwenden
+
+    Returns:
+        dict: storage_state oder None bei Fehler
+    """
+    browser, page = create_browser_page(headless=True, slow_mo=0,
+                                        storage_state=load_saved_session(reuse_session))
+    try:
+        login_with_saved_session(page, username, password, reuse_session)
+        return page.context.storage_state()
+    except Exception as e:
+        print(f">> Fehler beim gemeinsamen Login: {e}")
+        return None
+    finally:
+        close_browser_safely(browser)
+
+def _run_shard(shard_nr, shard_df, username, password, storage_state, process_shard, results):
+    """Verarbeitet einen Shard in einem eigenen Browser-Kontext"""
+    result = {
+        "shard": shard_nr,
+        "rows": len(shard_df),
+        "processed": 0,
+        "success": 0,
+        "fields": 0,
+        "seconds": 0.0,
+        "error": None
+    }
+    started = time.monotonic()
+    browser = None
+
+    try:
+        browser, page = create_browser_page(storage_state=storage_state)
+        success, browser, page = navigate_to_artikel_page(
+            username, password, browser, page, create_screenshots=False
+        )
+        if not success:
+            result["error"] = "Navigation zur Artikel-Seite fehlgeschlagen"
+        else:
+            result.update(process_shard(page, shard_df, shard_nr))
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        if browser is not None:
+            close_browser_safely(browser)
+        result["seconds"] = time.monotonic() - started
+        results[shard_nr] = result
+
+def run_sharded_import(df, username, password, shard_count, process_shard, group_column=None,
+                       reuse_session=True):
+    """
+    Importiert die Artikel parallel in mehreren Browser-Kontexten
+
+    Args:
+        df (DataFrame): Artikel-Zeilen
+        username (str): HSA-Benutzername
+        password (str): HSA-Passwort
+        shard_count (int): Anzahl paralleler Shards
+        process_shard (callable): process_shard(page, shard_df, shard_nr) -> dict
+            mit den Schlüsseln processed, success, fields
+        group_column (str): Gruppierungsspalte (optional)
+        reuse_session (bool): Gespeicherte Sitzung aus .credentials/ wiederverwenden
+
+    Returns:
+        list: Ergebnis je Shard (dict)
+    """
+    shards = split_into_shards(df, shard_count, group_column)
+    if not shards:
+        print("ABBRUCH: Keine Artikel-Zeilen in der Excel-Datei - nichts zu importieren")
+        return []
+    print(f"\n>> {len(df)} Artikel auf {len(shards)} Shards verteilt:")
+    for shard_nr, shard_df in enumerate(shards, start=1):
+        print(f"   Shard {shard_nr}: {len(shard_df)} Artikel")
+
+    print("\n>> Gemeinsames Login für alle Shards...")
+    storage_state = export_login_state(username, password, reuse_session)
+    if storage_state is None:
+        return []
+
+    results = {}
+    threads = [
+        threading.Thread(
+            target=_run_shard,
+            args=(shard_nr, shard_df, username, password, storage_state, process_shard, results),
+            name=f"autobanf-shard-{shard_nr}"
+        )
+        for shard_nr, shard_df in enumerate(shards, start=1)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return [results[shard_nr] for shard_nr in sorted(results)]
+
+def print_shard_summary(results):
+    """Gibt die zusammengeführte Übersicht aller Shards aus"""
+    print(f"\n{'='*60}")
+    print("SHARD-ÜBERSICHT")
+    print(f"{'='*60}")
+    print(f"{'Shard':>5}  {'Artikel':>9}  {'Felder OK':>11}  {'Dauer':>8}  Status")
+
+    total_rows = total_processed = total_success = total_fields = 0
+    for result in results:
+        status = "OK" if result["error"] is None else f"FEHLER: {result['error']}"
+        print(f"{result['shard']:>5}  {result['processed']:>4}/{result['rows']:<4}  "
+              f"{result['success']:>5}/{result['fields']:<5}  {result['seconds']:>7.1f}s  {status}")
+        total_rows += result["rows"]
+        total_processed += result["processed"]
+        total_success += result["success"]
+        total_fields += result["fields"]
+
+    print(f"{'-'*60}")
+    print(f"Artikel verarbeitet: {total_processed}/{total_rows}")
+    if total_fields:
+        print(f"Gesamterfolg: {total_success}/{total_fields} Felder ({total_success/total_fields*100:.1f}%)")
+    print(f"{'='*60}")
@@ -0,0 +1,223 @@
+"""
+step_trace.py - Zeitmessung je Schritt mit Auswertung am Ende des Laufs
+=======================================================================
+
+Bisher gab es am Ende nur success_count - wo die Zeit bleibt, war nicht zu
+sehen. Jeder logische Schritt (Login, Navigationsschritte, Kategorie, jedes
+Feld, Übernehmen, Screenshot, Warten auf UI5 und Nachlaufzeiten) wird
+gemessen und als eine Zeile in .temp/traces/trace_<Zeitstempel>.jsonl
+geschrieben (start_trace() beginnt je Import-Lauf bzw. Datei eine neue):
+
+    {"step": "field", "ms": 412.3, "ok": true, "type": "dropdown", "field": "Waehrung", "artikel": 3}
+
+Am Ende listet print_trace_report() p50/p95/max je Schritt, je Feldtyp
+("field[dropdown]") und je Feld ("field: Waehrung"), sortiert nach der
+Gesamtzeit - die teuersten Schritte stehen oben. Schritte können
+ineinander liegen ("article" enthält "field", "field" enthält "wait").
+Im Speicher bleiben je Gruppe nur Summen und die letzten SAMPLES_PER_GROUP
+Werte für die Perzentile, damit auch tagelange --watch-Läufe nicht wachsen.
+
+Verwendung:
+    from lib.step_trace import trace_step, trace_laps, print_trace_report
+
+    with trace_step("field", type="dropdown", field="Waehrung"):
+        ...
+
+    laps = trace_laps("navigation")
+    ...                     # Schritt 1
+    laps.lap("login")
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+TRACE_DIR = Path(".temp") / "traces"
+
+# Attribute, nach denen zusätzlich gruppiert wird
+GROUP_TYPE = "type"
+GROUP_FIELD = "field"
+
+# Messwerte je Gruppe, aus denen p50/p95 berechnet werden
+SAMPLES_PER_GROUP = 2000
+
+def percentile(values, fraction):
+    """Perzentil nach dem Rangverfahren (values muss sortiert sein)"""
+    if not values:
+        return 0.0
+    rank = max(int(round(fraction * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+class StepTracer:
+    """Sammelt Schritt-Zeiten eines Laufs und schreibt sie als JSONL"""
+
+    def __init__(self, trace_dir=TRACE_DIR, label=None):
+        name = f"trace_{datetime.now():%Y%m%d_%H%M%S}" + (f"_{label}" if label else "")
+        self.path = Path(trace_dir) / f"{name}.jsonl"
+        self.groups = {}    # Gruppe -> count, total, max, samples
+        self._file = None
+        self._lock = threading.Lock()
+
+    def record(self, step, seconds, ok=True, **attrs):
+        """Verbucht einen gemessenen Schritt"""
+        entry = {"step": step, "ms": round(seconds * 1000, 1), "ok": ok}
+        entry.update({key: value for key, value in attrs.items() if value is not None})
+        with self._lock:
+            self._add_to_groups(entry)
+            try:
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, 'a', encoding='utf-8')
+                self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError:
+                pass
+
+    def _add_to_groups(self, entry):
+        """Verbucht einen Eintrag in seinen Gruppen (Schritt, Feldtyp, Feld)"""
+        step = entry["step"]
+        keys = [step]
+        if GROUP_TYPE in entry:
+            keys.append(f"{step}[{entry[GROUP_TYPE]}]")
+        if GROUP_FIELD in entry:
+            keys.append(f"{step}: {entry[GROUP_FIELD]}")
+        for key in keys:
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = {"count": 0, "total": 0.0, "max": 0.0,
+                                            "samples": deque(maxlen=SAMPLES_PER_GROUP)}
+            group["count"] += 1
+            group["total"] += entry["ms"]
+            group["max"] = max(group["max"], entry["ms"])
+            group["samples"].append(entry["ms"])
+
+    def close(self):
+        """Schreibt die Trace-Datei vollständig auf die Platte"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def report(self):
+        """
+        Auswertung je Schritt, Feldtyp und Feld
+
+        Returns:
+            list: dicts mit group, count, p50, p95, max, total (ms), nach total absteigend
+        """
+        with self._lock:
+            groups = {key: (group["count"], group["total"], group["max"], sorted(group["samples"]))
+                      for key, group in self.groups.items()}
+
+        rows = []
+        for group, (count, total, maximum, values) in groups.items():
+            rows.append({
+                "group": group,
+                "count": count,
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "max": maximum,
+                "total": total
+            })
+        rows.sort(key=lambda row: row["total"], reverse=True)
+        return rows
+
+    def print_report(self, limit=40):
+        """Gibt die Zeiten je Schritt als Tabelle aus (teuerste zuerst)"""
+        rows = self.report()
+        if not rows:
+            return
+        print(f"\n{'='*78}")
+        print("SCHRITT-ZEITEN (ms)")
+        print(f"{'='*78}")
+        print(f"{'Schritt':<38} {'Anzahl':>6} {'p50':>7} {'p95':>7} {'max':>7} {'Summe':>9}")
+        print(f"{'-'*78}")
+        for row in rows[:limit]:
+            print(f"{row['group'][:38]:<38} {row['count']:>6} {row['p50']:>7.0f} {row['p95']:>7.0f} "
+                  f"{row['max']:>7.0f} {row['total']:>9.0f}")
+        if len(rows) > limit:
+            print(f"   ... {len(rows) - limit} weitere Gruppen in {self.path}")
+        print(f"{'='*78}")
+        print(f"Trace: {self.path}")
+
+class StepLaps:
+    """Misst aufeinanderfolgende Schritte eines Ablaufs (z.B. Navigation)"""
+
+    def __init__(self, tracer, step, **attrs):
+        self.tracer = tracer
+        self.step = step
+        self.attrs = attrs
+        self._last = time.perf_counter()
+
+    def lap(self, name, ok=True):
+        """Verbucht die Zeit seit dem letzten lap() unter type=name"""
+        now = time.perf_counter()
+        self.tracer.record(self.step, now - self._last, ok, **{GROUP_TYPE: name}, **self.attrs)
+        self._last = now
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def get_step_tracer():
+    """Liefert den StepTracer des laufenden Imports"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = StepTracer()
+        return _tracer
+
+def start_trace(label=None):
+    """
+    Beginnt eine neue Trace-Datei (je Import-Lauf bzw. je Datei im Stapel)
+
+    Args:
+        label (str): Zusatz im Dateinamen, z.B. der Name der Excel-Datei
+    """
+    global _tracer
+    with _tracer_lock:
+        if _tracer is not None:
+            _tracer.close()
+        _tracer = StepTracer(label=label)
+        return _tracer
+
+def record_step(step, seconds, ok=True, **attrs):
+    """Verbucht einen anderweitig gemessenen Schritt"""
+    get_step_tracer().record(step, seconds, ok, **attrs)
+
+@contextmanager
+def trace_step(step, **attrs):
+    """
+    Misst die Dauer des with-Blocks
+
+    Wirft der Block eine Exception, wird der Schritt mit ok=false verbucht.
+    """
+    started = time.perf_counter()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        get_step_tracer().record(step, time.perf_counter() - started, ok, **attrs)
+
+def trace_laps(step, **attrs):
+    """Startet eine Rundenmessung für aufeinanderfolgende Schritte"""
+    return StepLaps(get_step_tracer(), step, **attrs)
+
+def print_trace_report():
+    """
+    Gibt die Auswertung aus und schließt die Trace-Datei
+
+    Danach gemessene Schritte landen in einem neuen Trace.
+    """
+    global _tracer
+    with _tracer_lock:
+        tracer, _tracer = _tracer, None
+    if tracer is None:
+        return
+    tracer.print_report()
+    tracer.close()
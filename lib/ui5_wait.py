@@ -0,0 +1,219 @@
+"""
+ui5_wait.py - Ereignisgesteuertes Warten auf SAPUI5
+===================================================
+
+Ersetzt die festen time.sleep()-Pausen der Automatisierung. Gewartet wird
+nur so lange, bis die SAPUI5-App wirklich ruhig ist:
+- keine offenen OData-/XHR-/fetch-Requests
+- kein sichtbarer Busy-Indikator
+- keine laufenden Animationen (CSS/Web Animations, jQuery)
+- keine ausstehenden UI5-Rerenderings
+
+Jeder logische Schritt hat eine eigene Obergrenze in WAIT_LIMITS (Sekunden).
+Ist die App bis dahin nicht ruhig, geht es trotzdem weiter - genau wie
+früher nach Ablauf der festen Pause. Die gemessene Dauer geht an den
+PacingController (pacing.py). Fehlt nach einem Schritt trotzdem das
+erwartete Element, meldet settle_after_miss() den Fehlgriff und wartet die
+dadurch erhöhte Nachlaufzeit ab.
+
+Verwendung:
+    from lib.ui5_wait import wait_for_ui5_idle
+    wait_for_ui5_idle(page, "dropdown")
+"""
+
+import itertools
+import time
+import weakref
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from .pacing import get_pacing_controller
+from .step_trace import record_step
+
+# Obergrenzen je Schritt in Sekunden (können zur Laufzeit angepasst werden)
+WAIT_LIMITS = {
+    "default": 5.0,
+    "login": 15.0,
+    "navigation": 15.0,
+    "field": 2.0,
+    "dropdown": 3.0,
+    "dialog": 5.0,
+    "category": 5.0,
+    "transfer": 10.0,
+    "position": 10.0,
+}
+
+# So lange (ms) muss die App am Stück ruhig sein, damit sie als idle gilt
+QUIET_PERIOD_MS = 150
+
+# Abfrageintervall im Browser (ms)
+POLLING_INTERVAL_MS = 50
+
+# Zählt offene XHR-/fetch-Requests im Fenster. Wird als Init-Script in jedes
+# neue Dokument eingehängt und zusätzlich beim ersten Idle-Check nachgerüstet.
+IDLE_HOOK_JS = '''
+(() => {
+    if (window.__autobanfIdle) return;
+    const state = { pending: 0, idleSince: 0 };
+    window.__autobanfIdle = state;
+
+    const origOpen = XMLHttpRequest.prototype.open;
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function() {
+        this.__autobanfTracked = false;
+        return origOpen.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function() {
+        if (!this.__autobanfTracked) {
+            this.__autobanfTracked = true;
+            state.pending++;
+            this.addEventListener('loadend', () => {
+                state.pending = Math.max(0, state.pending - 1);
+            }, { once: true });
+        }
+        return origSend.apply(this, arguments);
+    };
+
+    if (window.fetch) {
+        const origFetch = window.fetch;
+        window.fetch = function() {
+            state.pending++;
+            return origFetch.apply(this, arguments).finally(() => {
+                state.pending = Math.max(0, state.pending - 1);
+            });
+        };
+    }
+})();
+'''
+
+# Erwartet {quietMs, token}: ein neues token je Wartevorgang setzt idleSince
+# zurück, damit eine Ruhephase vor dem Klick nicht mitgezählt wird.
+UI5_IDLE_JS = '''({quietMs, token}) => {
+    ''' + IDLE_HOOK_JS + '''
+    const state = window.__autobanfIdle;
+    if (state.waitToken !== token) {
+        state.waitToken = token;
+        state.idleSince = 0;
+    }
+    const isShown = (el) => el && el.offsetParent !== null && el.offsetHeight > 0;
+
+    let busy = document.readyState !== 'complete' || state.pending > 0;
+
+    if (!busy) {
+        const indicators = document.querySelectorAll(
+            '#sapUiBusyIndicator, .sapUiLocalBusyIndicator, .sapMBusyIndicator, .sapUiBlockLayerOnly'
+        );
+        busy = Array.from(indicators).some(isShown);
+    }
+
+    if (!busy && window.sap && sap.ui && sap.ui.getCore) {
+        try {
+            const core = sap.ui.getCore();
+            busy = !!(core.getUIDirty && core.getUIDirty());
+        } catch (e) {}
+    }
+
+    if (!busy && window.jQuery && jQuery.timers) {
+        busy = jQuery.timers.length > 0;
+    }
+
+    if (!busy && document.getAnimations) {
+        busy = document.getAnimations().some(a => {
+            if (a.playState !== 'running') return false;
+            const timing = a.effect && a.effect.getTiming ? a.effect.getTiming() : {};
+            return timing.iterations !== Infinity;
+        });
+    }
+
+    if (busy) {
+        state.idleSince = 0;
+        return false;
+    }
+    if (!state.idleSince) {
+        state.idleSince = performance.now();
+    }
+    return performance.now() - state.idleSince >= quietMs;
+}'''
+
+_hooked_pages = weakref.WeakSet()
+_wait_tokens = itertools.count(1)
+
+def idle_wait_arg():
+    """Argument für UI5_IDLE_JS mit neuem Token für einen Wartevorgang"""
+    return {"quietMs": QUIET_PERIOD_MS, "token": next(_wait_tokens)}
+
+def install_idle_hook(page):
+    """Hängt den Request-Zähler in alle künftigen Dokumente der Seite ein"""
+    if page in _hooked_pages:
+        return
+    try:
+        page.add_init_script(IDLE_HOOK_JS)
+    except Exception:
+        pass
+    _hooked_pages.add(page)
+
+def wait_for_ui5_idle(page, step="default", timeout=None):
+    """
+    Wartet, bis die SAPUI5-App ruhig ist - höchstens bis zur Obergrenze des Schritts
+
+    Danach folgt ggf. die Nachlaufzeit des PacingControllers.
+
+    Args:
+        page: Playwright page object
+        step (str): Schlüssel in WAIT_LIMITS (z.B. "dropdown", "navigation")
+        timeout (float): Obergrenze in Sekunden, überschreibt WAIT_LIMITS
+
+    Returns:
+        bool: True wenn die App ruhig ist, False wenn die Obergrenze erreicht wurde
+    """
+    if timeout is None:
+        timeout = WAIT_LIMITS.get(step, WAIT_LIMITS["default"])
+
+    install_idle_hook(page)
+    started = time.monotonic()
+    idle = _wait_until_idle(page, started + timeout)
+
+    waited = time.monotonic() - started
+    record_step("wait", waited, idle, type=step)
+
+    delay = get_pacing_controller().observe(step, waited, idle)
+    if delay:
+        time.sleep(delay)
+        record_step("settle", delay, type=step)
+    return idle
+
+def settle_after_miss(step):
+    """
+    Meldet einen Fehlgriff nach step und wartet die erhöhte Nachlaufzeit ab
+
+    Danach lohnt sich ein zweiter Blick auf das erwartete Element.
+
+    Args:
+        step (str): Schritt, nach dem das Element fehlte (SETTLE_STEPS in pacing.py)
+    """
+    delay = get_pacing_controller().record_miss(step)
+    if delay:
+        time.sleep(delay)
+        record_step("settle", delay, type=step)
+
+def _wait_until_idle(page, deadline):
+    """Pollt UI5_IDLE_JS bis zur Ruhe oder bis zum Zeitpunkt deadline"""
+    arg = idle_wait_arg()
+    while True:
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        if remaining_ms <= 0:
+            return False
+        try:
+            page.wait_for_function(
+                UI5_IDLE_JS,
+                arg=arg,
+                timeout=remaining_ms,
+                polling=POLLING_INTERVAL_MS
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        except Exception:
+            # Kontext wurde durch eine Navigation zerstört - im neuen Dokument weiter prüfen
+            try:
+                page.wait_for_load_state("domcontentloaded", timeout=max(remaining_ms, 1))
+            except Exception:
+                return False
@@ -0,0 +1,179 @@
+"""
+validation.py - Prüfung der Artikelliste vor dem Browserstart
+=============================================================
+
+Fehlerhafte Werte fielen bisher erst mitten im Import auf - nach Minuten
+Browserzeit und mit einem halb gefüllten Warenkorb. Die Prüfung läuft
+deshalb vor der Anmeldung über alle aufbereiteten Zeilen und meldet alle
+Probleme auf einmal:
+
+- Dropdown-Werte gegen DROPDOWN_CONFIG, Einheit gegen KNOWN_UNITS
+- Kategorie im Format "Hauptkategorie->Unterkategorie"
+- Zahlen in deutscher Notation, Bestellmenge größer 0
+- Angebotsdatum TT.MM.JJJJ, Laufzeit "TT.MM.JJJJ - TT.MM.JJJJ"
+- Pflichtfelder (Kategorie, Artikelbeschreibung)
+
+Ohne Browser prüfen:  python autoBANF.py DATEI --validate
+Vor jedem Import läuft dieselbe Prüfung automatisch (check_records).
+
+Verwendung:
+    from lib.validation import validate_records, print_validation_report
+    problems = validate_records(normalize_articles(df))
+"""
+
+import re
+from datetime import datetime
+from .complete_form_fill import ARTICLE_FIELDS, DROPDOWN_CONFIG, KNOWN_UNITS
+
+REQUIRED_COLUMNS = ['Kategorie', 'Artikelbeschreibung']
+
+GERMAN_NUMBER = re.compile(r"^-?\d+(,\d+)?$")
+GERMAN_DATE = re.compile(r"^\d{2}\.\d{2}\.\d{4}$")
+DATE_RANGE = re.compile(r"^(\S+) - (\S+)$")
+
+def _parse_date(value):
+    """TT.MM.JJJJ als datetime oder None"""
+    if not GERMAN_DATE.match(value):
+        return None
+    try:
+        return datetime.strptime(value, "%d.%m.%Y")
+    except ValueError:
+        return None
+
+def _check_category(value):
+    """Fehlermeldung für die Kategorie oder None"""
+    main, separator, sub = value.partition("->")
+    if not separator:
+        return "Format 'Hauptkategorie->Unterkategorie' erwartet"
+    if not main.strip() or not sub.strip():
+        return "Haupt- oder Unterkategorie leer"
+    return None
+
+def _check_field(field_spec, value):
+    """Fehlermeldung für einen Formularwert oder None"""
+    column = field_spec["column"]
+    field_type = field_spec["type"]
+
+    if field_type == "dropdown":
+        options = DROPDOWN_CONFIG[field_spec["field"]]["options"]
+        if value not in options:
+            return f"nicht erlaubt (erlaubt: {', '.join(options)})"
+    elif field_type == "combobox":
+        if value not in KNOWN_UNITS:
+            return f"unbekannte Einheit (bekannt: {', '.join(KNOWN_UNITS)})"
+    elif field_type == "numeric":
+        if not GERMAN_NUMBER.match(value):
+            return "keine Zahl (erwartet z.B. 1,23)"
+        if column == 'Bestellmenge' and float(value.replace(",", ".")) <= 0:
+            return "muss größer 0 sein"
+    elif column == 'Angebotsdatum':
+        if _parse_date(value) is None:
+            return "kein gültiges Datum TT.MM.JJJJ"
+    elif column == 'Laufzeit':
+        match = DATE_RANGE.match(value)
+        start = _parse_date(match.group(1)) if match else None
+        end = _parse_date(match.group(2)) if match else None
+        if start is None or end is None:
+            return "Format 'TT.MM.JJJJ - TT.MM.JJJJ' erwartet"
+        if end < start:
+            return "Ende liegt vor dem Beginn"
+    return None
+
+def validate_record(record):
+    """
+    Prüft einen aufbereiteten Artikel
+
+    Args:
+        record (ArticleRecord): Artikel aus normalize_articles()
+
+    Returns:
+        list: Probleme als dict mit row, column, value, message
+    """
+    problems = []
+
+    def add(column, value, message):
+        problems.append({
+            "row": record.index + 2,  # Excel-Zeile (Kopfzeile = 1)
+            "column": column,
+            "value": value,
+            "message": message
+        })
+
+    for column in REQUIRED_COLUMNS:
+        if record.get(column) is None:
+            add(column, None, "Pflichtfeld leer")
+
+    kategorie = record.get('Kategorie')
+    if kategorie is not None:
+        message = _check_category(kategorie)
+        if message:
+            add('Kategorie', kategorie, message)
+
+    for field_spec in ARTICLE_FIELDS:
+        value = record.get(field_spec["column"])
+        if value is None:
+            continue
+        message = _check_field(field_spec, value)
+        if message:
+            add(field_spec["column"], value, message)
+
+    return problems
+
+def validate_records(records):
+    """Prüft alle Artikel und gibt die Probleme aller Zeilen zurück"""
+    problems = []
+    for record in records:
+        problems.extend(validate_record(record))
+    return problems
+
+def validated_records(records, problems):
+    """
+    Gibt nur fehlerfreie Artikel weiter (für gestreamte Zeilen)
+
+    Probleme übersprungener Zeilen werden an problems angehängt.
+
+    Yields:
+        ArticleRecord
+    """
+    for record in records:
+        record_problems = validate_record(record)
+        if record_problems:
+            problems.extend(record_problems)
+            print(f"   WARNUNG: Zeile {record.index + 2} übersprungen ({len(record_problems)} Problem(e))")
+            continue
+        yield record
+
+def print_validation_report(problems, row_count=None):
+    """Gibt alle gefundenen Probleme gesammelt aus"""
+    print(f"\n{'='*60}")
+    print("PRÜFUNG DER EXCEL-DATEI")
+    print(f"{'='*60}")
+    if not problems:
+        suffix = f" ({row_count} Artikel)" if row_count is not None else ""
+        print(f"Keine Probleme gefunden{suffix}")
+        print(f"{'='*60}")
+        return
+
+    rows = sorted({problem["row"] for problem in problems})
+    for problem in sorted(problems, key=lambda p: p["row"]):
+        value = "" if problem["value"] is None else f" '{problem['value']}'"
+        print(f"   Zeile {problem['row']}, {problem['column']}{value}: {problem['message']}")
+    print(f"{'-'*60}")
+    print(f"{len(problems)} Problem(e) in {len(rows)} Zeile(n)")
+    print(f"{'='*60}")
+
+def check_records(records):
+    """
+    Automatische Prüfung vor dem Import
+
+    Returns:
+        bool: True, wenn alle Artikel fehlerfrei sind (sonst Bericht ausgeben)
+    """
+    problems = validate_records(records)
+    if problems:
+        print_validation_report(problems, len(records))
+        print("ABBRUCH: Excel-Datei enthält ungültige Werte - Browser wird nicht gestartet")
+        print(">> Nur prüfen mit: python autoBANF.py DATEI --validate")
+        return False
+    print(f">> Prüfung: {len(records)} Artikel fehlerfrei")
+    return True
@@ -0,0 +1,126 @@
+"""
+watch_folder.py - Eingangsordner für Excel-Dateien überwachen
+=============================================================
+
+Im Eingangsordner (--watch ORDNER) abgelegte Excel-Dateien werden der
+Reihe nach importiert, ohne dass jemand autoBANF.py von Hand startet.
+Browser und Anmeldung bleiben zwischen den Dateien bestehen.
+
+Eine Datei gilt als fertig, wenn Größe und Änderungszeit über
+STABLE_SECONDS gleich bleiben und sie sich öffnen lässt - so wird keine
+Datei gelesen, die noch kopiert oder in Excel gespeichert wird. Danach
+wird sie verschoben:
+
+    ORDNER/processed/   erfolgreich importiert
+    ORDNER/failed/      Prüfung oder Import fehlgeschlagen; daneben
+                        <Datei>.fehler.txt mit dem Grund
+
+Excel-Sperrdateien (~$...) und andere Dateitypen werden ignoriert.
+
+Verwendung:
+    from lib.watch_folder import InboxWatcher
+    watcher = InboxWatcher("eingang")
+    for path in watcher.ready_files(): ...
+    watcher.move_done(path, ok=True)
+"""
+
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Dateitypen, die importiert werden
+WORKBOOK_SUFFIXES = (".xlsx", ".xlsm")
+
+PROCESSED_DIR_NAME = "processed"
+FAILED_DIR_NAME = "failed"
+
+# Prüfintervall und Wartezeit, bis eine Datei als vollständig gilt
+POLL_SECONDS = 5
+STABLE_SECONDS = 10
+
+class InboxWatcher:
+    """Erkennt neue, vollständig geschriebene Excel-Dateien im Eingangsordner"""
+
+    def __init__(self, inbox, stable_seconds=STABLE_SECONDS):
+        self.inbox = Path(inbox)
+        self.processed_dir = self.inbox / PROCESSED_DIR_NAME
+        self.failed_dir = self.inbox / FAILED_DIR_NAME
+        self.stable_seconds = stable_seconds
+        self._seen = {}     # Pfad -> (Größe, Änderungszeit, seit wann unverändert)
+        for directory in (self.inbox, self.processed_dir, self.failed_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def _candidates(self):
+        """Excel-Dateien direkt im Eingangsordner (ohne Unterordner)"""
+        for path in self.inbox.iterdir():
+            if path.is_file() and path.suffix.lower() in WORKBOOK_SUFFIXES and not path.name.startswith("~$"):
+                yield path
+
+    def ready_files(self, now=None):
+        """
+        Liefert die Dateien, die seit stable_seconds unverändert sind
+
+        Returns:
+            list: Pfade, älteste Datei zuerst
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+        present = set()
+        for path in self._candidates():
+            present.add(path)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime)
+            previous = self._seen.get(path)
+            if previous is None or previous[:2] != signature:
+                self._seen[path] = (*signature, now)
+                continue
+            if now - previous[2] >= self.stable_seconds and _readable(path):
+                ready.append((stat.st_mtime, path))
+        # Entfernte oder verschobene Dateien vergessen
+        for path in list(self._seen):
+            if path not in present:
+                del self._seen[path]
+        return [path for _, path in sorted(ready)]
+
+    def _target(self, directory, path):
+        """Zielpfad ohne Überschreiben (bei gleichem Namen mit Zeitstempel)"""
+        target = directory / path.name
+        if target.exists():
+            target = directory / f"{path.stem}_{datetime.now():%Y%m%d_%H%M%S}{path.suffix}"
+        return target
+
+    def move_done(self, path, ok, reason=None):
+        """
+        Verschiebt eine bearbeitete Datei nach processed/ bzw. failed/
+
+        Args:
+            path (Path): Datei im Eingangsordner
+            ok (bool): Import erfolgreich
+            reason (str): Fehlergrund, wird als <Datei>.fehler.txt daneben abgelegt
+
+        Returns:
+            Path: neuer Pfad der Datei
+        """
+        target = self._target(self.processed_dir if ok else self.failed_dir, Path(path))
+        shutil.move(str(path), str(target))
+        self._seen.pop(Path(path), None)
+        if not ok and reason:
+            note = target.with_name(target.name + ".fehler.txt")
+            note.write_text(f"{datetime.now().isoformat(timespec='seconds')}\n{reason}\n", encoding='utf-8')
+        return target
+
+def _readable(path):
+    """False, solange ein anderes Programm die Datei noch schreibt bzw. sperrt"""
+    try:
+        with open(path, 'rb') as f:
+            f.read(1)
+        # Unter Windows schlägt das Umbenennen fehl, solange Excel die Datei geöffnet hat
+        os.rename(path, path)
+        return True
+    except OSError:
+        return False